@@ -0,0 +1,188 @@
+from __future__ import annotations
+import argparse
+import glob
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from app.core.cache import DEFAULT_CACHE_DIR, ProfileStore, profile_settings
+from app.core.drift_engine import compute_drift_from_profiles
+from app.core.drift_metrics import ApproxConfig, ResampleConfig
+from app.core.instrument import Recorder, profiled, recording
+from app.core.loader import profile_file
+from app.core.profile import DatasetProfile
+from app.core.report import export_report_json, export_report_md
+from app.core.utils import now_iso, safe_mkdir, write_json
+
+# baseline profile shared by every task in a worker process (set by the pool initializer)
+_BASELINE: DatasetProfile | None = None
+
+def _init_worker(baseline: DatasetProfile) -> None:
+    global _BASELINE
+    _BASELINE = baseline
+
+def _run_snapshot(
+    current_path: str,
+    out_stem: str,
+    top_n: int,
+    chunksize: int,
+    max_rows: int | None,
+    approx: ApproxConfig,
+    profile_dir: str | None = None,
+    resample: ResampleConfig | None = None,
+) -> dict:
+    bp = _BASELINE
+    started = time.perf_counter()
+    entry = {"current_path": current_path}
+    recorder = Recorder(memory=profile_dir is not None)
+    dump = profiled(Path(profile_dir) / Path(out_stem).name) if profile_dir else nullcontext()
+    try:
+        with recording(recorder), dump:
+            cp = profile_file(
+                current_path, chunksize=chunksize, max_rows=max_rows, schema=bp.schema(), columns=list(bp.columns), sketch_k=approx.sketch_k()
+            )
+            schema, drifts = compute_drift_from_profiles(bp, cp, confidence=approx.confidence, resample=resample)
+            json_path = export_report_json(
+                f"{out_stem}.json", bp.path, current_path, schema, drifts, top_n=top_n, run_stats=recorder.summary()
+            )
+            md_path = export_report_md(f"{out_stem}.md", bp.path, current_path, drifts, top_n=top_n)
+    except Exception as e:
+        entry.update(ok=False, error=str(e), seconds=time.perf_counter() - started, stages=recorder.summary()["stages"])
+        return entry
+    seconds = time.perf_counter() - started
+    entry.update(
+        ok=True,
+        rows=cp.n_rows,
+        columns=len(cp.columns),
+        seconds=seconds,
+        rows_per_s=cp.n_rows / seconds if seconds else None,
+        columns_per_s=len(cp.columns) / seconds if seconds else None,
+        top_feature=drifts[0].name if drifts else None,
+        top_score=drifts[0].score if drifts else None,
+        report_json=json_path,
+        report_md=md_path,
+        stages=recorder.summary()["stages"],
+    )
+    return entry
+
+def _report_stems(paths: list[str], out_dir: Path) -> list[str]:
+    stems, seen = [], {}
+    for p in paths:
+        stem = Path(p).stem
+        seen[stem] = seen.get(stem, 0) + 1
+        stems.append(str(out_dir / (stem if seen[stem] == 1 else f"{stem}_{seen[stem]}")))
+    return stems
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Headless drift reports: one baseline against many current snapshots.",
+    )
+    ap.add_argument("baseline", help="Baseline file (CSV, Parquet, Feather/Arrow IPC).")
+    ap.add_argument("current", nargs="+", help="Current file paths or glob patterns (quote globs).")
+    ap.add_argument("-o", "--out", required=True, help="Output folder for per-snapshot reports and index.json.")
+    ap.add_argument("-j", "--workers", type=int, default=2, help="Snapshots processed at once (default: 2).")
+    ap.add_argument("--backend", choices=["process", "thread"], default="process")
+    ap.add_argument("--top-n", type=int, default=25)
+    ap.add_argument("--columns", type=lambda v: [c.strip() for c in v.split(",") if c.strip()], default=None,
+                    help="Comma-separated columns to compare (others are never read).")
+    ap.add_argument("--chunksize", type=int, default=100_000, help="Rows per streamed chunk.")
+    ap.add_argument("--max-rows", type=int, default=None, help="Read at most this many rows per file.")
+    ap.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="Baseline profile cache folder.")
+    ap.add_argument("--no-cache", action="store_true", help="Always re-profile the baseline.")
+    ap.add_argument("--accuracy", type=float, default=0.003,
+                    help="Target CDF rank error of the numeric sketches; exact until a column outgrows it (default: 0.003).")
+    ap.add_argument("--confidence", type=float, default=0.99, help="Confidence of the reported error bounds.")
+    ap.add_argument("--profile-dir", default=None,
+                    help="Trace peak memory per stage and write cProfile/tracemalloc dumps per snapshot here (slower).")
+    ap.add_argument("--resample", type=int, default=0, metavar="N",
+                    help="Add bootstrap CIs and permutation p-values for PSI/JSD from N resamples of the binned counts (default: off).")
+    return ap
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.workers < 1:
+        print("--workers must be >= 1", file=sys.stderr)
+        return 2
+
+    try:
+        approx = ApproxConfig(accuracy=args.accuracy, confidence=args.confidence)
+        resample = ResampleConfig(replicates=args.resample) if args.resample else None
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    current = sorted({p for pattern in args.current for p in (glob.glob(pattern) or [pattern])})
+    out_dir = safe_mkdir(args.out)
+
+    started = time.perf_counter()
+    build = lambda p: profile_file(p, chunksize=args.chunksize, max_rows=args.max_rows, columns=args.columns, sketch_k=approx.sketch_k())
+    try:
+        # the cache only holds full-file profiles
+        if args.no_cache or args.columns or args.max_rows is not None:
+            bp, cached = build(args.baseline), False
+        else:
+            bp, cached = ProfileStore(args.cache_dir).get_or_build(args.baseline, build, profile_settings(sketch_k=approx.sketch_k()))
+    except (ValueError, OSError) as e:
+        print(f"Baseline error: {e}", file=sys.stderr)
+        return 2
+    baseline_seconds = time.perf_counter() - started
+    print(f"Baseline: {bp.n_rows} rows x {len(bp.columns)} cols ({'cached' if cached else f'{baseline_seconds:.2f}s'})")
+
+    pool_cls = ProcessPoolExecutor if args.backend == "process" else ThreadPoolExecutor
+    if args.profile_dir and args.backend == "thread":
+        # one process-wide trace for all snapshot threads, so none of them stops it for the others
+        tracemalloc.start(10)
+    t0 = time.perf_counter()
+    with pool_cls(max_workers=args.workers, initializer=_init_worker, initargs=(bp,)) as ex:
+        futures = [
+            ex.submit(_run_snapshot, path, stem, args.top_n, args.chunksize, args.max_rows, approx, args.profile_dir, resample)
+            for path, stem in zip(current, _report_stems(current, out_dir))
+        ]
+        snapshots = []
+        for fut in futures:
+            entry = fut.result()
+            snapshots.append(entry)
+            if entry["ok"]:
+                print(
+                    f"{entry['current_path']}: {entry['rows']} rows in {entry['seconds']:.2f}s "
+                    f"({entry['rows_per_s']:.0f} rows/s, {entry['columns_per_s']:.1f} cols/s), "
+                    f"top: {entry['top_feature']}"
+                )
+            else:
+                print(f"{entry['current_path']}: FAILED: {entry['error']}", file=sys.stderr)
+    wall = time.perf_counter() - t0
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+    rows = sum(s.get("rows", 0) for s in snapshots if s["ok"])
+    cols = sum(s.get("columns", 0) for s in snapshots if s["ok"])
+    index = {
+        "generated_at": now_iso(),
+        "baseline_path": args.baseline,
+        "baseline_rows": bp.n_rows,
+        "baseline_cached": cached,
+        "baseline_seconds": baseline_seconds,
+        "workers": args.workers,
+        "backend": args.backend,
+        "accuracy": args.accuracy,
+        "confidence": args.confidence,
+        "resample": args.resample,
+        "wall_seconds": wall,
+        "rows_per_s": rows / wall if wall else None,
+        "columns_per_s": cols / wall if wall else None,
+        "snapshots": snapshots,
+    }
+    write_json(out_dir / "index.json", index)
+    failed = sum(1 for s in snapshots if not s["ok"])
+    print(
+        f"{len(snapshots) - failed}/{len(snapshots)} snapshots in {wall:.2f}s "
+        f"({index['rows_per_s'] or 0:.0f} rows/s, {index['columns_per_s'] or 0:.1f} cols/s) -> {out_dir / 'index.json'}"
+    )
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Hashable
+from app.core.profile import DatasetProfile
+from app.core.utils import safe_mkdir
+
+DEFAULT_CACHE_DIR = Path.home() / ".data_drift_dashboard" / "profile_cache"
+
+# bump when ColumnProfile/DatasetProfile change shape, so older pickles are rebuilt
+PROFILE_FORMAT = 2
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+def file_sha256(path: str | Path, block_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            h.update(block)
+    return h.hexdigest()
+
+def file_fingerprint(path: str | Path) -> FileFingerprint:
+    p = Path(path).resolve()
+    st = p.stat()
+    return FileFingerprint(path=str(p), size=st.st_size, mtime_ns=st.st_mtime_ns, sha256=file_sha256(p))
+
+def profile_settings(sketch_k: int = 512, max_cat_unique: int = 50) -> tuple:
+    # what a profile depends on besides the file; a cached entry built with other settings is stale
+    return (PROFILE_FORMAT, sketch_k, max_cat_unique)
+
+@dataclass(frozen=True)
+class CachedProfile:
+    fingerprint: FileFingerprint
+    profile: DatasetProfile
+    settings: tuple = ()  # profile_settings() at build time; () in entries from before it existed
+
+class ProfileStore:
+    """On-disk store of baseline profiles, one entry per source file path.
+
+    An entry is reused while the file's size and mtime match and it was built with the
+    same profile settings; if only the mtime changed the content hash decides. Least
+    recently used entries are evicted once the store grows past ``max_bytes``.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_CACHE_DIR, max_bytes: int = 256 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, path: str | Path) -> Path:
+        key = hashlib.sha256(str(Path(path).resolve()).encode("utf-8")).hexdigest()[:32]
+        return self.root / f"{key}.pkl"
+
+    def _read(self, entry: Path) -> CachedProfile | None:
+        try:
+            with open(entry, "rb") as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        return cached if isinstance(cached, CachedProfile) else None
+
+    def _write(self, entry: Path, cached: CachedProfile) -> bool:
+        data = pickle.dumps(cached, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            # eviction would delete it straight away; keep the older entries instead
+            entry.unlink(missing_ok=True)
+            return False
+        safe_mkdir(self.root)
+        tmp = entry.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, entry)
+        return True
+
+    def get(self, path: str | Path, settings: tuple = profile_settings()) -> DatasetProfile | None:
+        entry = self._entry_path(path)
+        cached = self._read(entry) if entry.exists() else None
+        if cached is None:
+            return None
+        if cached.settings != settings:
+            self.invalidate(path)
+            return None
+        try:
+            st = Path(path).stat()
+        except OSError:
+            return None
+        fp = cached.fingerprint
+        if st.st_size != fp.size:
+            self.invalidate(path)
+            return None
+        if st.st_mtime_ns != fp.mtime_ns:
+            # touched or copied over: only trust the entry if the content is unchanged
+            if file_sha256(path) != fp.sha256:
+                self.invalidate(path)
+                return None
+            self._write(entry, replace(cached, fingerprint=replace(fp, mtime_ns=st.st_mtime_ns)))
+        # entry mtime doubles as the LRU clock
+        os.utime(entry)
+        return cached.profile
+
+    def put(
+        self,
+        path: str | Path,
+        profile: DatasetProfile,
+        settings: tuple = profile_settings(),
+        fingerprint: FileFingerprint | None = None,
+    ) -> bool:
+        """Store `profile`; False if it alone is larger than the store. Pass the `fingerprint` taken
+        before building the profile to skip rehashing the file (and to miss if it changed meanwhile)."""
+        fp = fingerprint if fingerprint is not None else file_fingerprint(path)
+        if not self._write(self._entry_path(path), CachedProfile(fingerprint=fp, profile=profile, settings=settings)):
+            return False
+        self.evict()
+        return True
+
+    def get_or_build(
+        self, path: str | Path, build: Callable[[str], DatasetProfile], settings: tuple = profile_settings()
+    ) -> tuple[DatasetProfile, bool]:
+        """`settings` must describe how `build` profiles (see profile_settings)."""
+        profile = self.get(path, settings)
+        if profile is not None:
+            return profile, True
+        fp = file_fingerprint(path)
+        profile = build(str(path))
+        self.put(path, profile, settings, fingerprint=fp)
+        return profile, False
+
+    def invalidate(self, path: str | Path) -> bool:
+        entry = self._entry_path(path)
+        try:
+            entry.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def clear(self) -> None:
+        for entry in self._entries():
+            entry.unlink(missing_ok=True)
+
+    def _entries(self) -> list[Path]:
+        return list(self.root.glob("*.pkl")) if self.root.exists() else []
+
+    def total_bytes(self) -> int:
+        return sum(e.stat().st_size for e in self._entries())
+
+    def evict(self) -> list[Path]:
+        entries = sorted(((e.stat().st_mtime_ns, e.stat().st_size, e) for e in self._entries()), key=lambda t: t[0])
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            removed.append(entry)
+        return removed
+
+class LRUCache:
+    """Bounded in-memory mapping; the least recently used entry is dropped first."""
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1.")
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from app.core.instrument import stage
+from app.core.schema import ColumnSchema, infer_schema
+
+_INTS = (np.int8, np.int16, np.int32, np.int64)
+
+def smallest_int(lo: int, hi: int) -> np.dtype | None:
+    for t in _INTS:
+        info = np.iinfo(t)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(t)
+    return None
+
+def downcast(values: np.ndarray, missing: np.ndarray) -> np.ndarray:
+    """Smallest dtype holding every non-missing value exactly; missing slots become 0.
+
+    Integral floats (a CSV int column with gaps) become ints, other floats float32 when that
+    round-trips, else they stay float64.
+    """
+    valid = values[~missing] if missing.any() else values
+    if valid.size == 0:
+        return np.zeros(len(values), dtype=np.int8)
+    dtype = None
+    if values.dtype.kind in "iu":
+        dtype = smallest_int(int(valid.min()), int(valid.max()))
+    elif values.dtype.kind == "f":
+        finite = bool(np.isfinite(valid).all())
+        if finite and (valid == np.trunc(valid)).all() and not np.signbit(valid[valid == 0]).any():
+            if -(2.0 ** 63) <= valid.min() and valid.max() < 2.0 ** 63:
+                dtype = smallest_int(int(valid.min()), int(valid.max()))
+        if dtype is None and (valid.astype(np.float32) == valid).all():
+            dtype = np.dtype(np.float32)
+    dtype = dtype or values.dtype
+    if dtype == values.dtype and not missing.any():
+        return values
+    out = np.zeros(len(values), dtype=dtype)
+    out[~missing] = valid.astype(out.dtype)
+    return out
+
+def _dictionary_codes(n: int) -> np.dtype:
+    return smallest_int(-1, max(n - 1, 0))
+
+@dataclass(frozen=True)
+class CompactColumn:
+    """One column: typed values or dictionary codes, plus missing flags packed 8 per byte."""
+
+    name: str
+    kind: str  # schema kind
+    values: np.ndarray  # downcast numbers (0 if missing), datetime64, or codes into `labels` (-1 if missing)
+    missing: np.ndarray  # np.packbits of the per-row missing flags
+    labels: np.ndarray | None = None  # dictionary, shared with the other dataset where possible
+    tz: str | None = None  # datetime values are stored as naive UTC
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def is_missing(self) -> np.ndarray:
+        return np.unpackbits(self.missing, count=len(self)).view(bool)
+
+    def missing_count(self) -> int:
+        # padding bits are zero; np.bitwise_count would be faster but needs NumPy 2
+        return int(np.unpackbits(self.missing, count=len(self)).sum())
+
+    def to_float(self) -> np.ndarray:
+        out = self.values.astype(np.float64)
+        if self.missing_count():
+            out[self.is_missing()] = np.nan
+        return out
+
+    def series(self) -> pd.Series:
+        """The column as pandas would hold it; text comes back as a categorical over `labels`."""
+        if self.labels is not None:
+            return pd.Series(pd.Categorical.from_codes(self.values, categories=pd.Index(self.labels)), name=self.name)
+        if self.values.dtype.kind == "M":
+            s = pd.Series(self.values, name=self.name)
+            return s if self.tz is None else s.dt.tz_localize("UTC").dt.tz_convert(self.tz)
+        if self.missing_count():
+            return pd.Series(self.to_float(), name=self.name)
+        return pd.Series(self.values, name=self.name, copy=False)
+
+    @property
+    def nbytes(self) -> int:
+        labels = 0 if self.labels is None else int(pd.Index(self.labels).memory_usage(deep=True))
+        return int(self.values.nbytes + self.missing.nbytes + labels)
+
+class CompactBuilder:
+    """Builds a CompactFrame chunk by chunk; `dictionaries` (e.g. the baseline's) fix the first codes."""
+
+    def __init__(self, schema: list[ColumnSchema], dictionaries: dict[str, np.ndarray] | None = None):
+        self.schema = schema
+        self.dictionaries = dictionaries or {}
+        self.n_rows = 0
+        self.source_bytes = 0
+        self._parts: dict[str, list] = {s.name: [] for s in schema}
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        self.n_rows += len(chunk)
+        self.source_bytes += int(chunk.memory_usage(index=False, deep=True).sum())
+        for s in self.schema:
+            col = chunk[s.name]
+            miss = col.isna().to_numpy()
+            if s.kind == "numeric":
+                if col.dtype.kind not in "iuf":
+                    col = pd.to_numeric(col, errors="coerce")
+                    miss = col.isna().to_numpy()
+                exact = col.dtype.kind in "iu" and not miss.any()
+                values = col.to_numpy() if exact else col.to_numpy(dtype=float, na_value=np.nan)
+                self._parts[s.name].append(("num", downcast(values, miss), miss))
+            elif col.dtype.kind == "M":
+                tz = getattr(col.dtype, "tz", None)
+                values = (col.dt.tz_convert("UTC").dt.tz_localize(None) if tz is not None else col).to_numpy()
+                self._parts[s.name].append(("dt", values, miss, None if tz is None else str(tz)))
+            else:
+                codes, uniques = pd.factorize(col)
+                self._parts[s.name].append(("text", codes, miss, np.asarray(uniques, dtype=object)))
+
+    def build(self) -> CompactFrame:
+        columns: dict[str, CompactColumn] = {}
+        with stage("compact", rows=self.n_rows):
+            for s in self.schema:
+                parts = self._parts.pop(s.name)
+                columns[s.name] = self._column(s, parts)
+        return CompactFrame(columns=columns, n_rows=self.n_rows, schema=self.schema, source_bytes=self.source_bytes)
+
+    def _column(self, s: ColumnSchema, parts: list) -> CompactColumn:
+        if not parts:
+            return CompactColumn(s.name, s.kind, np.zeros(0, np.int8), np.zeros(0, np.uint8))
+        miss = np.concatenate([p[2] for p in parts])
+        packed = np.packbits(miss)
+        tag = parts[0][0]
+        if tag == "num":
+            # numpy promotion keeps mixed per-chunk dtypes exact; downcast once more over the whole column
+            values = downcast(np.concatenate([p[1] for p in parts]), miss)
+            return CompactColumn(s.name, s.kind, values, packed)
+        if tag == "dt":
+            return CompactColumn(s.name, s.kind, np.concatenate([p[1] for p in parts]), packed, tz=parts[0][3])
+        # one factorize over the given dictionary plus every chunk's uniques maps all chunks at once;
+        # factorize numbers labels by first appearance, so the given dictionary keeps its codes
+        prior = np.asarray(self.dictionaries.get(s.name, []), dtype=object)
+        mapping, labels = pd.factorize(np.concatenate([prior, *(p[3] for p in parts)]))
+        codes = np.empty(len(miss), dtype=_dictionary_codes(len(labels)))
+        start, offset = 0, len(prior)
+        for _, local, _, uniques in parts:
+            m = mapping[offset : offset + len(uniques)]
+            codes[start : start + len(local)] = np.where(local >= 0, m[np.maximum(local, 0)], -1)
+            start += len(local)
+            offset += len(uniques)
+        return CompactColumn(s.name, s.kind, codes, packed, labels=np.asarray(labels, dtype=object))
+
+@dataclass
+class CompactFrame:
+    """A loaded dataset held column by column in compact form.
+
+    Columns read like a DataFrame's (`frame[name]` gives a Series), so plotting and windowed
+    drift take it in place of one; the metrics read `values`/codes directly.
+    """
+
+    columns: dict[str, CompactColumn]
+    n_rows: int
+    schema: list[ColumnSchema]
+    source_bytes: int = 0  # in-memory size of the DataFrame(s) it was built from
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, schema: list[ColumnSchema] | None = None, dictionaries: dict[str, np.ndarray] | None = None
+    ) -> CompactFrame:
+        builder = CompactBuilder(schema if schema is not None else infer_schema(df), dictionaries)
+        builder.add(df)
+        return builder.build()
+
+    def __getitem__(self, name: str) -> pd.Series:
+        return self.columns[name].series()
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.n_rows, len(self.columns)
+
+    def to_frame(self, columns: list[str] | None = None) -> pd.DataFrame:
+        return pd.DataFrame({name: self[name] for name in (columns or list(self.columns))})
+
+    def dictionaries(self) -> dict[str, np.ndarray]:
+        return {name: col.labels for name, col in self.columns.items() if col.labels is not None}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self.columns.values())
+
+    def memory_report(self) -> dict:
+        return {
+            "rows": self.n_rows,
+            "columns": len(self.columns),
+            "compact_mb": self.nbytes / 2**20,
+            "source_mb": self.source_bytes / 2**20,
+            "dtypes": {name: str(col.values.dtype) for name, col in self.columns.items()},
+        }
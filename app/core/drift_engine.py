@@ -1,7 +1,14 @@
 from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Iterator
+import numpy as np
 import pandas as pd
-from app.core.schema import infer_schema, ColumnSchema
+from app.core.instrument import in_context, stage
+from app.core.schema import infer_schema_map, ColumnSchema
+from app.core.profile import DatasetProfile
+from app.core.parallel import SharedArrays, attach, detach
+from app.core.sketch import QuantileSketch, Reservoir, ValueSketch
 from app.core import drift_metrics as dm
 
 @dataclass(frozen=True)
@@ -12,41 +19,249 @@ class FeatureDrift:
     score: float
     details: dict
 
-def compute_drift(baseline: pd.DataFrame, current: pd.DataFrame) -> tuple[list[ColumnSchema], list[FeatureDrift]]:
-    schema = infer_schema(baseline)
-    drifts: list[FeatureDrift] = []
+def _feature_drift(name: str, kind: str, miss_d: float, details: dict) -> FeatureDrift:
+    if kind in ("numeric", "categorical"):
+        # record how the metrics were obtained ("exact" unless an approximation says otherwise)
+        details = {**details, "method": details.get("method", "exact")}
+    if kind == "numeric":
+        psi = details["psi"]
+        pval = details["ks_pvalue"]
+        # score: higher PSI + higher missingness change + low p-value boost
+        score = float(psi + abs(miss_d) + (0.2 if pval < 0.05 else 0.0))
+    elif kind == "categorical":
+        jsd = float(details["js_divergence"])
+        pval = float(details["chi2_pvalue"])
+        score = float(jsd + abs(miss_d) + (0.2 if pval < 0.05 else 0.0))
+    elif "js_divergence" in details:
+        # high-cardinality text: heavy-hitter JSD from sketches, no test to boost with
+        score = float(details["js_divergence"] + abs(miss_d))
+    else:
+        # datetime (and unknown without sketches): only missingness for now
+        score = float(abs(miss_d))
+    return FeatureDrift(name=name, kind=kind, missing_delta=miss_d, score=score, details=details)
+
+# numeric columns are coerced and scored in blocks of this many columns (bounds the float64 copies
+# and their sorted copies)
+NUMERIC_BATCH = 64
+
+def _numeric_block(df: pd.DataFrame, cols: list, out: np.ndarray | None = None) -> np.ndarray:
+    # coerce each column once into a column-major float block (NaN = missing)
+    block = np.empty((len(df), len(cols)), dtype=np.float64, order="F") if out is None else out
+    for j, col in enumerate(cols):
+        block[:, j] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    return block
+
+def _numeric_batch_details(
+    b_block: np.ndarray,
+    c_block: np.ndarray,
+    approx: dm.ApproxConfig | None = None,
+    resample: dm.ResampleConfig | None = None,
+) -> list[dict]:
+    with stage("drift.numeric_batch", rows=b_block.shape[0] + c_block.shape[0]):
+        if approx is not None:
+            return [_approx_numeric_details(b_block[:, j], c_block[:, j], approx) for j in range(b_block.shape[1])]
+        if resample is None:
+            psi, pvals = dm.numeric_drift_batch(b_block, c_block)
+            return [{"psi": float(p), "ks_pvalue": float(v)} for p, v in zip(psi, pvals)]
+        psi, pvals, b_counts, c_counts = dm.numeric_drift_batch(b_block, c_block, return_counts=True)
+        return [
+            {"psi": float(psi[j]), "ks_pvalue": float(pvals[j]), **dm.resample_counts(b_counts[:, j], c_counts[:, j], "psi", resample)}
+            for j in range(len(psi))
+        ]
+
+def _approx_numeric_details(b: np.ndarray, c: np.ndarray, approx: dm.ApproxConfig) -> dict:
+    if approx.method == "sample":
+        bs, cs = Reservoir(approx.sample_size(), seed=approx.seed), Reservoir(approx.sample_size(), seed=approx.seed + 1)
+        bs.update(b)
+        cs.update(c)
+        return dm.numeric_drift_sample(bs, cs, confidence=approx.confidence)
+    bs, cs = QuantileSketch(approx.sketch_k(), seed=approx.seed), QuantileSketch(approx.sketch_k(), seed=approx.seed + 1)
+    bs.update(b)
+    cs.update(c)
+    return dm.numeric_drift_sketch(bs, cs, confidence=approx.confidence)
+
+def _spans(n: int, size: int) -> list[tuple[int, int]]:
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
 
-    for col in baseline.columns:
-        cs = next(x for x in schema if x.name == col)
-        b = baseline[col]
-        c = current[col]
-
-        miss_d = dm.missingness_delta(b, c)
-
-        if cs.kind == "numeric":
-            psi = dm.psi_numeric(b, c)
-            pval = dm.ks_pvalue(b, c)
-            # score: higher PSI + higher missingness change + low p-value boost
-            score = float(psi + abs(miss_d) + (0.2 if pval < 0.05 else 0.0))
-            details = {"psi": psi, "ks_pvalue": pval}
-        elif cs.kind == "categorical":
-            cat = dm.categorical_shift(b, c)
-            jsd = float(cat["js_divergence"])
-            pval = float(cat["chi2_pvalue"])
-            score = float(jsd + abs(miss_d) + (0.2 if pval < 0.05 else 0.0))
-            details = cat
+def compute_drift(
+    baseline: pd.DataFrame,
+    current: pd.DataFrame,
+    workers: int | None = None,
+    backend: str = "thread",
+    approx: dm.ApproxConfig | None = None,
+    counts_cache: dict | None = None,
+    resample: dm.ResampleConfig | None = None,
+) -> tuple[list[ColumnSchema], list[FeatureDrift]]:
+    # workers > 1 spreads the metrics over a "thread" or "process" pool;
+    # approx scores numeric columns from sketches/samples with recorded error bounds;
+    # counts_cache (if given) receives each categorical column's aligned CategoryCounts;
+    # resample adds bootstrap CIs and permutation p-values (exact numeric and categorical columns)
+    if backend not in ("thread", "process"):
+        raise ValueError(f"Unknown backend: {backend!r} (expected 'thread' or 'process').")
+    schema = infer_schema_map(baseline)
+    cols = list(baseline.columns)
+    kinds = [schema[str(col)].kind for col in cols]
+    num = [i for i, kind in enumerate(kinds) if kind == "numeric"]
+    cat = [i for i, kind in enumerate(kinds) if kind == "categorical"]
+    text = [i for i, kind in enumerate(kinds) if kind == "unknown"]
+    parallel = workers is not None and workers > 1
+    batch = NUMERIC_BATCH if not parallel else max(1, min(NUMERIC_BATCH, -(-len(num) // (workers * 4))))
+
+    details: list[dict] = [{} for _ in cols]
+    if parallel and backend == "process":
+        with stage("drift.numeric_batch", rows=len(baseline) + len(current)):
+            # per-batch timings stay in the worker processes; this is the whole pool
+            _process_details(baseline, current, cols, num, batch, workers, details, approx, resample)
+        for i in cat:
+            # factorize + bincount: cheaper in place than shipping codes to a worker
+            details[i] = _categorical_details(baseline[cols[i]], current[cols[i]], str(cols[i]), counts_cache, resample)
+        for i in text:
+            details[i] = _value_details(baseline[cols[i]], current[cols[i]], str(cols[i]))
+    else:
+        def numeric_job(idx: list[int]) -> list[dict]:
+            names = [cols[i] for i in idx]
+            return _numeric_batch_details(_numeric_block(baseline, names), _numeric_block(current, names), approx, resample)
+
+        jobs = [(num[a:b], lambda a=a, b=b: numeric_job(num[a:b])) for a, b in _spans(len(num), batch)]
+        jobs += [
+            ([i], lambda i=i: [_categorical_details(baseline[cols[i]], current[cols[i]], str(cols[i]), counts_cache, resample)])
+            for i in cat
+        ]
+        jobs += [([i], lambda i=i: [_value_details(baseline[cols[i]], current[cols[i]], str(cols[i]))]) for i in text]
+        if parallel:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                results = list(ex.map(in_context(lambda job: job[1]()), jobs))
         else:
-            # unknown/datetime: only missingness for now
-            score = float(abs(miss_d))
-            details = {}
-
-        drifts.append(FeatureDrift(
-            name=col,
-            kind=cs.kind,
-            missing_delta=miss_d,
-            score=score,
-            details=details
-        ))
+            results = [job[1]() for job in jobs]
+        for (idx, _), res in zip(jobs, results):
+            for i, det in zip(idx, res):
+                details[i] = det
+
+    drifts: list[FeatureDrift] = []
+    with stage("drift.missingness"):
+        for col, kind, det in zip(cols, kinds, details):
+            miss_d = dm.missingness_delta(baseline[col], current[col])
+            drifts.append(_feature_drift(col, kind, miss_d, det))
+
+    # stable sort over column order keeps ties identical across backends
+    drifts.sort(key=lambda d: d.score, reverse=True)
+    return list(schema.values()), drifts
+
+def _process_details(
+    baseline: pd.DataFrame,
+    current: pd.DataFrame,
+    cols: list,
+    num: list[int],
+    batch: int,
+    workers: int,
+    details: list[dict],
+    approx: dm.ApproxConfig | None,
+    resample: dm.ResampleConfig | None = None,
+) -> None:
+    if not num:
+        return
+    with SharedArrays() as shared:
+        # workers receive shared-memory handles and read columns as zero-copy views
+        b_ref, b_block = shared.empty((len(baseline), len(num)), np.float64)
+        c_ref, c_block = shared.empty((len(current), len(num)), np.float64)
+        _numeric_block(baseline, [cols[i] for i in num], out=b_block)
+        _numeric_block(current, [cols[i] for i in num], out=c_block)
+        tasks = [(num[a:b], (b_ref, c_ref, (a, b), approx, resample)) for a, b in _spans(len(num), batch)]
+        b_block = c_block = None
+
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            chunk = max(1, len(tasks) // (workers * 4))
+            for (idx, _), res in zip(tasks, ex.map(_shared_task, [t for _, t in tasks], chunksize=chunk)):
+                for i, det in zip(idx, res):
+                    details[i] = det
+
+def _shared_task(task: tuple) -> list[dict]:
+    b_ref, c_ref, (a, b), approx, resample = task
+    b_shm, b_block = attach(b_ref)
+    c_shm, c_block = attach(c_ref)
+    try:
+        return _numeric_batch_details(b_block[:, a:b], c_block[:, a:b], approx, resample)
+    finally:
+        del b_block, c_block
+        detach(b_shm)
+        detach(c_shm)
+
+def _categorical_details(
+    b: pd.Series, c: pd.Series, name: str, counts_cache: dict | None, resample: dm.ResampleConfig | None = None
+) -> dict:
+    with stage("drift.categorical", column=name, rows=len(b) + len(c)):
+        counts = dm.count_categories(b, c)
+        if counts_cache is not None:
+            counts_cache[name] = counts
+        return _with_resample(dm.categorical_shift_counts(counts), counts, resample)
+
+def _value_sketch(s: pd.Series, chunksize: int = 100_000) -> ValueSketch:
+    sketch = ValueSketch()
+    values = s.dropna().to_numpy(dtype=object)
+    for start in range(0, len(values), chunksize):
+        sketch.update(values[start : start + chunksize])
+    return sketch
+
+def _value_details(b: pd.Series, c: pd.Series, name: str) -> dict:
+    with stage("drift.text", column=name, rows=len(b) + len(c)):
+        return dm.value_shift(_value_sketch(b), _value_sketch(c))
+
+def _with_resample(details: dict, counts: dm.CategoryCounts, resample: dm.ResampleConfig | None) -> dict:
+    if resample is None:
+        return details
+    return {**details, **dm.resample_counts(counts.baseline, counts.current, "js_divergence", resample)}
+
+def iter_drift_from_profiles(
+    baseline: DatasetProfile,
+    current: DatasetProfile,
+    confidence: float = 0.99,
+    counts_cache: dict | None = None,
+    binned: dict[str, np.ndarray] | None = None,
+    resample: dm.ResampleConfig | None = None,
+) -> Iterator[FeatureDrift]:
+    # yields one FeatureDrift per column, in column order, as soon as it is scored;
+    # `binned` holds exact current counts on the baseline's psi_reference() edges (live mode);
+    # with `resample`, numeric columns resample their reference bins (current counts from the sketch)
+    if list(baseline.columns) != list(current.columns):
+        raise ValueError("Schema mismatch: baseline and current profiles have different columns.")
+    for cs in baseline.schema():
+        bp = baseline.columns[cs.name]
+        cp = current.columns[cs.name]
+        miss_d = float(cp.missing_rate - bp.missing_rate)
+
+        kind = cs.kind
+        details = {}
+        with stage(f"drift.{kind}", column=cs.name):
+            if kind == "numeric" and cp.sketch is not None:
+                reference = bp.psi_reference() if bp.sketch.n else None
+                details = dm.numeric_drift_sketch(bp.sketch, cp.sketch, confidence=confidence, reference=reference)
+                usable = reference is not None and len(reference[1]) > 0
+                c_counts = None
+                if binned is not None and cs.name in binned and usable:
+                    c_counts = binned[cs.name]
+                    details["psi"] = dm.psi_from_counts(reference[1], c_counts)
+                if resample is not None and usable:
+                    if c_counts is None:
+                        c_counts = cp.sketch.histogram(reference[0])
+                    details.update(dm.resample_counts(reference[1], c_counts, "psi", resample))
+            elif kind == "categorical" and cp.categories is not None:
+                counts = dm.align_counts(bp.category_counts(), cp.category_counts())
+                if counts_cache is not None:
+                    counts_cache[cs.name] = counts
+                details = _with_resample(dm.categorical_shift_counts(counts), counts, resample)
+            elif kind in ("categorical", "unknown") and bp.value_sketch() is not None and cp.value_sketch() is not None:
+                # too many distinct values on at least one side for exact counts
+                details = dm.value_shift(bp.value_sketch(), cp.value_sketch())
+                kind = "unknown"
+            elif kind in ("numeric", "categorical"):
+                # current profile was not pinned to the baseline schema and cannot be compared
+                kind = "unknown"
+
+        yield _feature_drift(cs.name, kind, miss_d, details)
 
+def compute_drift_from_profiles(
+    baseline: DatasetProfile, current: DatasetProfile, confidence: float = 0.99, resample: dm.ResampleConfig | None = None
+) -> tuple[list[ColumnSchema], list[FeatureDrift]]:
+    drifts = list(iter_drift_from_profiles(baseline, current, confidence=confidence, resample=resample))
     drifts.sort(key=lambda d: d.score, reverse=True)
-    return schema, drifts
+    return baseline.schema(), drifts
@@ -1,7 +1,8 @@
 from __future__ import annotations
+from dataclasses import dataclass
 import numpy as np
 import pandas as pd
-from scipy.stats import ks_2samp, chisquare
+from app.core.sketch import QuantileSketch, Reservoir, ValueSketch
 
 def missingness_delta(b: pd.Series, c: pd.Series) -> float:
     return float(c.isna().mean() - b.isna().mean())
@@ -22,7 +23,9 @@ def psi_numeric(b: pd.Series, c: pd.Series, bins: int = 10, eps: float = 1e-6) -
 
     b_counts, _ = np.histogram(b.values, bins=edges)
     c_counts, _ = np.histogram(c.values, bins=edges)
+    return psi_from_counts(b_counts, c_counts, eps=eps)
 
+def psi_from_counts(b_counts: np.ndarray, c_counts: np.ndarray, eps: float = 1e-6) -> float:
     b_p = b_counts / max(1, b_counts.sum())
     c_p = c_counts / max(1, c_counts.sum())
 
@@ -30,12 +33,183 @@ def psi_numeric(b: pd.Series, c: pd.Series, bins: int = 10, eps: float = 1e-6) -
     c_p = np.clip(c_p, eps, 1)
     return float(np.sum((c_p - b_p) * np.log(c_p / b_p)))
 
+def _stats():
+    # scipy.stats takes most of a second to import; load it on the first test, not with the module
+    import scipy.stats
+    return scipy.stats
+
 def ks_pvalue(b: pd.Series, c: pd.Series) -> float:
     b = pd.to_numeric(b, errors="coerce").dropna()
     c = pd.to_numeric(c, errors="coerce").dropna()
     if b.empty or c.empty:
         return 1.0
-    return float(ks_2samp(b.values, c.values).pvalue)
+    return float(_stats().ks_2samp(b.values, c.values).pvalue)
+
+def psi_sketch(
+    b: QuantileSketch,
+    c: QuantileSketch,
+    bins: int = 10,
+    eps: float = 1e-6,
+    reference: tuple[np.ndarray, np.ndarray] | None = None,
+) -> float:
+    # reference: precomputed (edges, baseline counts), e.g. from a cached baseline profile
+    if b.n == 0 or c.n == 0:
+        return 0.0
+    if reference is None:
+        edges = np.unique(b.quantiles(np.linspace(0, 1, bins + 1)))
+        reference = (edges, b.histogram(edges) if len(edges) >= 3 else np.zeros(0))
+    edges, b_counts = reference
+    if len(edges) < 3:
+        return 0.0
+    return psi_from_counts(b_counts, c.histogram(edges), eps=eps)
+
+def _ks_stat_sketch(b: QuantileSketch, c: QuantileSketch) -> float:
+    xs = np.concatenate([b.weighted_items()[0], c.weighted_items()[0]])
+    return float(np.max(np.abs(b.cdf(xs) - c.cdf(xs))))
+
+def _ks_asymptotic(d: float, n1: int, n2: int) -> float:
+    # Smirnov's asymptotic p-value, as ks_2samp uses for large samples
+    return float(np.clip(_stats().kstwo.sf(d, np.round(n1 * n2 / (n1 + n2))), 0, 1))
+
+@dataclass(frozen=True)
+class ApproxConfig:
+    # method: "sketch" (KLL quantile sketch) or "sample" (uniform reservoir sample)
+    method: str = "sketch"
+    accuracy: float = 0.01  # target CDF/rank error per dataset
+    confidence: float = 0.99
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.method not in ("sketch", "sample"):
+            raise ValueError(f"Unknown approximate method: {self.method!r} (expected 'sketch' or 'sample').")
+        if not 0 < self.accuracy < 1 or not 0 < self.confidence < 1:
+            raise ValueError("accuracy and confidence must be in (0, 1).")
+
+    def sketch_k(self) -> int:
+        # empirically the sketch's rank error stays below ~sqrt(ln(2/delta)) / k
+        return max(8, int(np.ceil(np.sqrt(np.log(2 / (1 - self.confidence))) / self.accuracy)))
+
+    def sample_size(self) -> int:
+        # DKW: m samples give CDF error <= accuracy with the requested confidence
+        return int(np.ceil(np.log(2 / (1 - self.confidence)) / (2 * self.accuracy ** 2)))
+
+def numeric_drift_sketch(
+    b: QuantileSketch,
+    c: QuantileSketch,
+    bins: int = 10,
+    confidence: float = 0.99,
+    reference: tuple[np.ndarray, np.ndarray] | None = None,
+) -> dict:
+    psi = psi_sketch(b, c, bins=bins, reference=reference)
+    if b.n == 0 or c.n == 0:
+        return {"psi": psi, "ks_pvalue": 1.0, "method": "exact"}
+    if b.exact and c.exact:
+        return {"psi": psi, "ks_pvalue": float(_stats().ks_2samp(b.values(), c.values()).pvalue), "method": "exact"}
+    d = _ks_stat_sketch(b, c)
+    eb, ec = b.rank_error(confidence), c.rank_error(confidence)
+    return {
+        "psi": psi,
+        "ks_pvalue": _ks_asymptotic(d, b.n, c.n),
+        "ks_stat": d,
+        "method": "kll-sketch",
+        "error_bound": _error_bound(eb, ec, confidence),
+    }
+
+def numeric_drift_sample(b: Reservoir, c: Reservoir, bins: int = 10, confidence: float = 0.99) -> dict:
+    if b.n == 0 or c.n == 0:
+        return {"psi": 0.0, "ks_pvalue": 1.0, "method": "exact"}
+    bv, cv = b.values(), c.values()
+    psi = psi_numeric(pd.Series(bv), pd.Series(cv), bins=bins)
+    if b.exact and c.exact:
+        return {"psi": psi, "ks_pvalue": float(_stats().ks_2samp(bv, cv).pvalue), "method": "exact"}
+    both = np.concatenate([bv, cv])
+    d = float(np.max(np.abs(np.searchsorted(bv, both, side="right") / bv.size - np.searchsorted(cv, both, side="right") / cv.size)))
+    return {
+        "psi": psi,
+        "ks_pvalue": _ks_asymptotic(d, b.n, c.n),
+        "ks_stat": d,
+        "method": "reservoir-sample",
+        "sample_size": [int(bv.size), int(cv.size)],
+        "error_bound": _error_bound(b.cdf_error(confidence), c.cdf_error(confidence), confidence),
+    }
+
+def _error_bound(eb: float, ec: float, confidence: float) -> dict:
+    # CDF errors add up in the KS statistic; each PSI bin mass is a difference of two CDF values
+    return {
+        "confidence": confidence,
+        "cdf_error_baseline": eb,
+        "cdf_error_current": ec,
+        "ks_stat_error": eb + ec,
+        "bin_mass_error": 2 * max(eb, ec),
+    }
+
+def _lerp(a: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    # same form as numpy's quantile interpolation, so batched edges equal np.quantile's
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+def _sorted_quantiles(s: np.ndarray, n: np.ndarray, qs: np.ndarray) -> np.ndarray:
+    # s: column-sorted block with NaNs last, n: valid count per column -> (len(qs), k)
+    pos = qs[:, None] * np.maximum(n - 1, 0)[None, :]
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, np.maximum(n - 1, 0)[None, :])
+    cols = np.arange(s.shape[1])[None, :]
+    return _lerp(s[lo, cols], s[hi, cols], pos - lo)
+
+def _bin_boundaries(s: np.ndarray, n: int, edges: np.ndarray) -> np.ndarray:
+    # cumulative counts at each edge, matching np.histogram on np.unique(edges):
+    # half-open bins except the last, which includes the top edge
+    top = edges[-1]
+    lt = np.searchsorted(s[:n], edges, side="left")
+    return np.where(edges < top, lt, np.searchsorted(s[:n], top, side="right"))
+
+def _ks_sorted(b: np.ndarray, c: np.ndarray) -> float:
+    if max(b.size, c.size) <= 10000:
+        # small samples: keep scipy's exact distribution
+        return float(_stats().ks_2samp(b, c).pvalue)
+    both = np.concatenate([b, c])
+    d = float(np.max(np.abs(np.searchsorted(b, both, side="right") / b.size - np.searchsorted(c, both, side="right") / c.size)))
+    return _ks_asymptotic(d, b.size, c.size)
+
+def numeric_drift_batch(
+    b: np.ndarray, c: np.ndarray, bins: int = 10, eps: float = 1e-6, return_counts: bool = False
+) -> tuple[np.ndarray, ...]:
+    """PSI and KS p-value for every column of two float blocks (rows x columns, NaN = missing).
+
+    Matches psi_numeric/ks_pvalue column by column, but sorts each column once and
+    derives quantile edges, bin counts and PSI for the whole block together. With
+    return_counts, the (bins x columns) baseline and current counts follow (all zero where
+    a column has no usable bins).
+    """
+    b = np.asarray(b, dtype=float)
+    c = np.asarray(c, dtype=float)
+    k = b.shape[1]
+    nb = np.count_nonzero(~np.isnan(b), axis=0)
+    nc = np.count_nonzero(~np.isnan(c), axis=0)
+    bs = np.sort(b, axis=0)
+    cs = np.sort(c, axis=0)
+
+    qs = np.linspace(0, 1, bins + 1)
+    edges = _sorted_quantiles(bs, nb, qs) if b.shape[0] else np.zeros((bins + 1, k))
+    n_edges = 1 + np.count_nonzero(np.diff(edges, axis=0) > 0, axis=0)
+    usable = (nb > 0) & (nc > 0) & (n_edges >= 3)
+
+    b_counts = np.zeros((bins, k))
+    c_counts = np.zeros((bins, k))
+    pvals = np.ones(k)
+    for j in np.flatnonzero((nb > 0) & (nc > 0)):
+        if usable[j]:
+            b_counts[:, j] = np.diff(_bin_boundaries(bs[:, j], nb[j], edges[:, j]))
+            c_counts[:, j] = np.diff(_bin_boundaries(cs[:, j], nc[j], edges[:, j]))
+        pvals[j] = _ks_sorted(bs[: nb[j], j], cs[: nc[j], j])
+
+    b_p = np.clip(b_counts / np.maximum(1, b_counts.sum(axis=0)), eps, 1)
+    c_p = np.clip(c_counts / np.maximum(1, c_counts.sum(axis=0)), eps, 1)
+    # per-column contiguous sums, so results do not depend on how columns were batched
+    psi = np.ascontiguousarray(((c_p - b_p) * np.log(c_p / b_p)).T).sum(axis=1)
+    if return_counts:
+        return np.where(usable, psi, 0.0), pvals, b_counts, c_counts
+    return np.where(usable, psi, 0.0), pvals
 
 def js_divergence(p: np.ndarray, q: np.ndarray, eps: float = 1e-12) -> float:
     p = np.clip(p, eps, 1)
@@ -45,16 +219,65 @@ def js_divergence(p: np.ndarray, q: np.ndarray, eps: float = 1e-12) -> float:
     m = 0.5 * (p + q)
     return float(0.5 * (np.sum(p * np.log(p / m)) + np.sum(q * np.log(q / m))))
 
+@dataclass(frozen=True)
+class CategoryCounts:
+    """Baseline and current counts aligned on one shared category dictionary (NaN = missing)."""
+
+    labels: np.ndarray
+    baseline: np.ndarray
+    current: np.ndarray
+
+    def top(self, k: int = 12) -> CategoryCounts:
+        # most frequent baseline categories first; ties keep dictionary order
+        idx = np.argsort(-self.baseline, kind="stable")[:k]
+        return CategoryCounts(self.labels[idx], self.baseline[idx], self.current[idx])
+
+def category_codes(b: pd.Series, c: pd.Series) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # factorize each side once, then map the current uniques onto the baseline's dictionary;
+    # only the (small) unique arrays are compared, never the full columns
+    b_codes, b_uniques = pd.factorize(b)
+    c_codes, c_uniques = pd.factorize(c)
+    b_labels = pd.Index(np.asarray(b_uniques, dtype=object))
+    c_labels = np.asarray(c_uniques, dtype=object)
+    mapping = b_labels.get_indexer(c_labels)
+    new = mapping < 0
+    mapping[new] = len(b_labels) + np.arange(int(new.sum()))
+    labels = np.concatenate([b_labels.to_numpy(), c_labels[new]])
+    c_codes = np.where(c_codes >= 0, mapping[np.maximum(c_codes, 0)], -1)
+    return b_codes, c_codes, labels
+
+def count_codes(b_codes: np.ndarray, c_codes: np.ndarray, labels: np.ndarray) -> CategoryCounts:
+    # slot 0 counts the -1 (missing) codes
+    n = len(labels) + 1
+    b_counts = np.bincount(np.asarray(b_codes, dtype=np.int64) + 1, minlength=n)
+    c_counts = np.bincount(np.asarray(c_codes, dtype=np.int64) + 1, minlength=n)
+    seen = (b_counts + c_counts) > 0
+    labels = np.concatenate([np.array([np.nan], dtype=object), np.asarray(labels, dtype=object)])
+    return _sorted_counts(labels[seen], b_counts[seen].astype(float), c_counts[seen].astype(float))
+
+def count_categories(b: pd.Series, c: pd.Series) -> CategoryCounts:
+    return count_codes(*category_codes(b, c))
+
+def align_counts(b_counts: pd.Series, c_counts: pd.Series) -> CategoryCounts:
+    # index union (not a Python set) so NaN labels from both sides line up
+    cats = b_counts.index.union(c_counts.index, sort=False)
+    b_vec = b_counts.reindex(cats, fill_value=0).to_numpy(dtype=float)
+    c_vec = c_counts.reindex(cats, fill_value=0).to_numpy(dtype=float)
+    return _sorted_counts(np.asarray(cats, dtype=object), b_vec, c_vec)
+
+def _sorted_counts(labels: np.ndarray, b_vec: np.ndarray, c_vec: np.ndarray) -> CategoryCounts:
+    # a fixed label order (by str) keeps top_changes ties deterministic
+    order = np.argsort(np.array([str(x) for x in labels], dtype=str), kind="stable")
+    return CategoryCounts(labels[order], b_vec[order], c_vec[order])
+
 def categorical_shift(b: pd.Series, c: pd.Series, top_k: int = 12) -> dict:
-    b = b.astype("object")
-    c = c.astype("object")
+    return categorical_shift_counts(count_categories(b, c), top_k=top_k)
 
-    b_counts = b.value_counts(dropna=False)
-    c_counts = c.value_counts(dropna=False)
+def categorical_shift_from_counts(b_counts: pd.Series, c_counts: pd.Series, top_k: int = 12) -> dict:
+    return categorical_shift_counts(align_counts(b_counts, c_counts), top_k=top_k)
 
-    cats = sorted(set(b_counts.index.tolist()) | set(c_counts.index.tolist()), key=lambda x: str(x))
-    b_vec = np.array([b_counts.get(cat, 0) for cat in cats], dtype=float)
-    c_vec = np.array([c_counts.get(cat, 0) for cat in cats], dtype=float)
+def categorical_shift_counts(counts: CategoryCounts, top_k: int = 12) -> dict:
+    b_vec, c_vec = counts.baseline, counts.current
 
     # chi-square expects same total scale; use expected from baseline proportions
     if b_vec.sum() == 0 or c_vec.sum() == 0:
@@ -63,7 +286,8 @@ def categorical_shift(b: pd.Series, c: pd.Series, top_k: int = 12) -> dict:
         expected = (b_vec / b_vec.sum()) * c_vec.sum()
         # Avoid zeros in expected
         expected = np.clip(expected, 1e-6, None)
-        pval = float(chisquare(f_obs=c_vec, f_exp=expected).pvalue)
+        expected *= c_vec.sum() / expected.sum()  # chisquare requires matching totals
+        pval = float(_stats().chisquare(f_obs=c_vec, f_exp=expected).pvalue)
 
     b_p = b_vec / max(1, b_vec.sum())
     c_p = c_vec / max(1, c_vec.sum())
@@ -72,6 +296,120 @@ def categorical_shift(b: pd.Series, c: pd.Series, top_k: int = 12) -> dict:
     # top changed categories
     diffs = (c_p - b_p)
     idx = np.argsort(np.abs(diffs))[::-1][:top_k]
-    top = [{"category": str(cats[i]), "baseline_pct": float(b_p[i]), "current_pct": float(c_p[i]), "delta": float(diffs[i])} for i in idx]
+    top = [{"category": str(counts.labels[i]), "baseline_pct": float(b_p[i]), "current_pct": float(c_p[i]), "delta": float(diffs[i])} for i in idx]
 
     return {"chi2_pvalue": pval, "js_divergence": jsd, "top_changes": top}
+
+def value_shift(b: ValueSketch, c: ValueSketch, top_k: int = 12) -> dict:
+    """Drift of a high-cardinality column from two ValueSketches.
+
+    JSD over the heavy hitters of either side plus one "other" bucket, the largest share changes,
+    distinct counts (HyperLogLog) and vocabulary overlap (MinHash Jaccard).
+    """
+    labels = list(dict.fromkeys([*b.candidates, *c.candidates]))
+    hashes = np.array([b.candidates.get(v, c.candidates.get(v)) for v in labels], dtype=np.uint64)
+    b_p, c_p = b.frequencies(hashes), c.frequencies(hashes)
+    # the mass outside the candidates; count-min overestimates can push the sum past 1
+    b_rest, c_rest = max(0.0, 1 - b_p.sum()), max(0.0, 1 - c_p.sum())
+    jsd = js_divergence(np.append(b_p, b_rest), np.append(c_p, c_rest)) if b.n and c.n else 0.0
+
+    diffs = c_p - b_p
+    idx = np.argsort(-np.abs(diffs), kind="stable")[:top_k]
+    top = [{"category": labels[i], "baseline_pct": float(b_p[i]), "current_pct": float(c_p[i]), "delta": float(diffs[i])} for i in idx]
+    distinct_b, distinct_c = b.hll.estimate(), c.hll.estimate()
+    return {
+        "js_divergence": float(jsd),
+        "top_changes": top,
+        "distinct_baseline": distinct_b,
+        "distinct_current": distinct_c,
+        "vocab_jaccard": b.minhash.jaccard(c.minhash),
+        "method": "hash-sketch",
+        "error_bound": {
+            "frequency_error": max(b.cms.error(), c.cms.error()),
+            "frequency_confidence": float(1 - np.exp(-min(b.cms.depth, c.cms.depth))),
+            "distinct_rel_error": b.hll.error(),
+            "jaccard_error": b.minhash.error(),
+        },
+    }
+
+@dataclass(frozen=True)
+class ResampleConfig:
+    """Bootstrap confidence intervals and permutation p-values for PSI/JSD, drawn from binned counts."""
+
+    replicates: int = 2000
+    confidence: float = 0.95
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.replicates < 1:
+            raise ValueError("replicates must be >= 1.")
+        if not 0 < self.confidence < 1:
+            raise ValueError("confidence must be in (0, 1).")
+
+def bin_index(x: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    # np.histogram semantics: right edge inclusive, values outside the edges dropped (-1)
+    idx = np.searchsorted(edges, x, side="right") - 1
+    idx[x == edges[-1]] = len(edges) - 2
+    idx[(idx < 0) | (idx >= len(edges) - 1) | np.isnan(x)] = -1
+    return idx
+
+def grouped_counts(groups: np.ndarray, bins: np.ndarray, n_groups: int, n_bins: int) -> np.ndarray:
+    # (groups, bins) counts from a single bincount; rows with a negative group or bin are skipped
+    keep = (groups >= 0) & (bins >= 0)
+    flat = np.bincount(groups[keep] * n_bins + bins[keep], minlength=n_groups * n_bins)
+    return flat.reshape(n_groups, n_bins).astype(float)
+
+def psi_rows(b_counts: np.ndarray, c_counts: np.ndarray, eps: float = 1e-6) -> np.ndarray:
+    # psi_from_counts for every row pair of two (rows, bins) count matrices: replicates, windows,
+    # segments; an all-zero row scores as uniform, so callers mask empty rows themselves
+    b_p = np.clip(b_counts / np.maximum(1, b_counts.sum(axis=1, keepdims=True)), eps, 1)
+    c_p = np.clip(c_counts / np.maximum(1, c_counts.sum(axis=1, keepdims=True)), eps, 1)
+    return np.sum((c_p - b_p) * np.log(c_p / b_p), axis=1)
+
+def js_divergence_rows(b_counts: np.ndarray, c_counts: np.ndarray, eps: float = 1e-12) -> np.ndarray:
+    # js_divergence of the proportions in every row pair, as categorical_shift_counts computes it
+    p = np.clip(b_counts / np.maximum(1, b_counts.sum(axis=1, keepdims=True)), eps, 1)
+    q = np.clip(c_counts / np.maximum(1, c_counts.sum(axis=1, keepdims=True)), eps, 1)
+    p = p / p.sum(axis=1, keepdims=True)
+    q = q / q.sum(axis=1, keepdims=True)
+    m = 0.5 * (p + q)
+    return 0.5 * (np.sum(p * np.log(p / m), axis=1) + np.sum(q * np.log(q / m), axis=1))
+
+_ROW_METRICS = {"psi": psi_rows, "js_divergence": js_divergence_rows}
+_MAX_DRAW_CELLS = 1_000_000
+
+def resample_counts(b_counts: np.ndarray, c_counts: np.ndarray, metric: str, config: ResampleConfig) -> dict:
+    """Bootstrap CI and permutation p-value of `metric` ("psi" or "js_divergence") between two count vectors.
+
+    Replicates come from batched draws over the counts, never from the rows: the bootstrap redraws
+    each side from its own proportions (multinomial); the permutation test deals the pooled counts
+    out at random (multivariate hypergeometric, i.e. a row permutation of the binned data).
+    """
+    fn = _ROW_METRICS[metric]
+    b = np.rint(np.asarray(b_counts, dtype=float)).astype(np.int64)
+    c = np.rint(np.asarray(c_counts, dtype=float)).astype(np.int64)
+    nb, nc = int(b.sum()), int(c.sum())
+    if nb == 0 or nc == 0 or len(b) < 2:
+        return {}
+    rng = np.random.default_rng(config.seed)
+    r = config.replicates
+    observed = fn(b[None, :], c[None, :])[0]
+    pooled = b + c
+    boot, perm = np.empty(r), np.empty(r)
+    # replicates in blocks, so (replicates x bins) draws stay bounded for wide category sets
+    step = max(1, _MAX_DRAW_CELLS // len(b))
+    for a in range(0, r, step):
+        n = min(step, r - a)
+        boot[a : a + n] = fn(rng.multinomial(nb, b / nb, size=n), rng.multinomial(nc, c / nc, size=n))
+        b_perm = rng.multivariate_hypergeometric(pooled, nb, size=n)
+        perm[a : a + n] = fn(b_perm, pooled - b_perm)
+    # percentile interval; divergences are biased upwards, so a near-zero value can sit below it
+    alpha = (1 - config.confidence) / 2
+    lo, hi = np.quantile(boot, [alpha, 1 - alpha])
+    # +1 on both sides: the observed split is one of the permutations
+    extreme = np.count_nonzero(perm >= observed * (1 - 1e-9))
+    return {
+        f"{metric}_ci": [float(lo), float(hi)],
+        f"{metric}_perm_pvalue": float((extreme + 1) / (r + 1)),
+        "resample": {"replicates": r, "confidence": config.confidence},
+    }
@@ -0,0 +1,176 @@
+from __future__ import annotations
+import contextvars
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+@dataclass
+class StageRecord:
+    stage: str
+    seconds: float = 0.0
+    column: str | None = None
+    rows: int | None = None
+    nbytes: int | None = None
+    # traced allocation peak above the stage's starting point; None unless memory is traced
+    peak_bytes: int | None = None
+
+class Recorder:
+    """Wall time, rows/bytes and (with memory=True) peak traced memory per stage of one run.
+
+    Peaks come from tracemalloc, which is process-wide: a stage's peak includes whatever
+    parallel threads allocate while it is open.
+    """
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.records: list[StageRecord] = []
+        self._lock = threading.Lock()
+        # [traced bytes at entry, highest peak seen] of every open stage, across all threads
+        self._open: list[list[int]] = []
+        self._owns_tracing = False
+
+    def start(self) -> None:
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+    def stop(self) -> None:
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def _flush_peak(self) -> int:
+        # credit the process peak so far to every open stage; caller holds the lock
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self._open:
+            frame[1] = max(frame[1], peak)
+        return peak
+
+    @contextmanager
+    def stage(self, name: str, column: str | None = None, rows: int | None = None, nbytes: int | None = None) -> Iterator[StageRecord]:
+        rec = StageRecord(name, column=column, rows=rows, nbytes=nbytes)
+        frame = None
+        if self.memory and tracemalloc.is_tracing():
+            with self._lock:
+                # the peak is reset for the new stage only after every open stage has its share
+                self._flush_peak()
+                tracemalloc.reset_peak()
+                current = tracemalloc.get_traced_memory()[0]
+                frame = [current, current]
+                self._open.append(frame)
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec.seconds = time.perf_counter() - t0
+            with self._lock:
+                if frame is not None:
+                    # another owner may have stopped tracing meanwhile (parallel runs); then no peak
+                    if tracemalloc.is_tracing():
+                        self._flush_peak()
+                        rec.peak_bytes = frame[1] - frame[0]
+                    # by identity: two open frames can hold equal numbers
+                    del self._open[next(i for i, f in enumerate(self._open) if f is frame)]
+                self.records.append(rec)
+
+    def summary(self, top_columns: int = 50) -> dict:
+        """Totals per stage in first-seen order, plus the slowest per-column records."""
+        stages: dict[str, dict] = {}
+        for r in self.records:
+            s = stages.setdefault(r.stage, {"calls": 0, "seconds": 0.0, "rows": None, "bytes": None, "peak_mb": None})
+            s["calls"] += 1
+            s["seconds"] += r.seconds
+            if r.rows is not None:
+                s["rows"] = (s["rows"] or 0) + r.rows
+            if r.nbytes is not None:
+                s["bytes"] = (s["bytes"] or 0) + r.nbytes
+            if r.peak_bytes is not None:
+                s["peak_mb"] = max(s["peak_mb"] or 0.0, r.peak_bytes / 2**20)
+        columns = sorted((r for r in self.records if r.column is not None), key=lambda r: r.seconds, reverse=True)
+        return {
+            "memory_traced": self.memory,
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": stages,
+            "slowest_columns": [
+                {
+                    "column": r.column,
+                    "stage": r.stage,
+                    "seconds": r.seconds,
+                    "peak_mb": None if r.peak_bytes is None else r.peak_bytes / 2**20,
+                }
+                for r in columns[:top_columns]
+            ],
+        }
+
+def peak_rss_mb() -> float | None:
+    # the process's resident high-water mark so far; None where the resource module is missing (Windows)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10  # bytes on macOS, KiB elsewhere
+
+_ACTIVE: ContextVar[Recorder | None] = ContextVar("drift_recorder", default=None)
+
+@contextmanager
+def recording(recorder: Recorder) -> Iterator[Recorder]:
+    # stages opened in this context (and in functions wrapped by in_context) report to `recorder`
+    token = _ACTIVE.set(recorder)
+    recorder.start()
+    try:
+        yield recorder
+    finally:
+        recorder.stop()
+        _ACTIVE.reset(token)
+
+@contextmanager
+def stage(name: str, column: str | None = None, rows: int | None = None, nbytes: int | None = None) -> Iterator[StageRecord]:
+    """Time a block under the active recorder; without one the block just runs."""
+    recorder = _ACTIVE.get()
+    if recorder is None:
+        yield StageRecord(name)
+        return
+    with recorder.stage(name, column=column, rows=rows, nbytes=nbytes) as rec:
+        yield rec
+
+def in_context(fn: Callable) -> Callable:
+    # pool threads do not inherit context variables; run each call in a copy of the caller's
+    ctx = contextvars.copy_context()
+    return lambda *args: ctx.copy().run(fn, *args)
+
+@contextmanager
+def profiled(out_dir: str | Path, top: int = 40) -> Iterator[Path]:
+    """cProfile + tracemalloc around a block of the calling thread.
+
+    Writes run.prof (for snakeviz/pstats), cprofile.txt and tracemalloc.txt to `out_dir`.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    owns_tracing = not tracemalloc.is_tracing()
+    if owns_tracing:
+        tracemalloc.start(10)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield out
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if owns_tracing:
+            tracemalloc.stop()
+        profiler.dump_stats(out / "run.prof")
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(top)
+        (out / "cprofile.txt").write_text(text.getvalue(), encoding="utf-8")
+        lines = [str(s) for s in snapshot.statistics("lineno")[:top]] if snapshot is not None else ["tracing was stopped by another run"]
+        (out / "tracemalloc.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
@@ -1,30 +1,295 @@
 from __future__ import annotations
 from dataclasses import dataclass
+import io
+import os
+from pathlib import Path
+from typing import Iterator
 import pandas as pd
+from app.core.instrument import stage
+from app.core.profile import DatasetProfile, profile_chunks
+from app.core.schema import ColumnSchema, parse_dtypes
 
 @dataclass(frozen=True)
 class LoadResult:
     df: pd.DataFrame
     path: str
 
-def load_csv(path: str, max_rows: int | None = None) -> LoadResult:
+# local columnar formats, read through pyarrow
+FORMATS = {".parquet": "parquet", ".pq": "parquet", ".feather": "ipc", ".arrow": "ipc", ".ipc": "ipc"}
+
+def file_format(path: str) -> str:
+    return FORMATS.get(Path(path).suffix.lower(), "csv")
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ValueError("Reading Parquet/Feather/Arrow files requires pyarrow (pip install pyarrow).") from e
+    return pyarrow
+
+def _check_local(path: str) -> None:
+    if not path:
+        raise ValueError("File path is empty.")
+    if "://" in path:
+        raise ValueError(f"Only local files are supported: {path}")
+
+def load_csv(
+    path: str,
+    max_rows: int | None = None,
+    columns: list[str] | None = None,
+    schema: list[ColumnSchema] | None = None,
+) -> LoadResult:
     if not path:
         raise ValueError("CSV path is empty.")
+    dtype = None if schema is None else _csv_dtypes(schema, columns)
+    with stage("load_csv") as st:
+        try:
+            st.nbytes = os.path.getsize(path)
+            # nrows stops the parser early instead of truncating a full read
+            df = pd.read_csv(path, nrows=max_rows, usecols=columns, dtype=dtype)
+        except Exception as e:
+            raise ValueError(f"Could not read CSV: {e}") from e
+        st.rows = len(df)
+
+    if df.shape[1] == 0:
+        raise ValueError("CSV has zero columns.")
+    if columns is not None:
+        df = df[columns]
+    return LoadResult(df=df, path=path)
+
+def _read_arrow_table(path: str, fmt: str, columns: list[str] | None, max_rows: int | None):
+    pa = _pyarrow()
+    if fmt == "ipc":
+        # memory-mapped: only the projected columns' buffers are touched
+        table = pa.feather.read_table(path, columns=columns, memory_map=True)
+        return table if max_rows is None else table.slice(0, max_rows)
+    pf = pa.parquet.ParquetFile(path, memory_map=True)
+    if max_rows is None:
+        return pf.read(columns=columns)
+    batches, n = [], 0
+    for batch in pf.iter_batches(batch_size=min(max_rows, 65_536), columns=columns):
+        batches.append(batch.slice(0, max_rows - n))
+        n += batches[-1].num_rows
+        if n >= max_rows:
+            break
+    if not batches:
+        return pf.read(columns=columns).slice(0, 0)
+    return pa.Table.from_batches(batches)
+
+def _csv_dtypes(schema: list[ColumnSchema], columns: list[str] | None) -> dict[str, str]:
+    dtypes = parse_dtypes(schema)
+    return dtypes if columns is None else {k: v for k, v in dtypes.items() if k in columns}
+
+def load_table(
+    path: str,
+    max_rows: int | None = None,
+    columns: list[str] | None = None,
+    schema: list[ColumnSchema] | None = None,
+) -> LoadResult:
+    """Load CSV, Parquet or Feather/Arrow IPC; typed formats keep their on-disk dtypes.
+
+    A CSV read with a known `schema` (e.g. the baseline's) parses with fixed dtypes.
+    """
+    _check_local(path)
+    fmt = file_format(path)
+    if fmt == "csv":
+        return load_csv(path, max_rows=max_rows, columns=columns, schema=schema)
+    _pyarrow()
+    with stage(f"load_{fmt}") as st:
+        try:
+            table = _read_arrow_table(path, fmt, columns, max_rows)
+            st.nbytes = table.nbytes
+            df = table.to_pandas(split_blocks=True)
+        except Exception as e:
+            raise ValueError(f"Could not read {fmt} file: {e}") from e
+        st.rows = len(df)
+    if df.shape[1] == 0:
+        raise ValueError("File has zero columns.")
+    return LoadResult(df=df, path=path)
+
+def iter_csv_chunks(
+    path: str,
+    chunksize: int = 100_000,
+    max_rows: int | None = None,
+    schema: list[ColumnSchema] | None = None,
+    columns: list[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    if chunksize <= 0:
+        raise ValueError("chunksize must be positive.")
+    if schema is None:
+        # probe the first chunk so every chunk parses non-numeric columns the same way
+        head = load_csv(path, max_rows=chunksize if max_rows is None else min(chunksize, max_rows), columns=columns).df
+        dtype = {col: "object" for col in head.columns if not pd.api.types.is_numeric_dtype(head[col])}
+    else:
+        if not path:
+            raise ValueError("CSV path is empty.")
+        dtype = _csv_dtypes(schema, columns)
     try:
-        df = pd.read_csv(path)
+        reader = pd.read_csv(path, chunksize=chunksize, nrows=max_rows, usecols=columns, dtype=dtype)
     except Exception as e:
         raise ValueError(f"Could not read CSV: {e}") from e
+    with reader:
+        for chunk in reader:
+            if chunk.shape[1] == 0:
+                raise ValueError("CSV has zero columns.")
+            yield chunk if columns is None else chunk[columns]
 
-    if max_rows is not None and len(df) > max_rows:
-        df = df.head(max_rows).copy()
+def csv_end_offset(path: str, size_before: int) -> int | None:
+    """Where a tail can resume after a full read of `path` that started when it had `size_before` bytes.
 
-    if df.shape[1] == 0:
-        raise ValueError("CSV has zero columns.")
-    return LoadResult(df=df, path=path)
+    None unless the file still has that size (nothing was appended mid-read) and ends on a newline.
+    """
+    try:
+        if size_before == 0 or os.path.getsize(path) != size_before:
+            return None
+        with open(path, "rb") as f:
+            f.seek(size_before - 1)
+            return size_before if f.read(1) == b"\n" else None
+    except OSError:
+        return None
+
+class CsvTail:
+    """Parses only the rows appended to a CSV since the previous call; the header is read once.
+
+    `offset` skips rows already read elsewhere (see csv_end_offset); only the header is read before it.
+    """
+
+    def __init__(self, path: str, schema: list[ColumnSchema] | None = None, offset: int = 0):
+        _check_local(path)
+        self.path = path
+        self.offset = offset  # bytes consumed, always at a line boundary
+        self.columns: list[str] | None = None
+        self._dtype = None if schema is None else parse_dtypes(schema)
+
+    def read_new(self) -> pd.DataFrame | None:
+        try:
+            size = os.path.getsize(self.path)
+            if size < self.offset:
+                raise ValueError(f"{self.path} shrank; only append-only files can be watched.")
+            with open(self.path, "rb") as f:
+                if self.columns is None:
+                    header = f.readline()
+                    if not header.endswith(b"\n"):
+                        return None
+                    self.columns = [str(c) for c in pd.read_csv(io.BytesIO(header), nrows=0).columns]
+                    self.offset = max(self.offset, len(header))
+                f.seek(self.offset)
+                data = f.read(size - self.offset)
+        except OSError as e:
+            raise ValueError(f"Could not read CSV: {e}") from e
+        # a trailing partial row stays on disk until its newline arrives
+        end = data.rfind(b"\n") + 1
+        if not data[:end].strip():
+            self.offset += end
+            return None
+        try:
+            df = pd.read_csv(io.BytesIO(data[:end]), header=None, names=self.columns, dtype=self._dtype)
+        except Exception as e:
+            raise ValueError(f"Could not parse appended rows: {e}") from e
+        self.offset += end
+        return df
+
+def iter_chunks(
+    path: str,
+    chunksize: int = 100_000,
+    max_rows: int | None = None,
+    schema: list[ColumnSchema] | None = None,
+    columns: list[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    _check_local(path)
+    fmt = file_format(path)
+    if fmt == "csv":
+        yield from iter_csv_chunks(path, chunksize=chunksize, max_rows=max_rows, schema=schema, columns=columns)
+        return
+    if chunksize <= 0:
+        raise ValueError("chunksize must be positive.")
+    pa = _pyarrow()
+    try:
+        table = _read_arrow_table(path, fmt, columns, max_rows) if fmt == "ipc" else None
+        if table is not None:
+            batches = (table.slice(start, chunksize) for start in range(0, max(table.num_rows, 1), chunksize))
+        else:
+            pf = pa.parquet.ParquetFile(path, memory_map=True)
+            batches = pf.iter_batches(batch_size=chunksize, columns=columns)
+        n = 0
+        for batch in batches:
+            if max_rows is not None:
+                batch = batch.slice(0, max_rows - n)
+            n += batch.num_rows
+            yield batch.to_pandas(split_blocks=True)
+            if max_rows is not None and n >= max_rows:
+                break
+    except Exception as e:
+        raise ValueError(f"Could not read {fmt} file: {e}") from e
+
+def profile_csv(
+    path: str,
+    chunksize: int = 100_000,
+    max_rows: int | None = None,
+    schema: list[ColumnSchema] | None = None,
+    max_cat_unique: int = 50,
+    sketch_k: int = 512,
+) -> DatasetProfile:
+    # streaming mode: memory is bounded by chunksize and sketch size, not file size
+    chunks = iter_csv_chunks(path, chunksize=chunksize, max_rows=max_rows, schema=schema)
+    return profile_chunks(chunks, path=path, schema=schema, max_cat_unique=max_cat_unique, sketch_k=sketch_k)
+
+def profile_file(
+    path: str,
+    chunksize: int = 100_000,
+    max_rows: int | None = None,
+    schema: list[ColumnSchema] | None = None,
+    columns: list[str] | None = None,
+    max_cat_unique: int = 50,
+    sketch_k: int = 512,
+) -> DatasetProfile:
+    # streaming profile of any supported format, optionally projected to `columns`
+    chunks = iter_chunks(path, chunksize=chunksize, max_rows=max_rows, schema=schema, columns=columns)
+    return profile_chunks(chunks, path=path, schema=schema, max_cat_unique=max_cat_unique, sketch_k=sketch_k)
+
+def read_file_schema(path: str) -> list[tuple[str, str]]:
+    """Column names and dtypes from file metadata only (Parquet footer, IPC schema, CSV header)."""
+    _check_local(path)
+    fmt = file_format(path)
+    pa = _pyarrow() if fmt != "csv" else None
+    try:
+        if fmt == "csv":
+            return [(str(col), "") for col in pd.read_csv(path, nrows=0).columns]
+        if fmt == "parquet":
+            schema = pa.parquet.read_schema(path, memory_map=True)
+        else:
+            with pa.memory_map(path) as source:
+                try:
+                    schema = pa.ipc.open_file(source).schema
+                except pa.ArrowInvalid:
+                    # Feather v1 has no IPC footer
+                    schema = pa.feather.read_table(path, memory_map=True).schema
+        return [(field.name, str(field.type)) for field in schema]
+    except Exception as e:
+        raise ValueError(f"Could not read schema of {path}: {e}") from e
+
+def validate_file_schemas(baseline_path: str, current_path: str) -> tuple[bool, str]:
+    # compares metadata before any data is read
+    b = read_file_schema(baseline_path)
+    c = read_file_schema(current_path)
+    ok, msg = validate_columns([n for n, _ in b], [n for n, _ in c])
+    if not ok:
+        return ok, msg
+    changed = [f"{n}: {bt} -> {ct}" for (n, bt), (_, ct) in zip(b, c) if bt and ct and bt != ct]
+    if changed:
+        msg += "\nType changes: " + ", ".join(changed)
+    return True, msg
 
 def validate_schema(baseline: pd.DataFrame, current: pd.DataFrame) -> tuple[bool, str]:
-    bcols = list(baseline.columns)
-    ccols = list(current.columns)
+    return validate_columns(list(baseline.columns), list(current.columns))
+
+def validate_columns(bcols: list, ccols: list) -> tuple[bool, str]:
+    with stage("validate_schema"):
+        return _validate_columns(bcols, ccols)
+
+def _validate_columns(bcols: list, ccols: list) -> tuple[bool, str]:
     if bcols != ccols:
         bset, cset = set(bcols), set(ccols)
         missing_in_current = sorted(list(bset - cset))
@@ -0,0 +1,51 @@
+from __future__ import annotations
+import sys
+from contextlib import suppress
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+@dataclass(frozen=True)
+class SharedArrayRef:
+    # picklable handle to a column-major array living in shared memory
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+class SharedArrays:
+    """Owns the shared-memory blocks handed to worker processes for one run."""
+
+    def __init__(self):
+        self._blocks: list[SharedMemory] = []
+
+    def empty(self, shape: tuple[int, ...], dtype) -> tuple[SharedArrayRef, np.ndarray]:
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        shm = SharedMemory(create=True, size=size)
+        self._blocks.append(shm)
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf, order="F")
+        return SharedArrayRef(name=shm.name, shape=tuple(shape), dtype=dtype.str), arr
+
+    def close(self) -> None:
+        for shm in self._blocks:
+            with suppress(BufferError):
+                shm.close()
+            with suppress(FileNotFoundError):
+                shm.unlink()
+        self._blocks.clear()
+
+    def __enter__(self) -> SharedArrays:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def attach(ref: SharedArrayRef) -> tuple[SharedMemory, np.ndarray]:
+    # pool workers share the creator's resource tracker, which owns cleanup
+    shm = SharedMemory(name=ref.name, track=False) if sys.version_info >= (3, 13) else SharedMemory(name=ref.name)
+    return shm, np.ndarray(ref.shape, dtype=np.dtype(ref.dtype), buffer=shm.buf, order="F")
+
+def detach(shm: SharedMemory) -> None:
+    # views still alive (e.g. in a traceback) keep the mapping until they are collected
+    with suppress(BufferError):
+        shm.close()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from app.core import drift_metrics as dm
+from app.core.profile import ColumnProfile
+
+@dataclass(frozen=True)
+class PlotData:
+    """Counts behind one Feature View plot: histogram bins or top categories."""
+
+    kind: str  # "numeric" | "categorical"
+    baseline: np.ndarray
+    current: np.ndarray
+    edges: np.ndarray | None = None  # numeric: len(baseline) + 1 bin edges
+    labels: tuple[str, ...] = ()  # categorical: one label per bar
+
+def _plot_edges(bp: ColumnProfile, lo: float, hi: float, bins: int) -> np.ndarray:
+    # one set of bins over both ranges; the baseline range comes from its profile sketch
+    blo, bhi = bp.sketch.quantiles([0, 1])
+    lo, hi = min(blo, lo), max(bhi, hi)
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, bins + 1)
+
+def numeric_plot_data(bp: ColumnProfile, c: pd.Series, bins: int = 30) -> PlotData | None:
+    cnum = pd.to_numeric(c, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    cnum = cnum[~np.isnan(cnum)]
+    if bp.sketch is None or bp.sketch.n == 0 or cnum.size == 0:
+        return None
+    edges = _plot_edges(bp, cnum.min(), cnum.max(), bins)
+    current, _ = np.histogram(cnum, bins=edges)
+    return PlotData("numeric", bp.sketch.histogram(edges), current.astype(float), edges=edges)
+
+def categorical_plot_data(counts: dm.CategoryCounts, top_k: int = 12) -> PlotData:
+    top = counts.top(top_k)
+    labels = tuple("∅NA" if pd.isna(v) else str(v) for v in top.labels)
+    return PlotData("categorical", top.baseline, top.current, labels=labels)
+
+def heavy_hitter_plot_data(details: dict, top_k: int = 12) -> PlotData | None:
+    # sketched text columns: estimated shares (%) of the values whose share moved most
+    top = details.get("top_changes", [])[:top_k]
+    if not top:
+        return None
+    labels = tuple(str(t["category"]) for t in top)
+    baseline = np.array([t["baseline_pct"] for t in top]) * 100
+    current = np.array([t["current_pct"] for t in top]) * 100
+    return PlotData("categorical", baseline, current, labels=labels)
+
+def feature_plot_data(bp: ColumnProfile, c: pd.Series, kind: str, counts: dm.CategoryCounts | None = None) -> PlotData | None:
+    # `counts` are the aligned counts from scoring, when still at hand
+    if kind == "numeric":
+        return numeric_plot_data(bp, c)
+    if kind == "categorical":
+        if counts is None:
+            counts = dm.align_counts(bp.category_counts(), c.value_counts(dropna=False))
+        return categorical_plot_data(counts)
+    return None
+
+def profile_plot_data(bp: ColumnProfile, cp: ColumnProfile, kind: str, bins: int = 30) -> PlotData | None:
+    # same plots from a current profile (live mode), where the raw column is not kept
+    if kind == "numeric":
+        if bp.sketch is None or bp.sketch.n == 0 or cp.sketch is None or cp.sketch.n == 0:
+            return None
+        edges = _plot_edges(bp, *cp.sketch.quantiles([0, 1]), bins)
+        return PlotData("numeric", bp.sketch.histogram(edges), cp.sketch.histogram(edges), edges=edges)
+    if kind == "categorical" and cp.categories is not None:
+        return categorical_plot_data(dm.align_counts(bp.category_counts(), cp.category_counts()))
+    return None
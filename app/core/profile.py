@@ -0,0 +1,178 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Iterable
+import numpy as np
+import pandas as pd
+from app.core.instrument import stage
+from app.core.schema import ColumnSchema, infer_schema
+from app.core.sketch import QuantileSketch, ValueSketch
+
+@dataclass
+class ColumnProfile:
+    name: str
+    kind: str
+    count: int = 0
+    missing: int = 0
+    # non-null value counts; None once more than max_cat_unique distinct values were seen
+    categories: dict | None = field(default_factory=dict)
+    sketch: QuantileSketch | None = None
+    max_cat_unique: int | None = 50
+    # fixed-size heavy hitter / distinct / vocabulary sketch, started when a text column overflows
+    values: ValueSketch | None = None
+    # PSI bin edges and baseline bin counts per bin count, computed on first use
+    psi_refs: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def missing_rate(self) -> float:
+        return self.missing / self.count if self.count else 0.0
+
+    def update(self, s: pd.Series) -> None:
+        self.count += len(s)
+        self.missing += int(s.isna().sum())
+        self.psi_refs.clear()
+        if self.sketch is not None:
+            self.sketch.update(pd.to_numeric(s, errors="coerce").to_numpy(dtype=float, na_value=np.nan))
+        if self.categories is not None:
+            vc = s.value_counts(dropna=True)
+            vc = vc[vc > 0]  # categorical dtypes also list unobserved categories
+            if self.max_cat_unique is not None and len(vc) > self.max_cat_unique:
+                self._overflow()
+                if self.values is not None:
+                    self.values.update(vc.index, vc.to_numpy())
+                return
+            for value, n in vc.items():
+                self.categories[value] = self.categories.get(value, 0) + int(n)
+            self._check_overflow()
+        elif self.values is not None:
+            self.values.update(s.dropna().to_numpy(dtype=object))
+
+    def merge(self, other: ColumnProfile) -> None:
+        self.count += other.count
+        self.missing += other.missing
+        self.psi_refs.clear()
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        if self.categories is not None:
+            if other.categories is None:
+                self._overflow()
+                if self.values is not None and other.values is not None:
+                    self.values.merge(other.values)
+                return
+            for value, n in other.categories.items():
+                self.categories[value] = self.categories.get(value, 0) + n
+            self._check_overflow()
+        elif self.values is not None:
+            other_values = other.value_sketch()
+            if other_values is not None:
+                self.values.merge(other_values)
+
+    def _check_overflow(self) -> None:
+        if self.max_cat_unique is not None and len(self.categories) > self.max_cat_unique:
+            self._overflow()
+
+    def _overflow(self) -> None:
+        # text columns carry on in a ValueSketch, seeded with the counts so far
+        if self.kind in ("categorical", "unknown"):
+            self.values = self._sketch_categories()
+        self.categories = None
+        if self.kind == "categorical":
+            self.kind = "unknown"
+
+    def _sketch_categories(self) -> ValueSketch:
+        sketch = ValueSketch()
+        if self.categories:
+            sketch.update(list(self.categories), list(self.categories.values()))
+        return sketch
+
+    def value_sketch(self) -> ValueSketch | None:
+        # the column's ValueSketch; a column that never overflowed gets one from its exact counts
+        if self.values is not None:
+            return self.values
+        if self.categories is not None and self.kind in ("categorical", "unknown"):
+            return self._sketch_categories()
+        return None
+
+    def psi_reference(self, bins: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        if bins not in self.psi_refs:
+            edges = np.unique(self.sketch.quantiles(np.linspace(0, 1, bins + 1)))
+            counts = self.sketch.histogram(edges) if len(edges) >= 3 else np.zeros(0)
+            self.psi_refs[bins] = (edges, counts)
+        return self.psi_refs[bins]
+
+    def category_counts(self) -> pd.Series:
+        # NaN is its own category, matching value_counts(dropna=False)
+        counts = pd.Series(self.categories or {}, dtype=float)
+        if self.missing:
+            counts = pd.concat([counts, pd.Series([float(self.missing)], index=[np.nan])])
+        return counts
+
+    def schema(self) -> ColumnSchema:
+        # nunique is exact up to max_cat_unique and a lower bound beyond it
+        nunique = len(self.categories) if self.categories is not None else (self.max_cat_unique or 0) + 1
+        return ColumnSchema(name=self.name, kind=self.kind, nunique=nunique, missing_rate=self.missing_rate)
+
+@dataclass
+class DatasetProfile:
+    path: str
+    columns: dict[str, ColumnProfile]
+    n_rows: int = 0
+
+    def update(self, df: pd.DataFrame) -> None:
+        self.n_rows += len(df)
+        for name, cp in self.columns.items():
+            cp.update(df[name])
+
+    def merge(self, other: DatasetProfile) -> None:
+        self.n_rows += other.n_rows
+        for name, cp in self.columns.items():
+            cp.merge(other.columns[name])
+
+    def schema(self) -> list[ColumnSchema]:
+        return [cp.schema() for cp in self.columns.values()]
+
+def empty_profile(
+    df: pd.DataFrame,
+    path: str = "",
+    schema: list[ColumnSchema] | None = None,
+    max_cat_unique: int = 50,
+    sketch_k: int = 512,
+) -> DatasetProfile:
+    # kinds come from `schema` when given (e.g. the baseline's), otherwise from df
+    pinned = schema is not None
+    kinds = {s.name: s.kind for s in (schema if pinned else infer_schema(df, max_cat_unique=max_cat_unique))}
+    if pinned and sorted(kinds) != sorted(str(c) for c in df.columns):
+        raise ValueError("Schema mismatch: columns differ from the pinned schema.")
+    columns: dict[str, ColumnProfile] = {}
+    for col in df.columns:
+        name = str(col)
+        kind = kinds[name]
+        columns[name] = ColumnProfile(
+            name=name,
+            kind=kind,
+            sketch=QuantileSketch(k=sketch_k) if kind == "numeric" else None,
+            # a pinned categorical column keeps every category so it can be compared
+            max_cat_unique=None if pinned and kind == "categorical" else max_cat_unique,
+        )
+    return DatasetProfile(path=path, columns=columns)
+
+def profile_chunks(
+    chunks: Iterable[pd.DataFrame],
+    path: str = "",
+    schema: list[ColumnSchema] | None = None,
+    max_cat_unique: int = 50,
+    sketch_k: int = 512,
+) -> DatasetProfile:
+    profile: DatasetProfile | None = None
+    with stage("profile") as st:
+        # includes reading the chunks when they are streamed from disk
+        for chunk in chunks:
+            if profile is None:
+                profile = empty_profile(chunk, path=path, schema=schema, max_cat_unique=max_cat_unique, sketch_k=sketch_k)
+            profile.update(chunk)
+        if profile is None:
+            raise ValueError("No data to profile.")
+        st.rows = profile.n_rows
+    return profile
+
+def profile_frame(df: pd.DataFrame, **kwargs) -> DatasetProfile:
+    return profile_chunks([df], **kwargs)
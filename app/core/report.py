@@ -2,36 +2,91 @@ from __future__ import annotations
 from dataclasses import asdict
 from pathlib import Path
 import pandas as pd
+from app.core.instrument import stage
 from app.core.utils import write_json, now_iso
 
-def export_report_json(out_path: str, baseline_path: str, current_path: str, schema, drifts, top_n: int = 25) -> str:
-    payload = {
-        "generated_at": now_iso(),
-        "baseline_path": baseline_path,
-        "current_path": current_path,
-        "top_n": top_n,
-        "schema": [asdict(s) for s in schema],
-        "top_drifts": [asdict(d) for d in drifts[:top_n]],
-    }
-    write_json(out_path, payload)
+def key_metric(d, method: bool = False) -> str:
+    """One-line summary of a FeatureDrift's details, shared by the table and the Markdown report.
+
+    Approximate results start with ≈; `method` also names the method and its KS error bound.
+    """
+    key = ""
+    if d.kind == "numeric":
+        key = f"PSI={d.details.get('psi', 0):.4f}, KS p={d.details.get('ks_pvalue', 1):.3g}"
+    elif d.kind == "categorical":
+        key = f"JSD={d.details.get('js_divergence', 0):.4f}, χ² p={d.details.get('chi2_pvalue', 1):.3g}"
+    elif "distinct_current" in d.details:
+        # high-cardinality text: heavy-hitter JSD, distinct counts and vocabulary overlap
+        key = (
+            f"JSD(top)={d.details['js_divergence']:.4f}, distinct {d.details['distinct_baseline']:,.0f}→"
+            f"{d.details['distinct_current']:,.0f}, overlap {d.details['vocab_jaccard']:.2f}"
+        )
+    # bootstrap interval and permutation p-value, when the run resampled
+    metric = "psi" if d.kind == "numeric" else "js_divergence"
+    ci = d.details.get(f"{metric}_ci")
+    if key and ci is not None:
+        conf = d.details["resample"]["confidence"]
+        key += f", {conf:.0%} CI {ci[0]:.4f}–{ci[1]:.4f}, perm p={d.details[f'{metric}_perm_pvalue']:.3g}"
+    if key and d.details.get("method", "exact") != "exact":
+        key = f"≈ {key}"
+        if method:
+            bound = d.details.get("error_bound", {}).get("ks_stat_error")
+            key += f" ({d.details['method']}" + (f", KS ±{bound:.2g})" if bound is not None else ")")
+    return key
+
+def export_report_json(
+    out_path: str,
+    baseline_path: str,
+    current_path: str,
+    schema,
+    drifts,
+    top_n: int = 25,
+    run_stats: dict | None = None,
+    segments: dict | None = None,
+) -> str:
+    # run_stats: Recorder.summary() of the run that produced `drifts`, when it was recorded
+    # segments: SegmentedDrift.to_dict(), when a segmented run was made
+    with stage("export_json"):
+        payload = {
+            "generated_at": now_iso(),
+            "baseline_path": baseline_path,
+            "current_path": current_path,
+            "top_n": top_n,
+            "schema": [asdict(s) for s in schema],
+            "top_drifts": [asdict(d) for d in drifts[:top_n]],
+        }
+        if run_stats is not None:
+            payload["run_stats"] = run_stats
+        if segments is not None:
+            payload["segments"] = segments
+        write_json(out_path, payload)
     return out_path
 
-def export_report_md(out_path: str, baseline_path: str, current_path: str, drifts, top_n: int = 25) -> str:
-    lines = []
-    lines.append(f"# Data Drift Report\n")
-    lines.append(f"- Generated: {now_iso()}")
-    lines.append(f"- Baseline: `{baseline_path}`")
-    lines.append(f"- Current: `{current_path}`\n")
-    lines.append(f"## Top {top_n} drifted features\n")
-    lines.append("| Rank | Feature | Kind | Score | Missing Δ | Key metric |")
-    lines.append("|---:|---|---|---:|---:|---|")
-    for i, d in enumerate(drifts[:top_n], 1):
-        key = ""
-        if d.kind == "numeric":
-            key = f"PSI={d.details.get('psi', 0):.4f}, KS p={d.details.get('ks_pvalue', 1):.3g}"
-        elif d.kind == "categorical":
-            key = f"JSD={d.details.get('js_divergence', 0):.4f}, χ² p={d.details.get('chi2_pvalue', 1):.3g}"
-        lines.append(f"| {i} | {d.name} | {d.kind} | {d.score:.4f} | {d.missing_delta:.4f} | {key} |")
+def export_report_md(
+    out_path: str, baseline_path: str, current_path: str, drifts, top_n: int = 25, segments: dict | None = None
+) -> str:
+    with stage("export_md"):
+        lines = []
+        lines.append(f"# Data Drift Report\n")
+        lines.append(f"- Generated: {now_iso()}")
+        lines.append(f"- Baseline: `{baseline_path}`")
+        lines.append(f"- Current: `{current_path}`\n")
+        lines.append(f"## Top {top_n} drifted features\n")
+        lines.append("| Rank | Feature | Kind | Score | Missing Δ | Key metric |")
+        lines.append("|---:|---|---|---:|---:|---|")
+        for i, d in enumerate(drifts[:top_n], 1):
+            key = key_metric(d, method=True)
+            lines.append(f"| {i} | {d.name} | {d.kind} | {d.score:.4f} | {d.missing_delta:.4f} | {key} |")
+
+        if segments is not None:
+            lines.append(f"\n## Segment drift by {' × '.join(segments['segment_columns'])}\n")
+            lines.append("| Rank | Feature | Segment | Score | Missing Δ | Baseline rows | Current rows |")
+            lines.append("|---:|---|---|---:|---:|---:|---:|")
+            for i, cell in enumerate(segments["top_cells"], 1):
+                lines.append(
+                    f"| {i} | {cell['feature']} | {cell['segment']} | {cell['score']:.4f} | {cell['missing_delta']:.4f} "
+                    f"| {cell['baseline_rows']} | {cell['current_rows']} |"
+                )
 
-    Path(out_path).write_text("\n".join(lines), encoding="utf-8")
+        Path(out_path).write_text("\n".join(lines), encoding="utf-8")
     return out_path
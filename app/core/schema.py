@@ -2,43 +2,80 @@ from __future__ import annotations
 from dataclasses import dataclass
 import pandas as pd
 import numpy as np
+from app.core.instrument import stage
+
+# rows looked at when a decision only needs a sample (datetime sniffing, first cardinality block)
+SAMPLE_ROWS = 65_536
 
 @dataclass(frozen=True)
 class ColumnSchema:
     name: str
     kind: str  # "numeric" | "categorical" | "datetime" | "unknown"
-    nunique: int
+    nunique: int  # exact up to the cardinality limit, limit + 1 beyond it; 0 (not counted) for numeric/datetime
     missing_rate: float
 
+def _is_text(s: pd.Series) -> bool:
+    return s.dtype == object or isinstance(s.dtype, pd.StringDtype)
+
 def _try_parse_datetime(s: pd.Series) -> bool:
     if s.dtype.kind in ("M",):
         return True
-    if s.dtype == object:
-        sample = s.dropna().astype(str).head(50)
+    if _is_text(s):
+        # sample before converting: astype(str) over the full column is the expensive part
+        sample = s.iloc[:SAMPLE_ROWS].dropna().head(50)
+        if sample.empty:
+            sample = s.dropna().head(50)
         if sample.empty:
             return False
-        parsed = pd.to_datetime(sample, errors="coerce", utc=True)
+        parsed = pd.to_datetime(sample.astype(str), errors="coerce", utc=True)
         return parsed.notna().mean() >= 0.8
     return False
 
-def infer_schema(df: pd.DataFrame, max_cat_unique: int = 50) -> list[ColumnSchema]:
-    out: list[ColumnSchema] = []
+def bounded_nunique(s: pd.Series, limit: int, block: int = SAMPLE_ROWS) -> int:
+    # distinct non-null values, counted block by block; stops at limit + 1
+    seen: set = set()
+    for start in range(0, len(s), block):
+        seen.update(s.iloc[start : start + block].dropna().unique())
+        if len(seen) > limit:
+            return limit + 1
+    return len(seen)
+
+def infer_schema_map(df: pd.DataFrame, max_cat_unique: int = 50) -> dict[str, ColumnSchema]:
+    """Column schemas keyed by name, in column order; kind comes from dtype plus a bounded sample."""
+    with stage("infer_schema", rows=len(df)):
+        return _infer_schema_map(df, max_cat_unique)
+
+def _infer_schema_map(df: pd.DataFrame, max_cat_unique: int) -> dict[str, ColumnSchema]:
+    out: dict[str, ColumnSchema] = {}
     for col in df.columns:
         s = df[col]
         missing_rate = float(s.isna().mean())
-        nunique = int(s.nunique(dropna=True))
 
-        kind = "unknown"
         if _try_parse_datetime(s):
             kind = "datetime"
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            # dictionary-encoded on disk (Parquet/Arrow): categorical by declaration
+            kind = "categorical"
+        elif pd.api.types.is_numeric_dtype(s):
+            kind = "numeric"
+        elif pd.api.types.is_bool_dtype(s):
+            kind = "categorical"
         else:
-            if pd.api.types.is_numeric_dtype(s):
-                kind = "numeric"
-            elif pd.api.types.is_bool_dtype(s):
-                kind = "categorical"
-            else:
-                # object-like: decide categorical vs unknown by cardinality
-                kind = "categorical" if nunique <= max_cat_unique else "unknown"
-
-        out.append(ColumnSchema(name=str(col), kind=kind, nunique=nunique, missing_rate=missing_rate))
+            kind = None
+        # numeric and datetime kinds come from dtype alone; only the rest need the distinct count
+        nunique = bounded_nunique(s, max_cat_unique) if kind in (None, "categorical") else 0
+        if kind is None:
+            # object-like: decide categorical vs unknown by cardinality
+            kind = "categorical" if nunique <= max_cat_unique else "unknown"
+
+        out[str(col)] = ColumnSchema(name=str(col), kind=kind, nunique=nunique, missing_rate=missing_rate)
     return out
+
+def infer_schema(df: pd.DataFrame, max_cat_unique: int = 50) -> list[ColumnSchema]:
+    return list(infer_schema_map(df, max_cat_unique=max_cat_unique).values())
+
+def parse_dtypes(schema: list[ColumnSchema] | dict[str, ColumnSchema]) -> dict[str, str]:
+    """read_csv dtypes that reproduce the schema's kinds without inferring them again."""
+    # numeric columns stay on the parser's native path so malformed cells become NaN downstream
+    items = schema.values() if isinstance(schema, dict) else schema
+    return {s.name: "category" if s.kind == "categorical" else "object" for s in items if s.kind != "numeric"}
@@ -0,0 +1,168 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from app.core import drift_metrics as dm
+from app.core.instrument import stage
+from app.core.schema import ColumnSchema, infer_schema
+
+# segments x bins (x 2 sides) must stay small enough to hold as dense count matrices
+MAX_SEGMENTS = 10_000
+MISSING_LABEL = "(missing)"
+
+@dataclass(frozen=True)
+class SegmentedDrift:
+    """Drift of every feature within each segment: rows are features, columns are segments (NaN = too few rows)."""
+
+    segment_columns: list[str]
+    segments: list[str]  # "city=Paris, device=ios", largest current segment first
+    baseline_rows: np.ndarray
+    current_rows: np.ndarray
+    features: list[str]
+    kinds: list[str]
+    metric: np.ndarray  # PSI (numeric) or JSD (categorical)
+    missing_delta: np.ndarray
+    scores: np.ndarray
+
+    def frame(self, values: str = "scores") -> pd.DataFrame:
+        return pd.DataFrame(getattr(self, values), index=self.features, columns=self.segments)
+
+    def top_cells(self, n: int = 25) -> list[dict]:
+        # the worst (feature, segment) pairs
+        flat = np.where(np.isnan(self.scores), -np.inf, self.scores).ravel()
+        order = np.argsort(-flat, kind="stable")[: min(n, int(np.isfinite(flat).sum()))]
+        cells = []
+        for f, s in zip(*np.unravel_index(order, self.scores.shape)):
+            cells.append({
+                "feature": self.features[f],
+                "kind": self.kinds[f],
+                "segment": self.segments[s],
+                "score": float(self.scores[f, s]),
+                # NaN where one side has no values of the feature; JSON has no NaN
+                "metric": float(self.metric[f, s]) if np.isfinite(self.metric[f, s]) else None,
+                "missing_delta": float(self.missing_delta[f, s]),
+                "baseline_rows": int(self.baseline_rows[s]),
+                "current_rows": int(self.current_rows[s]),
+            })
+        return cells
+
+    def to_dict(self, top_n: int = 25) -> dict:
+        # report payload: every segment's size and worst feature, plus the worst cells overall
+        segments = []
+        for s, name in enumerate(self.segments):
+            col = self.scores[:, s]
+            worst = int(np.nanargmax(col)) if self.features and not np.isnan(col).all() else None
+            segments.append({
+                "segment": name,
+                "baseline_rows": int(self.baseline_rows[s]),
+                "current_rows": int(self.current_rows[s]),
+                "worst_feature": None if worst is None else self.features[worst],
+                "max_score": None if worst is None else float(col[worst]),
+            })
+        return {"segment_columns": self.segment_columns, "segments": segments, "top_cells": self.top_cells(top_n)}
+
+def segment_codes(baseline, current, columns: list[str]) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """One code per distinct combination of `columns`, shared by both frames; missing is a value of its own."""
+    n_b, n_c = baseline.shape[0], current.shape[0]
+    key = np.zeros(n_b + n_c, dtype=np.int64)
+    parts = []
+    for col in columns:
+        b_codes, c_codes, labels = dm.category_codes(baseline[col], current[col])
+        codes = np.concatenate([b_codes, c_codes]).astype(np.int64) + 1
+        parts.append((codes, np.array([MISSING_LABEL, *map(str, labels)], dtype=object)))
+        # refactorize after every column so the combined key never grows past the row count
+        key, _ = pd.factorize(key * (len(labels) + 1) + codes)
+    n_segments = int(key.max()) + 1 if len(key) else 0
+    if n_segments > MAX_SEGMENTS:
+        raise ValueError(f"{' x '.join(columns)} gives {n_segments} segments (max {MAX_SEGMENTS}); pick fewer columns.")
+
+    # number segments by current size, largest first
+    sizes = np.bincount(key[n_b:], minlength=n_segments)
+    order = np.argsort(-sizes, kind="stable")
+    rank = np.empty(n_segments, dtype=np.int64)
+    rank[order] = np.arange(n_segments)
+    key = rank[key]
+    _, first = np.unique(key, return_index=True)
+    names = [", ".join(f"{col}={labels[codes[i]]}" for col, (codes, labels) in zip(columns, parts)) for i in first]
+    return key[:n_b], key[n_b:], names
+
+def segmented_drift(
+    baseline,
+    current,
+    segment_columns: list[str],
+    schema: list[ColumnSchema] | None = None,
+    min_rows: int = 30,
+    bins: int = 10,
+) -> SegmentedDrift:
+    """Score every feature within each segment of `segment_columns`, current segment vs the same baseline segment.
+
+    Frames are DataFrames or CompactFrames. Rows of both frames get one segment code; each feature's
+    per-segment counts for both sides then come from a single bincount over segment x bin codes.
+    Numeric bins are the baseline's overall quantiles, so segments are compared on one scale.
+    """
+    if not segment_columns:
+        raise ValueError("Pick at least one segment column.")
+    for col in segment_columns:
+        if col not in baseline.columns or col not in current.columns:
+            raise ValueError(f"Unknown segment column: {col!r}")
+    if min_rows < 1:
+        raise ValueError("min_rows must be >= 1.")
+
+    with stage("segments", rows=baseline.shape[0] + current.shape[0]):
+        b_seg, c_seg, names = segment_codes(baseline, current, segment_columns)
+        n = len(names)
+        # baseline rows use codes [0, n), current rows [n, 2n): both sides count in the same bincount
+        codes = np.concatenate([b_seg, c_seg + n])
+        rows = np.bincount(codes, minlength=2 * n).reshape(2, n)
+
+        schema = schema if schema is not None else infer_schema(baseline)
+        schema = [s for s in schema if s.name not in segment_columns and s.kind in ("numeric", "categorical")]
+        metric = np.full((len(schema), n), np.nan)
+        missing_delta = np.full((len(schema), n), np.nan)
+
+        for i, cs in enumerate(schema):
+            b, c = baseline[cs.name], current[cs.name]
+            isna = np.concatenate([b.isna().to_numpy(), c.isna().to_numpy()]).astype(np.int64)
+            missing = dm.grouped_counts(codes, isna, 2 * n, 2)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                rate = missing[:, 1] / missing.sum(axis=1)
+            missing_delta[i] = rate[n:] - rate[:n]
+
+            if cs.kind == "numeric":
+                xb = pd.to_numeric(b, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+                xc = pd.to_numeric(c, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+                valid = xb[~np.isnan(xb)]
+                # same edges as psi_numeric over the whole baseline
+                edges = np.unique(np.quantile(valid, np.linspace(0, 1, bins + 1))) if valid.size else np.zeros(0)
+                if len(edges) < 3:
+                    metric[i] = 0.0
+                    continue
+                counts = dm.grouped_counts(codes, dm.bin_index(np.concatenate([xb, xc]), edges), 2 * n, len(edges) - 1)
+                ref, cur = counts[:n], counts[n:]
+                metric[i] = dm.psi_rows(ref, cur)
+            else:
+                b_codes, c_codes, labels = dm.category_codes(b, c)
+                # slot 0 holds missing values, as in count_codes
+                cat = np.concatenate([b_codes, c_codes]).astype(np.int64) + 1
+                counts = dm.grouped_counts(codes, cat, 2 * n, len(labels) + 1)
+                ref, cur = counts[:n], counts[n:]
+                metric[i] = dm.js_divergence_rows(ref, cur)
+            metric[i, (cur.sum(axis=1) == 0) | (ref.sum(axis=1) == 0)] = np.nan
+
+    # no comparison where either side of a segment is too small to say anything
+    small = (rows[0] < min_rows) | (rows[1] < min_rows)
+    metric[:, small] = np.nan
+    missing_delta[:, small] = np.nan
+    # same shape as the windowed score
+    scores = np.where(np.isnan(metric), 0.0, metric) + np.abs(missing_delta)
+    return SegmentedDrift(
+        segment_columns=list(segment_columns),
+        segments=names,
+        baseline_rows=rows[0],
+        current_rows=rows[1],
+        features=[s.name for s in schema],
+        kinds=[s.kind for s in schema],
+        metric=metric,
+        missing_delta=missing_delta,
+        scores=scores,
+    )
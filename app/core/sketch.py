@@ -0,0 +1,323 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+class QuantileSketch:
+    """Mergeable KLL-style quantile sketch over float values.
+
+    Level ``h`` holds items of weight ``2**h``. While nothing has been compacted
+    the sketch holds every value and all queries are exact.
+    """
+
+    def __init__(self, k: int = 512, seed: int = 0):
+        if k < 8:
+            raise ValueError("Sketch size k must be >= 8.")
+        self.k = int(k)
+        self.n = 0
+        self.levels: list[np.ndarray] = [np.empty(0, dtype=float)]
+        # rank error introduced by compactions: worst case and sum of squares
+        self.max_error = 0
+        self.error_var = 0
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def exact(self) -> bool:
+        return self.max_error == 0
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - 1 - h
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values) -> None:
+        v = np.asarray(values, dtype=float).ravel()
+        v = v[~np.isnan(v)]
+        if v.size == 0:
+            return
+        self.n += int(v.size)
+        self.levels[0] = np.concatenate([self.levels[0], v])
+        self._compress()
+
+    def merge(self, other: QuantileSketch) -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=float))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self.max_error += other.max_error
+        self.error_var += other.error_var
+        self._compress()
+
+    def _compress(self) -> None:
+        while sum(lv.size for lv in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            h = next(h for h, lv in enumerate(self.levels) if lv.size >= self._capacity(h))
+            items = np.sort(self.levels[h])
+            keep = items[-1:] if items.size % 2 else items[:0]
+            pairs = items[: items.size - keep.size]
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=float))
+            offset = int(self._rng.integers(2))
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], pairs[offset::2]])
+            self.levels[h] = keep
+            w = 2 ** h
+            self.max_error += w
+            self.error_var += w * w
+
+    def weighted_items(self) -> tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(lv.size, 2 ** h, dtype=float) for h, lv in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def values(self) -> np.ndarray:
+        if not self.exact:
+            raise ValueError("Sketch has been compacted; raw values are not available.")
+        return np.sort(self.levels[0])
+
+    def quantiles(self, qs) -> np.ndarray:
+        qs = np.asarray(qs, dtype=float)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        if self.exact:
+            return np.quantile(self.levels[0], qs)
+        items, weights = self.weighted_items()
+        # place each item at the centre of the rank block it stands for
+        pos = np.cumsum(weights) - (weights + 1) / 2
+        return np.interp(qs * (self.n - 1), pos, items)
+
+    def cdf(self, x) -> np.ndarray:
+        items, weights = self.weighted_items()
+        cw = np.concatenate([[0.0], np.cumsum(weights)])
+        idx = np.searchsorted(items, np.asarray(x, dtype=float), side="right")
+        return cw[idx] / max(1, self.n)
+
+    def histogram(self, edges) -> np.ndarray:
+        if self.exact:
+            counts, _ = np.histogram(self.levels[0], bins=edges)
+            return counts.astype(float)
+        items, weights = self.weighted_items()
+        counts, _ = np.histogram(items, bins=edges, weights=weights)
+        return counts
+
+    def nbytes(self) -> int:
+        return int(sum(lv.nbytes for lv in self.levels))
+
+    def rank_error(self, confidence: float = 0.99) -> float:
+        # normalized rank error bound: Hoeffding over the random compaction offsets,
+        # never above the deterministic worst case
+        if self.n == 0 or self.exact:
+            return 0.0
+        delta = 1.0 - confidence
+        prob = float(np.sqrt(2.0 * self.error_var * np.log(2.0 / delta)))
+        return min(prob, float(self.max_error)) / self.n
+
+class Reservoir:
+    """Mergeable uniform sample of fixed size (bottom-k by random key)."""
+
+    def __init__(self, size: int, seed: int = 0):
+        if size < 1:
+            raise ValueError("Reservoir size must be >= 1.")
+        self.size = int(size)
+        self.n = 0
+        self.keys = np.empty(0, dtype=float)
+        self.items = np.empty(0, dtype=float)
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def exact(self) -> bool:
+        return self.n <= self.size
+
+    def update(self, values) -> None:
+        v = np.asarray(values, dtype=float).ravel()
+        v = v[~np.isnan(v)]
+        if v.size == 0:
+            return
+        self.n += int(v.size)
+        self._keep(np.concatenate([self.keys, self._rng.random(v.size)]), np.concatenate([self.items, v]))
+
+    def merge(self, other: Reservoir) -> None:
+        self.n += other.n
+        self._keep(np.concatenate([self.keys, other.keys]), np.concatenate([self.items, other.items]))
+
+    def _keep(self, keys: np.ndarray, items: np.ndarray) -> None:
+        if keys.size > self.size:
+            idx = np.argpartition(keys, self.size - 1)[: self.size]
+            keys, items = keys[idx], items[idx]
+        self.keys, self.items = keys, items
+
+    def values(self) -> np.ndarray:
+        return np.sort(self.items)
+
+    def cdf_error(self, confidence: float = 0.99) -> float:
+        # DKW bound on the sample CDF vs the stream CDF
+        if self.exact:
+            return 0.0
+        return float(np.sqrt(np.log(2.0 / (1.0 - confidence)) / (2.0 * self.items.size)))
+
+def hash_values(values) -> np.ndarray:
+    # stable 64-bit hashes (same values hash alike across runs, files and processes)
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+def _odd_multipliers(n: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).integers(1, 2**63, size=n, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    # exact bit length of uint64 values, by binary search over the shift
+    x = x.copy()
+    n = np.zeros(x.shape, dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = x >= np.uint64(1) << np.uint64(shift)
+        n[big] += shift
+        x[big] >>= np.uint64(shift)
+    return n + (x > 0)
+
+class CountMinSketch:
+    """Count-min sketch over 64-bit hashes; estimates never undercount."""
+
+    def __init__(self, width: int = 2048, depth: int = 4, seed: int = 0):
+        if width < 2 or width & (width - 1) or depth < 1:
+            raise ValueError("width must be a power of two >= 2 and depth >= 1.")
+        self.width, self.depth, self.seed = int(width), int(depth), seed
+        self.n = 0.0
+        self.table = np.zeros((depth, width), dtype=np.float64)
+        self._mult = _odd_multipliers(depth, seed)
+        self._shift = np.uint64(64 - (width.bit_length() - 1))
+
+    def _index(self, hashes: np.ndarray) -> np.ndarray:
+        # multiply-shift: one independent bucket per row
+        return (hashes[None, :] * self._mult[:, None]) >> self._shift
+
+    def update(self, hashes: np.ndarray, counts: np.ndarray) -> None:
+        self.n += float(counts.sum())
+        for row, idx in enumerate(self._index(hashes)):
+            self.table[row] += np.bincount(idx.astype(np.intp), weights=counts, minlength=self.width)
+
+    def merge(self, other: CountMinSketch) -> None:
+        self.n += other.n
+        self.table += other.table
+
+    def estimate(self, hashes: np.ndarray) -> np.ndarray:
+        idx = self._index(hashes).astype(np.intp)
+        return np.take_along_axis(self.table, idx, axis=1).min(axis=0)
+
+    def error(self) -> float:
+        # each estimate is at most this fraction of n too high, with probability 1 - exp(-depth)
+        return float(np.e / self.width)
+
+class HyperLogLog:
+    """Distinct-count sketch with 2**p one-byte registers."""
+
+    def __init__(self, p: int = 12):
+        if not 4 <= p <= 18:
+            raise ValueError("p must be in [4, 18].")
+        self.p = int(p)
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray) -> None:
+        idx = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # position of the first 1-bit in the remaining 64 - p bits
+        rank = (64 - self.p + 1 - _bit_length(rest).astype(np.int64)).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other: HyperLogLog) -> None:
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        raw = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(2.0 ** -self.registers.astype(float))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # linear counting is the better estimate while many registers are empty
+        if raw <= 2.5 * m and zeros:
+            return float(m * np.log(m / zeros))
+        return float(raw)
+
+    def error(self) -> float:
+        # relative standard error
+        return float(1.04 / np.sqrt(len(self.registers)))
+
+class MinHash:
+    """Bottom-1 MinHash signature of a value set; matching slots estimate Jaccard similarity."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 0):
+        if num_perm < 1:
+            raise ValueError("num_perm must be >= 1.")
+        self.signature = np.full(num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        self._mult = _odd_multipliers(num_perm, seed + 1)
+        self._xor = np.random.default_rng(seed + 2).integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def update(self, hashes: np.ndarray, block: int = 16) -> None:
+        if hashes.size == 0:
+            return
+        # a few permutations at a time bounds the (permutations x values) temporary
+        for a in range(0, len(self.signature), block):
+            mixed = (hashes[None, :] ^ self._xor[a : a + block, None]) * self._mult[a : a + block, None]
+            np.minimum(self.signature[a : a + block], mixed.min(axis=1), out=self.signature[a : a + block])
+
+    def merge(self, other: MinHash) -> None:
+        np.minimum(self.signature, other.signature, out=self.signature)
+
+    def jaccard(self, other: MinHash) -> float:
+        return float(np.mean(self.signature == other.signature))
+
+    def error(self) -> float:
+        # standard error at the worst case J = 0.5
+        return float(0.5 / np.sqrt(len(self.signature)))
+
+class ValueSketch:
+    """Fixed-size summary of a high-cardinality column: heavy hitters, distinct count and vocabulary.
+
+    Values are hashed once per chunk; only the chunk's distinct hashes reach the sketches, and at
+    most `2 * top_k` candidate heavy hitters are kept by label.
+    """
+
+    def __init__(self, top_k: int = 64, width: int = 2048, depth: int = 4, p: int = 12, num_perm: int = 128, seed: int = 0):
+        self.top_k = int(top_k)
+        self.cms = CountMinSketch(width, depth, seed)
+        self.hll = HyperLogLog(p)
+        self.minhash = MinHash(num_perm, seed)
+        self.candidates: dict[str, np.uint64] = {}  # label -> hash
+
+    @property
+    def n(self) -> float:
+        return self.cms.n
+
+    def update(self, values, counts=None) -> None:
+        """Add non-null `values`, each seen once or `counts` times (e.g. from a value_counts)."""
+        values = np.asarray(values, dtype=object)
+        if values.size == 0:
+            return
+        hashes = hash_values(values)
+        uniq, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+        weights = np.bincount(inverse, weights=None if counts is None else np.asarray(counts, dtype=float), minlength=len(uniq))
+        self.cms.update(uniq, weights)
+        self.hll.update(uniq)
+        self.minhash.update(uniq)
+        # a value can only be a heavy hitter overall if it is one in some chunk
+        top = np.argsort(-weights, kind="stable")[: self.top_k]
+        for j in top:
+            self.candidates[str(values[first[j]])] = uniq[j]
+        self._prune()
+
+    def merge(self, other: ValueSketch) -> None:
+        self.cms.merge(other.cms)
+        self.hll.merge(other.hll)
+        self.minhash.merge(other.minhash)
+        self.candidates.update(other.candidates)
+        self._prune()
+
+    def _prune(self) -> None:
+        if len(self.candidates) <= 2 * self.top_k:
+            return
+        labels = list(self.candidates)
+        est = self.cms.estimate(np.array([self.candidates[v] for v in labels], dtype=np.uint64))
+        keep = np.argsort(-est, kind="stable")[: self.top_k]
+        self.candidates = {labels[i]: self.candidates[labels[i]] for i in keep}
+
+    def frequencies(self, hashes: np.ndarray) -> np.ndarray:
+        # estimated share of rows per value hash (count-min: never too low)
+        if len(hashes) == 0 or self.n == 0:
+            return np.zeros(len(hashes))
+        return np.minimum(self.cms.estimate(np.asarray(hashes, dtype=np.uint64)) / self.n, 1.0)
+
+    def nbytes(self) -> int:
+        return int(self.cms.table.nbytes + self.hll.registers.nbytes + self.minhash.signature.nbytes)
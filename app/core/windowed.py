@@ -0,0 +1,166 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from app.core import drift_metrics as dm
+from app.core.profile import DatasetProfile
+from app.core.schema import ColumnSchema, infer_schema
+
+REFERENCES = ("baseline", "rolling", "cumulative")
+
+# windows x bins must stay small enough to hold as dense count matrices
+MAX_WINDOWS = 10_000
+
+@dataclass(frozen=True)
+class WindowedDrift:
+    """Per-window drift of every feature: rows are features, columns are windows (NaN = no comparison)."""
+
+    time_column: str
+    window: str
+    reference: str
+    starts: pd.DatetimeIndex
+    rows: np.ndarray
+    features: list[str]
+    kinds: list[str]
+    metric: np.ndarray  # PSI (numeric) or JSD (categorical)
+    missing_delta: np.ndarray
+    scores: np.ndarray
+
+    def frame(self, values: str = "scores") -> pd.DataFrame:
+        return pd.DataFrame(getattr(self, values), index=self.features, columns=self.starts)
+
+def window_codes(ts: pd.Series, window: str) -> tuple[np.ndarray, pd.DatetimeIndex]:
+    # one vectorized pass: integer nanoseconds floored to epoch-aligned windows; NaT -> -1
+    try:
+        step = pd.Timedelta(window).value
+    except ValueError as e:
+        raise ValueError(f"Window must be a fixed duration such as '1h' or '7D': {window!r}") from e
+    if step <= 0:
+        raise ValueError("Window must be positive.")
+    try:
+        t = pd.to_datetime(ts, errors="coerce")
+    except ValueError:
+        # mixed UTC offsets (e.g. logs across a DST change): windows in UTC, as infer_schema parses them
+        t = pd.to_datetime(ts, errors="coerce", utc=True)
+    if t.dtype == object:
+        # older pandas returns mixed offsets as objects instead of raising
+        t = pd.to_datetime(ts, errors="coerce", utc=True)
+    tz = t.dt.tz
+    valid = t.notna().to_numpy()
+    if not valid.any():
+        raise ValueError(f"Column {ts.name!r} has no parseable timestamps.")
+    ns = t.to_numpy(dtype="datetime64[ns]", na_value=np.datetime64("NaT")).view(np.int64)
+    origin = ns[valid].min() // step * step
+    codes = np.full(len(ns), -1, dtype=np.int64)
+    codes[valid] = (ns[valid] - origin) // step
+    n_windows = int(codes.max()) + 1
+    if n_windows > MAX_WINDOWS:
+        raise ValueError(f"Window {window!r} gives {n_windows} windows (max {MAX_WINDOWS}); pick a larger window.")
+    starts = pd.DatetimeIndex(origin + step * np.arange(n_windows, dtype=np.int64)).tz_localize("UTC" if tz else None)
+    return codes, starts if tz is None else starts.tz_convert(tz)
+
+def _reference_counts(counts: np.ndarray, reference: str, lookback: int) -> np.ndarray:
+    # rolling/cumulative references come from prefix sums: window w sees cs[w] - cs[w - lookback]
+    cs = np.concatenate([np.zeros((1,) + counts.shape[1:]), np.cumsum(counts, axis=0)])
+    end = np.arange(counts.shape[0])
+    if reference == "cumulative":
+        return cs[end]
+    return cs[end] - cs[np.maximum(end - lookback, 0)]
+
+def windowed_drift(
+    df: pd.DataFrame,
+    time_column: str,
+    window: str = "1D",
+    baseline: DatasetProfile | None = None,
+    reference: str = "baseline",
+    lookback: int = 1,
+    bins: int = 10,
+) -> WindowedDrift:
+    """Score every feature of `df` per time window against the baseline profile or earlier windows.
+
+    Rows are assigned to windows once; each feature's per-window counts come from one bincount, and
+    rolling/cumulative references are differences of their prefix sums.
+    """
+    if reference not in REFERENCES:
+        raise ValueError(f"Unknown reference: {reference!r} (expected one of {', '.join(REFERENCES)}).")
+    if reference == "baseline" and baseline is None:
+        raise ValueError("reference='baseline' needs a baseline profile.")
+    if lookback < 1:
+        raise ValueError("lookback must be >= 1.")
+    if time_column not in df.columns:
+        raise ValueError(f"Unknown time column: {time_column!r}")
+
+    codes, starts = window_codes(df[time_column], window)
+    n_windows = len(starts)
+    rows = np.bincount(codes[codes >= 0], minlength=n_windows)
+
+    schema: list[ColumnSchema] = baseline.schema() if baseline is not None else infer_schema(df)
+    schema = [s for s in schema if s.name != time_column and s.name in df.columns]
+    metric = np.full((len(schema), n_windows), np.nan)
+    missing_delta = np.full((len(schema), n_windows), np.nan)
+
+    fixed = reference == "baseline"
+    for i, cs in enumerate(schema):
+        s = df[cs.name]
+        bp = baseline.columns[cs.name] if baseline is not None else None
+        missing = dm.grouped_counts(codes, s.isna().to_numpy().astype(np.int64), n_windows, 2)
+        if fixed:
+            ref_missing = np.broadcast_to([bp.count - bp.missing, bp.missing], missing.shape)
+        else:
+            ref_missing = _reference_counts(missing, reference, lookback)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            missing_delta[i] = missing[:, 1] / missing.sum(axis=1) - ref_missing[:, 1] / ref_missing.sum(axis=1)
+
+        if cs.kind == "numeric":
+            x = pd.to_numeric(s, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+            # bins come from the baseline when there is one, else from the whole column
+            if bp is not None:
+                edges, ref_hist = bp.psi_reference(bins)
+            else:
+                valid = x[~np.isnan(x)]
+                edges = np.unique(np.quantile(valid, np.linspace(0, 1, bins + 1))) if valid.size else np.zeros(0)
+            if len(edges) < 3:
+                # same as psi_numeric: too few distinct values to bin
+                metric[i] = 0.0
+                continue
+            cur = dm.grouped_counts(codes, dm.bin_index(x, edges), n_windows, len(edges) - 1)
+            ref = np.broadcast_to(ref_hist, cur.shape) if fixed else _reference_counts(cur, reference, lookback)
+            metric[i] = dm.psi_rows(ref, cur)
+        elif cs.kind == "categorical":
+            if bp is not None:
+                ref_series = bp.category_counts()
+                ref_series = ref_series[ref_series.index.notna()]
+                _, c_codes, labels = dm.category_codes(pd.Series(ref_series.index, dtype=object), s)
+            else:
+                c_codes, labels = pd.factorize(s)
+            # slot 0 holds missing values, as in count_codes
+            cur = dm.grouped_counts(codes, np.asarray(c_codes, dtype=np.int64) + 1, n_windows, len(labels) + 1)
+            if fixed:
+                ref = np.zeros(len(labels) + 1)
+                ref[0] = bp.missing
+                ref[1 : len(ref_series) + 1] = ref_series.to_numpy()
+                ref = np.broadcast_to(ref, cur.shape)
+            else:
+                ref = _reference_counts(cur, reference, lookback)
+            metric[i] = dm.js_divergence_rows(ref, cur)
+        else:
+            continue
+        metric[i, (cur.sum(axis=1) == 0) | (ref.sum(axis=1) == 0)] = np.nan
+
+    # no comparison where a window or its reference is empty
+    metric[:, rows == 0] = np.nan
+    missing_delta[:, rows == 0] = np.nan
+    # same shape as the snapshot score, without the test-based boost (windows are binned counts)
+    scores = np.where(np.isnan(metric), 0.0, metric) + np.abs(missing_delta)
+    return WindowedDrift(
+        time_column=time_column,
+        window=window,
+        reference=reference,
+        starts=starts,
+        rows=rows,
+        features=[s.name for s in schema],
+        kinds=[s.kind for s in schema],
+        metric=metric,
+        missing_delta=missing_delta,
+        scores=scores,
+    )
@@ -1,37 +1,85 @@
 from __future__ import annotations
+import threading
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QMessageBox, QLineEdit, QTableWidget, QTableWidgetItem,
-    QListWidget, QListWidgetItem, QSplitter, QFileDialog
+    QPushButton, QMessageBox, QLineEdit, QTableView, QListView, QHeaderView,
+    QAbstractItemView, QSplitter, QFileDialog, QProgressBar, QTabWidget, QComboBox,
+    QCheckBox, QSpinBox, QTreeWidget, QTreeWidgetItem, QListWidget, QListWidgetItem
 )
-from PySide6.QtCore import Qt
-
-from app.ui.widgets import FilePicker
-from app.ui.mpl_canvas import MplCanvas
-from app.core.loader import load_csv, validate_schema
-from app.core.drift_engine import compute_drift
+from PySide6.QtCore import Qt, QThread, QTimer, Signal
+
+from app.ui.widgets import FilePicker, LazyCanvas
+from app.ui.models import DriftFilterProxy, DriftTableModel
+from app.ui.workers import DriftWorker, SegmentDriftWorker, TailWorker, WindowedDriftWorker
+from app.core.profile import DatasetProfile
+from app.core.columnar import CompactFrame
+from app.core.cache import DEFAULT_CACHE_DIR, LRUCache, ProfileStore
+from app.core.drift_metrics import ResampleConfig
+from app.core.loader import file_format
+from app.core.plot_data import feature_plot_data, heavy_hitter_plot_data
 from app.core.report import export_report_json, export_report_md
+from app.core.utils import now_iso
 
-import pandas as pd
 import numpy as np
 
+_MISSING = object()
+
+PROFILE_DIR = DEFAULT_CACHE_DIR.parent / "profiles"
+RESAMPLE = ResampleConfig()
+
 class MainWindow(QMainWindow):
+    plot_requested = Signal(str)  # feature name, to the live tail worker
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Data Drift Desktop Dashboard (Offline)")
         self.resize(1200, 720)
 
-        self.baseline_picker = FilePicker("Baseline CSV:")
-        self.current_picker = FilePicker("Current CSV:")
+        self.baseline_picker = FilePicker("Baseline file:")
+        self.current_picker = FilePicker("Current file:")
 
         self.load_btn = QPushButton("Load & Compute Drift")
         self.load_btn.clicked.connect(self.on_load)
 
+        self.refresh_btn = QPushButton("Rebuild Baseline Profile")
+        self.refresh_btn.setToolTip("Drop the cached baseline profile so the next load re-reads the baseline file.")
+        self.refresh_btn.clicked.connect(self.on_refresh_baseline)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.on_cancel)
+
+        self.progress = QProgressBar()
+        self.progress.setVisible(False)
+
         self.export_btn = QPushButton("Export Report")
         self.export_btn.setEnabled(False)
         self.export_btn.clicked.connect(self.on_export)
 
-        self.status = QLabel("Select baseline + current CSV, then click Load.")
+        # live mode: re-read only rows appended to the current CSV at a fixed interval
+        self.watch_box = QCheckBox("Watch current file")
+        self.watch_box.setEnabled(False)
+        self.watch_box.setToolTip("Fold rows appended to the current CSV into the results as the file grows.")
+        self.watch_box.toggled.connect(self.on_watch_toggled)
+        self.watch_interval = QSpinBox()
+        self.watch_interval.setRange(1, 3600)
+        self.watch_interval.setValue(5)
+        self.watch_interval.setSuffix(" s")
+        self.watch_interval.setToolTip("Refresh interval while watching.")
+
+        self.resample_box = QCheckBox("Uncertainty")
+        self.resample_box.setToolTip(
+            "Add 95% bootstrap intervals and permutation p-values for PSI/JSD "
+            f"({RESAMPLE.replicates} resamples of the binned counts per feature)."
+        )
+
+        self.profile_box = QCheckBox("Profile run")
+        self.profile_box.setToolTip(
+            "Trace peak memory per stage and write cProfile/tracemalloc dumps under "
+            f"{PROFILE_DIR} (slower)."
+        )
+
+        self.status = QLabel("Select baseline + current files (CSV, Parquet, Feather/Arrow), then click Load.")
         self.status.setWordWrap(True)
 
         top = QVBoxLayout()
@@ -42,17 +90,36 @@ class MainWindow(QMainWindow):
 
         btn_row = QHBoxLayout()
         btn_row.addWidget(self.load_btn)
+        btn_row.addWidget(self.cancel_btn)
+        btn_row.addWidget(self.refresh_btn)
         btn_row.addWidget(self.export_btn)
+        btn_row.addWidget(self.watch_box)
+        btn_row.addWidget(self.watch_interval)
+        btn_row.addWidget(self.resample_box)
+        btn_row.addWidget(self.profile_box)
+        btn_row.addWidget(self.progress, 1)
         btn_row.addStretch(1)
         top.addLayout(btn_row)
         top.addWidget(self.status)
 
         self.feature_search = QLineEdit()
         self.feature_search.setPlaceholderText("Search features…")
-        self.feature_search.textChanged.connect(self.on_search)
-
-        self.feature_list = QListWidget()
-        self.feature_list.currentItemChanged.connect(self.on_feature_selected)
+        # filtering runs once typing pauses, not on every keystroke
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(200)
+        self._search_timer.timeout.connect(lambda: self.on_search(self.feature_search.text()))
+        self.feature_search.textChanged.connect(self._search_timer.start)
+
+        # one model over all results; the list and the table share its filter proxy
+        self.model = DriftTableModel(self)
+        self.proxy = DriftFilterProxy(self.model, self)
+
+        self.feature_list = QListView()
+        self.feature_list.setModel(self.proxy)
+        self.feature_list.setUniformItemSizes(True)
+        self.feature_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.feature_list.selectionModel().currentChanged.connect(self.on_feature_selected)
 
         left = QVBoxLayout()
         left.addWidget(QLabel("<b>Features</b>"))
@@ -61,17 +128,96 @@ class MainWindow(QMainWindow):
         left_widget = QWidget()
         left_widget.setLayout(left)
 
-        self.table = QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["Feature", "Kind", "Score", "Missing Δ", "Key metric"])
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.setSortingEnabled(True)
-
-        self.canvas = MplCanvas()
+        self.table.sortByColumn(2, Qt.DescendingOrder)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        # column widths are measured on the first rows only
+        self.table.horizontalHeader().setResizeContentsPrecision(100)
+        self.table.selectionModel().currentRowChanged.connect(self.on_table_selected)
+
+        # Matplotlib loads on the first plot (or in the background after startup), not before the window shows
+        self.canvas = LazyCanvas("MplCanvas")
+
+        # windowed drift: per-window scores of the current file over a timestamp column
+        self.time_column = QComboBox()
+        self.window_size = QLineEdit("1D")
+        self.window_size.setMaximumWidth(80)
+        self.window_size.setToolTip("Fixed window length, e.g. 1h, 6h, 1D, 7D.")
+        self.window_reference = QComboBox()
+        self.window_reference.addItems(["baseline", "rolling", "cumulative"])
+        self.window_reference.setToolTip("Compare each window with the baseline, the previous window, or all earlier windows.")
+        self.window_btn = QPushButton("Compute Windows")
+        self.window_btn.setEnabled(False)
+        self.window_btn.clicked.connect(self.on_compute_windows)
+        self.heatmap = LazyCanvas("HeatmapCanvas", on_click=self.on_heatmap_clicked)
+
+        window_row = QHBoxLayout()
+        window_row.addWidget(QLabel("Time column:"))
+        window_row.addWidget(self.time_column, 1)
+        window_row.addWidget(QLabel("Window:"))
+        window_row.addWidget(self.window_size)
+        window_row.addWidget(QLabel("Compare with:"))
+        window_row.addWidget(self.window_reference)
+        window_row.addWidget(self.window_btn)
+        window_layout = QVBoxLayout()
+        window_layout.addLayout(window_row)
+        window_layout.addWidget(self.heatmap, 1)
+        window_widget = QWidget()
+        window_widget.setLayout(window_layout)
+
+        # segmented drift: feature x segment scores over one or more categorical columns
+        self.segment_columns = QListWidget()
+        self.segment_columns.setMaximumHeight(70)
+        self.segment_columns.setToolTip("Tick the categorical columns whose value combinations form the segments.")
+        self.segment_min_rows = QSpinBox()
+        self.segment_min_rows.setRange(1, 1_000_000)
+        self.segment_min_rows.setValue(30)
+        self.segment_min_rows.setToolTip("Segments with fewer baseline or current rows are left blank.")
+        self.segment_btn = QPushButton("Compute Segments")
+        self.segment_btn.setEnabled(False)
+        self.segment_btn.clicked.connect(self.on_compute_segments)
+        self.segment_heatmap = LazyCanvas("HeatmapCanvas", on_click=self.on_segment_heatmap_clicked)
+        # segments, worst first, expanding into their most drifted features
+        self.segment_tree = QTreeWidget()
+        self.segment_tree.setHeaderLabels(["Segment / feature", "Score", "Missing Δ", "Baseline rows", "Current rows"])
+        self.segment_tree.setUniformRowHeights(True)
+        self.segment_tree.currentItemChanged.connect(self.on_segment_item_selected)
+
+        segment_row = QHBoxLayout()
+        segment_row.addWidget(QLabel("Segment by:"))
+        segment_row.addWidget(self.segment_columns, 1)
+        segment_row.addWidget(QLabel("Min rows:"))
+        segment_row.addWidget(self.segment_min_rows)
+        segment_row.addWidget(self.segment_btn)
+        segment_split = QSplitter(Qt.Vertical)
+        segment_split.addWidget(self.segment_heatmap)
+        segment_split.addWidget(self.segment_tree)
+        segment_layout = QVBoxLayout()
+        segment_layout.addLayout(segment_row)
+        segment_layout.addWidget(segment_split, 1)
+        self.segment_widget = QWidget()
+        self.segment_widget.setLayout(segment_layout)
+
+        self.views = QTabWidget()
+        self.views.addTab(self.canvas, "Feature View")
+        self.views.addTab(window_widget, "Windowed Drift")
+        self.views.addTab(self.segment_widget, "Segment Drift")
+
+        # per-stage timings of the last load; stages expand into their slowest columns
+        self.stats_tree = QTreeWidget()
+        self.stats_tree.setHeaderLabels(["Stage", "Calls", "Seconds", "Rows", "MB read", "Peak MB"])
+        self.stats_tree.setUniformRowHeights(True)
+        self.views.addTab(self.stats_tree, "Run Profile")
 
         right = QVBoxLayout()
-        right.addWidget(QLabel("<b>Top Drift Summary</b>"))
+        right.addWidget(QLabel("<b>Drift Summary</b>"))
         right.addWidget(self.table, 2)
-        right.addWidget(QLabel("<b>Feature View</b>"))
-        right.addWidget(self.canvas, 3)
+        right.addWidget(self.views, 3)
         right_widget = QWidget()
         right_widget.setLayout(right)
 
@@ -91,119 +237,477 @@ class MainWindow(QMainWindow):
         # state
         self.baseline_path = ""
         self.current_path = ""
-        self.baseline_df: pd.DataFrame | None = None
-        self.current_df: pd.DataFrame | None = None
+        self.baseline_profile: DatasetProfile | None = None
+        self.current_data: CompactFrame | None = None
+        # profile of the loaded current CSV and its byte length, so a watch resumes from there
+        self.current_profile: DatasetProfile | None = None
+        self.current_offset: int | None = None
+        # per-feature PlotData, filled by the worker while scoring and on demand
+        self.plot_cache = LRUCache(maxsize=256)
+        self.profile_store = ProfileStore()
         self.schema = []
         self.drifts = []
-        self._filtered_names: list[str] = []
+        self.run_stats: dict | None = None
+        self._profile_dir: str | None = None
+        self._thread: QThread | None = None
+        self._worker: DriftWorker | None = None
+        self._window_thread: QThread | None = None
+        self._window_worker: WindowedDriftWorker | None = None
+        self.segmented = None  # SegmentedDrift of the last segment run
+        self._segment_thread: QThread | None = None
+        self._segment_worker: SegmentDriftWorker | None = None
+        self._load_summary = ""
+        self._tail_thread: QThread | None = None
+        self._tail_worker: TailWorker | None = None
+        self._watch_timer = QTimer(self)
+        self._watch_timer.setSingleShot(True)
+
+        # coalesce streamed results into one model insert per tick
+        self._pending: list = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(100)
+        self._flush_timer.timeout.connect(self._flush_pending)
 
     def on_load(self):
+        self.watch_box.setChecked(False)
+        self.watch_box.setEnabled(False)
         self.baseline_path = self.baseline_picker.path()
         self.current_path = self.current_picker.path()
-        try:
-            b = load_csv(self.baseline_path).df
-            c = load_csv(self.current_path).df
-            ok, msg = validate_schema(b, c)
-            if not ok:
-                raise ValueError(msg)
-
-            self.schema, self.drifts = compute_drift(b, c)
-            self.baseline_df, self.current_df = b, c
-
-            self.status.setText(
-                f"Loaded OK.\nBaseline: {b.shape[0]} rows × {b.shape[1]} cols | "
-                f"Current: {c.shape[0]} rows × {c.shape[1]} cols\n"
-                f"Top drifted: {self.drifts[0].name if self.drifts else 'N/A'}"
-            )
-            self.export_btn.setEnabled(True)
 
-            self.populate_lists()
-            self.populate_table(top_n=30)
+        self.schema, self.drifts = [], []
+        self.baseline_profile, self.current_data = None, None
+        self.current_profile, self.current_offset = None, None
+        self.plot_cache.clear()
+        self.export_btn.setEnabled(False)
+        self.run_stats = None
+        self.stats_tree.clear()
+        self._pending = []
+        self.model.set_drifts([])
+        self.canvas.clear()
+        self.heatmap.clear()
+        self.time_column.clear()
+        self.window_btn.setEnabled(False)
+        self.segmented = None
+        self.segment_columns.clear()
+        self.segment_heatmap.clear()
+        self.segment_tree.clear()
+        self.segment_btn.setEnabled(False)
+
+        self._thread = QThread(self)
+        self._profile_dir = str(PROFILE_DIR / now_iso().replace(":", "-")) if self.profile_box.isChecked() else None
+        self._worker = DriftWorker(
+            self.baseline_path,
+            self.current_path,
+            self.profile_store,
+            profile_dir=self._profile_dir,
+            resample=RESAMPLE if self.resample_box.isChecked() else None,
+        )
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.progress.connect(self.on_progress)
+        self._worker.current_profiled.connect(self.on_current_profiled)
+        self._worker.data_ready.connect(self.on_data_ready)
+        self._worker.plot_ready.connect(self.on_plot_ready)
+        self._worker.feature_ready.connect(self.on_feature_ready)
+        self._worker.finished.connect(self.on_finished)
+        self._worker.cancelled.connect(self.on_cancelled)
+        self._worker.failed.connect(self.on_failed)
+        self._worker.stats_ready.connect(self.on_stats_ready)
+        for sig in (self._worker.finished, self._worker.cancelled, self._worker.failed):
+            sig.connect(self._thread.quit)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.finished.connect(self._thread.deleteLater)
+        self._thread.finished.connect(self._on_thread_done)
+
+        self._set_running(True)
+        self._thread.start()
+
+    def on_cancel(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.status.setText("Cancelling…")
+
+    def _set_running(self, running: bool):
+        self.load_btn.setEnabled(not running)
+        self.refresh_btn.setEnabled(not running)
+        self.cancel_btn.setEnabled(running)
+        self.progress.setVisible(running)
+        if running:
+            self.progress.setRange(0, 0)
+
+    def _on_thread_done(self):
+        self._thread = None
+        self._worker = None
+        self._set_running(False)
+
+    def on_progress(self, done: int, total: int, message: str):
+        self.progress.setRange(0, total)
+        self.progress.setValue(done)
+        self.status.setText(message if not total else f"{message} ({done}/{total})")
+
+    def on_current_profiled(self, cp, offset):
+        self.current_profile, self.current_offset = cp, offset
+
+    def on_data_ready(self, bp, c, cached: bool):
+        self.baseline_profile, self.current_data = bp, c
+        self.time_column.addItems([s.name for s in bp.schema() if s.kind == "datetime"])
+        self.window_btn.setEnabled(self.time_column.count() > 0)
+        for s in bp.schema():
+            if s.kind == "categorical":
+                item = QListWidgetItem(s.name)
+                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                item.setCheckState(Qt.Unchecked)
+                self.segment_columns.addItem(item)
+        self.segment_btn.setEnabled(self.segment_columns.count() > 0)
+        self._load_summary = (
+            f"Baseline: {bp.n_rows} rows × {len(bp.columns)} cols"
+            f"{' (cached profile)' if cached else ''} | "
+            f"Current: {c.shape[0]} rows × {c.shape[1]} cols, "
+            f"held in {c.nbytes / 2**20:.1f} MB ({c.source_bytes / 2**20:.1f} MB as parsed)"
+        )
+
+    def on_plot_ready(self, name: str, plot):
+        self.plot_cache.put(name, plot)
+
+    def on_feature_ready(self, d):
+        self._pending.append(d)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_pending(self):
+        # the proxies keep both views sorted by score as results stream in
+        first = self.model.rowCount() == 0
+        self.model.add(self._pending)
+        self._pending = []
+        if first:
+            self.table.resizeColumnsToContents()
+        if not self.feature_list.currentIndex().isValid():
+            self.feature_list.setCurrentIndex(self.proxy.index(0, 0))
+
+    def on_finished(self, schema, drifts):
+        self.schema, self.drifts = schema, drifts
+        self._flush_timer.stop()
+        self._flush_pending()
+        self.status.setText(
+            f"Loaded OK.\n{self._load_summary}\n"
+            f"Top drifted: {self.drifts[0].name if self.drifts else 'N/A'}"
+        )
+        self.export_btn.setEnabled(True)
+        self.watch_box.setEnabled(file_format(self.current_path) == "csv")
 
-            # auto-select first feature
-            if self.feature_list.count() > 0:
-                self.feature_list.setCurrentRow(0)
+        self.table.resizeColumnsToContents()
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
-            self.status.setText("Error loading files. See message.")
-            self.export_btn.setEnabled(False)
-
-    def populate_lists(self):
-        self.feature_list.clear()
-        self._filtered_names = [d.name for d in self.drifts]
-        for name in self._filtered_names:
-            self.feature_list.addItem(QListWidgetItem(name))
-
-    def populate_table(self, top_n: int = 30):
-        self.table.setRowCount(0)
-        for d in self.drifts[:top_n]:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(d.name))
-            self.table.setItem(row, 1, QTableWidgetItem(d.kind))
-            self.table.setItem(row, 2, QTableWidgetItem(f"{d.score:.4f}"))
-            self.table.setItem(row, 3, QTableWidgetItem(f"{d.missing_delta:.4f}"))
-
-            key = ""
-            if d.kind == "numeric":
-                key = f"PSI={d.details.get('psi', 0):.4f}, KS p={d.details.get('ks_pvalue', 1):.3g}"
-            elif d.kind == "categorical":
-                key = f"JSD={d.details.get('js_divergence', 0):.4f}, χ² p={d.details.get('chi2_pvalue', 1):.3g}"
-            self.table.setItem(row, 4, QTableWidgetItem(key))
+        # auto-select first feature
+        if self.proxy.rowCount() > 0:
+            self.feature_list.setCurrentIndex(self.proxy.index(0, 0))
 
-        self.table.resizeColumnsToContents()
+    def on_cancelled(self, drifts):
+        self.drifts = drifts
+        self._flush_timer.stop()
+        self._flush_pending()
+        self.status.setText(f"Cancelled. Showing partial results for {len(drifts)} feature(s); export is disabled.")
 
-    def on_search(self, text: str):
-        text = (text or "").strip().lower()
-        self.feature_list.clear()
-        if not text:
-            names = [d.name for d in self.drifts]
+    def on_failed(self, message: str):
+        QMessageBox.critical(self, "Error", message)
+        self.status.setText("Error loading files. See message.")
+        self.export_btn.setEnabled(False)
+
+    def on_stats_ready(self, stats: dict):
+        if self.current_data is not None:
+            stats = {**stats, "memory": self.current_data.memory_report()}
+        self.run_stats = stats
+        self.stats_tree.clear()
+        by_stage: dict[str, list] = {}
+        for c in stats["slowest_columns"]:
+            by_stage.setdefault(c["stage"], []).append(c)
+        fmt = lambda v, spec: "" if v is None else format(v, spec)
+        for name, s in stats["stages"].items():
+            item = QTreeWidgetItem([
+                name, str(s["calls"]), f"{s['seconds']:.3f}", fmt(s["rows"], ","),
+                fmt(None if s["bytes"] is None else s["bytes"] / 2**20, ".1f"), fmt(s["peak_mb"], ".1f"),
+            ])
+            for c in by_stage.get(name, []):
+                item.addChild(QTreeWidgetItem([c["column"], "", f"{c['seconds']:.4f}", "", "", fmt(c["peak_mb"], ".1f")]))
+            self.stats_tree.addTopLevelItem(item)
+        for i in range(self.stats_tree.columnCount()):
+            self.stats_tree.resizeColumnToContents(i)
+        if stats.get("peak_rss_mb") is not None:
+            self.status.setText(f"{self.status.text()}\nPeak memory: {stats['peak_rss_mb']:.0f} MB")
+        if self._profile_dir:
+            self.status.setText(f"{self.status.text()}\nProfile dumps: {self._profile_dir}")
+
+    def on_watch_toggled(self, checked: bool):
+        if checked:
+            self._start_watch()
         else:
-            names = [d.name for d in self.drifts if text in d.name.lower()]
-        self._filtered_names = names
-        for name in names:
-            self.feature_list.addItem(QListWidgetItem(name))
+            self._stop_watch()
 
-    def on_feature_selected(self, current: QListWidgetItem, _previous: QListWidgetItem):
-        if current is None or self.baseline_df is None or self.current_df is None:
+    def _start_watch(self):
+        if self.baseline_profile is None or self._tail_thread is not None:
+            return
+        self._tail_thread = QThread(self)
+        self._tail_worker = TailWorker(self.baseline_profile, self.current_path, self.current_profile, self.current_offset)
+        self._tail_worker.moveToThread(self._tail_thread)
+        # queued into the worker thread; the timer is restarted only once a poll has reported back
+        self._watch_timer.timeout.connect(self._tail_worker.poll)
+        self.plot_requested.connect(self._tail_worker.request_plot)
+        self._tail_worker.updated.connect(self.on_live_update)
+        self._tail_worker.plot_ready.connect(self.on_live_plot)
+        self._tail_worker.failed.connect(self.on_watch_failed)
+        self._tail_thread.finished.connect(self._tail_worker.deleteLater)
+        self._tail_thread.finished.connect(self._tail_thread.deleteLater)
+        self._tail_thread.start()
+        self.status.setText(f"Watching {self.current_path}…")
+        self._watch_timer.start(0)
+
+    def _stop_watch(self):
+        if self._tail_thread is None:
+            return
+        self._watch_timer.stop()
+        self._watch_timer.timeout.disconnect(self._tail_worker.poll)
+        self.plot_requested.disconnect(self._tail_worker.request_plot)
+        self._tail_thread.quit()
+        self._tail_thread.wait()
+        self._tail_thread = None
+        self._tail_worker = None
+
+    def on_live_update(self, drifts, n_rows: int, new_rows: int):
+        if self._tail_worker is None:
             return
-        feature = current.text()
-        d = next((x for x in self.drifts if x.name == feature), None)
+        if new_rows:
+            self.drifts = drifts
+            self.model.update_drifts(drifts)
+            # cached plots describe the previous counts; the selected one is re-sent by the worker
+            self.plot_cache.clear()
+            self.status.setText(f"Watching {self.current_path}: {n_rows} rows (+{new_rows}).")
+        self._watch_timer.start(self.watch_interval.value() * 1000)
+
+    def on_live_plot(self, name: str, plot):
+        self.plot_cache.put(name, plot)
+        d = self.proxy.drift(self.feature_list.currentIndex().row())
+        if d is not None and d.name == name:
+            self.plot_feature(d)
+
+    def on_watch_failed(self, message: str):
+        self.watch_box.setChecked(False)
+        QMessageBox.warning(self, "Watch current file", message)
+
+    def closeEvent(self, event):
+        self._stop_watch()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._thread.quit()
+            self._thread.wait()
+        for thread in (self._window_thread, self._segment_thread):
+            if thread is not None:
+                thread.quit()
+                thread.wait()
+        super().closeEvent(event)
+
+    def on_refresh_baseline(self):
+        path = self.baseline_picker.path()
+        if path and self.profile_store.invalidate(path):
+            self.status.setText("Baseline profile cache cleared; the next load re-reads the baseline.")
+
+    def on_search(self, text: str):
+        self.proxy.set_filter_text(text or "")
+
+    def select_feature(self, name: str):
+        row = self.model.row_of(name)
+        if row is not None:
+            index = self.proxy.mapFromSource(self.model.index(row, 0))
+            if index.isValid():
+                self.feature_list.setCurrentIndex(index)
+
+    def on_table_selected(self, current, _previous):
+        d = self.proxy.drift(current.row())
+        if d is not None:
+            self.select_feature(d.name)
+
+    def on_feature_selected(self, current, _previous):
+        if self.baseline_profile is None or self.current_data is None:
+            return
+        d = self.proxy.drift(current.row())
         if d is None:
             return
         self.plot_feature(d)
+        row = current.row()
+        QTimer.singleShot(0, lambda: self._prefetch(row))
+
+    def _plot_data(self, d):
+        plot = self.plot_cache.get(d.name, _MISSING)
+        if plot is _MISSING and self._tail_worker is not None:
+            # live mode: the worker holds the running counts and answers with on_live_plot
+            self.plot_requested.emit(d.name)
+            return _MISSING
+        if plot is _MISSING:
+            bp = self.baseline_profile.columns[d.name]
+            plot = feature_plot_data(bp, self.current_data[d.name], d.kind)
+            self.plot_cache.put(d.name, plot)
+        return plot
+
+    def _prefetch(self, row: int):
+        # fill the cache for the list neighbours so arrow-key scrolling hits it
+        if self.baseline_profile is None or self.current_data is None:
+            return
+        if self._tail_worker is not None:
+            return
+        for r in (row + 1, row - 1):
+            d = self.proxy.drift(r)
+            if d is not None and d.name not in self.plot_cache:
+                self._plot_data(d)
 
     def plot_feature(self, d):
-        b = self.baseline_df[d.name]
-        c = self.current_df[d.name]
-        self.canvas.ax.clear()
-
-        if d.kind == "numeric":
-            bnum = pd.to_numeric(b, errors="coerce").dropna()
-            cnum = pd.to_numeric(c, errors="coerce").dropna()
-            if bnum.empty or cnum.empty:
-                self.canvas.ax.text(0.5, 0.5, "No numeric data to plot.", ha="center", va="center")
-            else:
-                self.canvas.ax.hist(bnum.values, bins=30, alpha=0.5, label="baseline")
-                self.canvas.ax.hist(cnum.values, bins=30, alpha=0.5, label="current")
-                self.canvas.ax.set_title(f"{d.name} (numeric) — PSI={d.details.get('psi', 0):.4f}")
-                self.canvas.ax.legend()
-        elif d.kind == "categorical":
-            bc = b.astype("object").fillna("∅NA").value_counts().head(12)
-            cc = c.astype("object").fillna("∅NA").value_counts().reindex(bc.index, fill_value=0)
-
-            x = np.arange(len(bc.index))
-            self.canvas.ax.bar(x - 0.2, bc.values, width=0.4, label="baseline")
-            self.canvas.ax.bar(x + 0.2, cc.values, width=0.4, label="current")
-            self.canvas.ax.set_xticks(x)
-            self.canvas.ax.set_xticklabels([str(v)[:18] for v in bc.index], rotation=25, ha="right")
-            self.canvas.ax.set_title(f"{d.name} (categorical) — JSD={d.details.get('js_divergence', 0):.4f}")
-            self.canvas.ax.legend()
+        if d.kind == "unknown" and d.details.get("top_changes"):
+            plot = heavy_hitter_plot_data(d.details)
+            self.canvas.show_bars(
+                plot.labels, plot.baseline, plot.current, f"{d.name} (top values, % of non-missing) — JSD={d.details['js_divergence']:.4f}"
+            )
+            return
+        if d.kind not in ("numeric", "categorical"):
+            self.canvas.show_message(f"{d.name} ({d.kind})\nPlot not implemented in v0.")
+            return
+        plot = self._plot_data(d)
+        if plot is _MISSING:
+            self.canvas.show_message(f"{d.name}\nUpdating…")
+        elif plot is None:
+            self.canvas.show_message("No numeric data to plot.")
+        elif plot.kind == "numeric":
+            self.canvas.show_histogram(plot.edges, plot.baseline, plot.current, f"{d.name} (numeric) — PSI={d.details.get('psi', 0):.4f}")
         else:
-            self.canvas.ax.text(0.5, 0.5, f"{d.name} ({d.kind})\nPlot not implemented in v0.", ha="center", va="center")
+            self.canvas.show_bars(
+                plot.labels, plot.baseline, plot.current, f"{d.name} (categorical) — JSD={d.details.get('js_divergence', 0):.4f}"
+            )
 
-        self.canvas.draw_idle()
+    def on_compute_windows(self):
+        if self.current_data is None or not self.time_column.currentText() or self._window_thread is not None:
+            return
+        self._window_thread = QThread(self)
+        self._window_worker = WindowedDriftWorker(
+            self.current_data,
+            self.time_column.currentText(),
+            self.window_size.text().strip(),
+            baseline=self.baseline_profile,
+            reference=self.window_reference.currentText(),
+        )
+        self._window_worker.moveToThread(self._window_thread)
+        self._window_thread.started.connect(self._window_worker.run)
+        self._window_worker.finished.connect(self.on_windows_ready)
+        self._window_worker.failed.connect(lambda msg: QMessageBox.warning(self, "Windowed drift", msg))
+        for sig in (self._window_worker.finished, self._window_worker.failed):
+            sig.connect(self._window_thread.quit)
+        self._window_thread.finished.connect(self._window_worker.deleteLater)
+        self._window_thread.finished.connect(self._window_thread.deleteLater)
+        self._window_thread.finished.connect(self._on_window_thread_done)
+        self.window_btn.setEnabled(False)
+        self._window_thread.start()
+
+    def _on_window_thread_done(self):
+        self._window_thread = None
+        self._window_worker = None
+        self.window_btn.setEnabled(self.current_data is not None and self.time_column.count() > 0)
+
+    def on_windows_ready(self, result, top_n: int = 30):
+        if not result.features:
+            self.heatmap.clear()
+            return
+        # the features that drift most in any window, worst first
+        peak = np.nan_to_num(result.scores).max(axis=1)
+        order = np.argsort(-peak, kind="stable")[:top_n]
+        # aware windows (e.g. UTC for mixed offsets) name their zone
+        labels = [ts.strftime("%Y-%m-%d %H:%M %Z").rstrip() for ts in result.starts]
+        self.heatmap.show_heatmap(
+            result.scores[order],
+            [result.features[i] for i in order],
+            labels,
+            f"Drift per {result.window} window vs {result.reference} ({len(result.starts)} windows)",
+        )
+        self.views.setCurrentIndex(1)
+
+    def on_heatmap_clicked(self, event):
+        if event.inaxes is not self.heatmap.ax or event.ydata is None:
+            return
+        row = int(round(event.ydata))
+        if 0 <= row < len(self.heatmap.row_labels):
+            self.select_feature(self.heatmap.row_labels[row])
+
+    def on_compute_segments(self):
+        columns = [
+            self.segment_columns.item(i).text()
+            for i in range(self.segment_columns.count())
+            if self.segment_columns.item(i).checkState() == Qt.Checked
+        ]
+        if not columns:
+            QMessageBox.information(self, "Segment drift", "Tick at least one column to segment by.")
+            return
+        if self.current_data is None or self._segment_thread is not None:
+            return
+        self._segment_thread = QThread(self)
+        self._segment_worker = SegmentDriftWorker(
+            self.baseline_profile, self.baseline_path, self.current_data, columns, min_rows=self.segment_min_rows.value()
+        )
+        self._segment_worker.moveToThread(self._segment_thread)
+        self._segment_thread.started.connect(self._segment_worker.run)
+        self._segment_worker.finished.connect(self.on_segments_ready)
+        self._segment_worker.failed.connect(lambda msg: QMessageBox.warning(self, "Segment drift", msg))
+        for sig in (self._segment_worker.finished, self._segment_worker.failed):
+            sig.connect(self._segment_thread.quit)
+        self._segment_thread.finished.connect(self._segment_worker.deleteLater)
+        self._segment_thread.finished.connect(self._segment_thread.deleteLater)
+        self._segment_thread.finished.connect(self._on_segment_thread_done)
+        self.segment_btn.setEnabled(False)
+        self.segment_btn.setText("Computing…")
+        self._segment_thread.start()
+
+    def _on_segment_thread_done(self):
+        self._segment_thread = None
+        self._segment_worker = None
+        self.segment_btn.setText("Compute Segments")
+        self.segment_btn.setEnabled(self.current_data is not None and self.segment_columns.count() > 0)
+
+    def on_segments_ready(self, result, top_features: int = 30, top_segments: int = 40, per_segment: int = 20):
+        self.segmented = result
+        self.segment_tree.clear()
+        self.segment_heatmap.clear()
+        if not result.features or not result.segments:
+            return
+        scores = np.nan_to_num(result.scores)
+        # heatmap of the features and segments that drift most anywhere, worst first
+        rows = np.argsort(-scores.max(axis=1), kind="stable")[:top_features]
+        seg_peak = scores.max(axis=0)
+        cols = np.argsort(-seg_peak, kind="stable")[:top_segments]
+        self.segment_heatmap.show_heatmap(
+            result.scores[np.ix_(rows, cols)],
+            [result.features[i] for i in rows],
+            [result.segments[j][:32] for j in cols],
+            f"Drift per segment of {' × '.join(result.segment_columns)} ({len(result.segments)} segments)",
+        )
+        fmt = lambda v: "" if np.isnan(v) else f"{v:.4f}"
+        for j in np.argsort(-seg_peak, kind="stable"):
+            item = QTreeWidgetItem([
+                result.segments[j], "" if np.isnan(result.scores[:, j]).all() else f"{seg_peak[j]:.4f}", "",
+                f"{result.baseline_rows[j]:,}", f"{result.current_rows[j]:,}",
+            ])
+            for i in np.argsort(-scores[:, j], kind="stable")[:per_segment]:
+                if not np.isnan(result.scores[i, j]):
+                    item.addChild(QTreeWidgetItem([result.features[i], fmt(result.scores[i, j]), fmt(result.missing_delta[i, j])]))
+            self.segment_tree.addTopLevelItem(item)
+        self.segment_tree.resizeColumnToContents(0)
+        self.views.setCurrentWidget(self.segment_widget)
+
+    def on_segment_heatmap_clicked(self, event):
+        if event.inaxes is not self.segment_heatmap.ax or event.ydata is None:
+            return
+        row = int(round(event.ydata))
+        if 0 <= row < len(self.segment_heatmap.row_labels):
+            self.select_feature(self.segment_heatmap.row_labels[row])
+
+    def on_segment_item_selected(self, current, _previous):
+        # feature rows sit under their segment
+        if current is not None and current.parent() is not None:
+            self.select_feature(current.text(0))
 
     def on_export(self):
         if not self.drifts:
@@ -211,17 +715,35 @@ class MainWindow(QMainWindow):
         out_dir = QFileDialog.getExistingDirectory(self, "Select export folder")
         if not out_dir:
             return
+        segments = self.segmented.to_dict() if self.segmented is not None else None
         try:
             json_path = f"{out_dir}/drift_report.json"
             md_path = f"{out_dir}/drift_report.md"
-            export_report_json(json_path, self.baseline_path, self.current_path, self.schema, self.drifts, top_n=25)
-            export_report_md(md_path, self.baseline_path, self.current_path, self.drifts, top_n=25)
+            export_report_json(
+                json_path,
+                self.baseline_path,
+                self.current_path,
+                self.schema,
+                self.drifts,
+                top_n=25,
+                run_stats=self.run_stats,
+                segments=segments,
+            )
+            export_report_md(md_path, self.baseline_path, self.current_path, self.drifts, top_n=25, segments=segments)
             QMessageBox.information(self, "Export complete", f"Saved:\n- {json_path}\n- {md_path}")
         except Exception as e:
             QMessageBox.critical(self, "Export error", str(e))
 
+def preload() -> None:
+    # the imports first use would otherwise pay for; module imports are thread-safe, and a
+    # plot requested meanwhile just waits for the import to finish
+    import scipy.stats  # noqa: F401
+    import app.ui.mpl_canvas  # noqa: F401
+
 def run_app():
     app = QApplication([])
     w = MainWindow()
     w.show()
+    # once the first frame is up, warm the heavy imports off the GUI thread
+    QTimer.singleShot(0, lambda: threading.Thread(target=preload, name="preload", daemon=True).start())
     app.exec()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+
+from app.core.drift_engine import FeatureDrift
+from app.core.report import key_metric
+
+class DriftTableModel(QAbstractTableModel):
+    """Drift results kept in sort order; sorting runs here rather than per comparison in a proxy."""
+
+    HEADERS = ["Feature", "Kind", "Score", "Missing Δ", "Key metric"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._drifts: list[FeatureDrift] = []
+        self._rows: dict[str, int] = {}
+        self._sort = (2, Qt.DescendingOrder)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._drifts)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole and role != Qt.TextAlignmentRole:
+            return None
+        col = index.column()
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter) if col in (2, 3) else None
+        return self._display(self._drifts[index.row()], col)
+
+    @staticmethod
+    def _display(d: FeatureDrift, col: int) -> str:
+        if col == 0:
+            return d.name
+        if col == 1:
+            return d.kind
+        if col == 4:
+            return key_metric(d)
+        return f"{d.score if col == 2 else d.missing_delta:.4f}"
+
+    @staticmethod
+    def _sort_key(col: int):
+        if col == 2:
+            return lambda d: d.score
+        if col == 3:
+            return lambda d: d.missing_delta
+        return lambda d: DriftTableModel._display(d, col)
+
+    def set_drifts(self, drifts: list[FeatureDrift]) -> None:
+        self.beginResetModel()
+        self._drifts = self._sorted(drifts)
+        self._rows = {d.name: i for i, d in enumerate(self._drifts)}
+        self.endResetModel()
+
+    def add(self, drifts: list[FeatureDrift]) -> None:
+        # append as one insert, then move everything into place with one layout change
+        if not drifts:
+            return
+        first = len(self._drifts)
+        self.beginInsertRows(QModelIndex(), first, first + len(drifts) - 1)
+        self._drifts.extend(drifts)
+        self.endInsertRows()
+        self._resort()
+
+    def update_drifts(self, drifts: list[FeatureDrift]) -> None:
+        # rescored results for the same features: change values and order in place, keeping selection
+        by_name = {d.name: d for d in drifts}
+        if by_name.keys() != self._rows.keys():
+            self.set_drifts(drifts)
+            return
+        self._drifts = [by_name[d.name] for d in self._drifts]
+        if self._drifts:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._drifts) - 1, len(self.HEADERS) - 1))
+        self._resort()
+
+    def sort(self, column: int, order=Qt.AscendingOrder) -> None:
+        self._sort = (column, order)
+        self._resort()
+
+    def _sorted(self, drifts: list[FeatureDrift]) -> list[FeatureDrift]:
+        # Python's sort is stable in both directions, so ties keep arrival (column) order
+        col, order = self._sort
+        return sorted(drifts, key=self._sort_key(col), reverse=order == Qt.DescendingOrder)
+
+    def _resort(self) -> None:
+        col, order = self._sort
+        key = self._sort_key(col)
+        perm = sorted(range(len(self._drifts)), key=lambda i: key(self._drifts[i]), reverse=order == Qt.DescendingOrder)
+        self.layoutAboutToBeChanged.emit()
+        new_row = [0] * len(perm)
+        for new, old in enumerate(perm):
+            new_row[old] = new
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(persistent, [self.index(new_row[i.row()], i.column()) for i in persistent])
+        self._drifts = [self._drifts[i] for i in perm]
+        self._rows = {d.name: i for i, d in enumerate(self._drifts)}
+        self.layoutChanged.emit()
+
+    def drift(self, row: int) -> FeatureDrift:
+        return self._drifts[row]
+
+    def row_of(self, name: str) -> int | None:
+        return self._rows.get(name)
+
+class DriftFilterProxy(QSortFilterProxyModel):
+    """Case-insensitive feature-name filter; sorting is delegated to the source model."""
+
+    def __init__(self, source: DriftTableModel, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self._text = ""
+
+    def set_filter_text(self, text: str) -> None:
+        if not hasattr(self, "beginFilterChange"):
+            # Qt < 6.10
+            self._text = text.strip().lower()
+            self.invalidateFilter()
+            return
+        self.beginFilterChange()
+        self._text = text.strip().lower()
+        self.endFilterChange(QSortFilterProxyModel.Direction.Rows)
+
+    def filterAcceptsRow(self, source_row: int, source_parent) -> bool:
+        return not self._text or self._text in self.sourceModel().drift(source_row).name.lower()
+
+    def sort(self, column: int, order=Qt.AscendingOrder) -> None:
+        self.sourceModel().sort(column, order)
+
+    def drift(self, row: int) -> FeatureDrift | None:
+        if not 0 <= row < self.rowCount():
+            return None
+        return self.sourceModel().drift(self.mapToSource(self.index(row, 0)).row())
@@ -1,13 +1,104 @@
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+import numpy as np
 
 class MplCanvas(FigureCanvas):
+    """Feature View canvas; consecutive plots of the same kind update artists in place."""
+
+    MAX_BARS = 12
+
+    def __init__(self, parent=None):
+        self.fig = Figure(figsize=(5, 4), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        super().__init__(self.fig)
+        self.setParent(parent)
+        self._mode = None
+        self._artists = ()
+
+    def clear(self):
+        self._reset(None)
+        self.draw_idle()
+
+    def _reset(self, mode):
+        self.ax.clear()
+        self._mode = mode
+        self._artists = ()
+
+    def show_message(self, text: str):
+        self._reset("message")
+        self.ax.text(0.5, 0.5, text, ha="center", va="center")
+        self.draw_idle()
+
+    def show_histogram(self, edges, baseline, current, title: str):
+        if self._mode != "numeric":
+            self._reset("numeric")
+            self._artists = (
+                self.ax.stairs(baseline, edges, fill=True, alpha=0.5, label="baseline"),
+                self.ax.stairs(current, edges, fill=True, alpha=0.5, label="current"),
+            )
+            self.ax.legend()
+        else:
+            self._artists[0].set_data(baseline, edges)
+            self._artists[1].set_data(current, edges)
+        self.ax.set_xlim(edges[0], edges[-1])
+        self.ax.set_ylim(0, max(1.0, float(np.max(baseline)), float(np.max(current))) * 1.05)
+        self.ax.set_title(title)
+        self.draw_idle()
+
+    def show_bars(self, labels, baseline, current, title: str):
+        n = len(labels)
+        if self._mode != "categorical":
+            # a fixed set of bar slots; unused ones are hidden
+            self._reset("categorical")
+            x = np.arange(self.MAX_BARS)
+            zeros = np.zeros(self.MAX_BARS)
+            self._artists = (
+                self.ax.bar(x - 0.2, zeros, width=0.4, label="baseline"),
+                self.ax.bar(x + 0.2, zeros, width=0.4, label="current"),
+            )
+            self.ax.legend()
+        for bars, values in zip(self._artists, (baseline, current)):
+            for i, rect in enumerate(bars.patches):
+                rect.set_visible(i < n)
+                rect.set_height(values[i] if i < n else 0)
+        self.ax.set_xticks(np.arange(n))
+        self.ax.set_xticklabels([v[:18] for v in labels], rotation=25, ha="right")
+        self.ax.set_xlim(-0.6, max(n, 1) - 0.4)
+        self.ax.set_ylim(0, max([1.0, *baseline, *current]) * 1.05)
+        self.ax.set_title(title)
+        self.draw_idle()
+
+class HeatmapCanvas(FigureCanvas):
+    """Feature x time-window (or segment) score heatmap."""
+
     def __init__(self, parent=None):
         self.fig = Figure(figsize=(5, 4), dpi=100)
         self.ax = self.fig.add_subplot(111)
         super().__init__(self.fig)
         self.setParent(parent)
+        self._cbar = None
+        self.row_labels: list[str] = []
 
     def clear(self):
+        if self._cbar is not None:
+            self._cbar.remove()
+            self._cbar = None
         self.ax.clear()
+        self.row_labels = []
+        self.draw_idle()
+
+    def show_heatmap(self, values, row_labels, col_labels, title: str):
+        self.clear()
+        self.row_labels = list(row_labels)
+        image = self.ax.imshow(np.ma.masked_invalid(values), aspect="auto", interpolation="nearest", cmap="magma_r")
+        self._cbar = self.fig.colorbar(image, ax=self.ax, label="score")
+        self.ax.set_yticks(np.arange(len(row_labels)))
+        self.ax.set_yticklabels([v[:24] for v in row_labels], fontsize=7)
+        # at most ~12 time ticks
+        step = max(1, len(col_labels) // 12)
+        ticks = np.arange(0, len(col_labels), step)
+        self.ax.set_xticks(ticks)
+        self.ax.set_xticklabels([col_labels[i] for i in ticks], rotation=30, ha="right", fontsize=7)
+        self.ax.set_title(title)
+        self.fig.tight_layout()
         self.draw_idle()
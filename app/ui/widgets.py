@@ -1,4 +1,5 @@
-from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel, QLineEdit, QPushButton, QFileDialog
+from importlib import import_module
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel, QLineEdit, QPushButton, QFileDialog, QVBoxLayout
 
 class FilePicker(QWidget):
     def __init__(self, label: str, parent=None):
@@ -16,9 +17,47 @@ class FilePicker(QWidget):
         self.setLayout(layout)
 
     def _browse(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Select CSV", "", "CSV Files (*.csv)")
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Select data file", "",
+            "Data files (*.csv *.parquet *.pq *.feather *.arrow *.ipc);;CSV Files (*.csv);;All files (*)",
+        )
         if path:
             self.path_edit.setText(path)
 
     def path(self) -> str:
         return self.path_edit.text().strip()
+
+class LazyCanvas(QWidget):
+    """Stands in for a Matplotlib canvas of app.ui.mpl_canvas until the first plot call.
+
+    Matplotlib is only imported then, so the window appears without it. Other attributes
+    (show_bars, ax, row_labels, ...) pass through to the canvas, building it if needed.
+    """
+
+    def __init__(self, canvas_class: str, on_click=None, parent=None):
+        super().__init__(parent)
+        self._canvas_class = canvas_class
+        self._on_click = on_click
+        self._canvas = None
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+    @property
+    def canvas(self):
+        if self._canvas is None:
+            self._canvas = getattr(import_module("app.ui.mpl_canvas"), self._canvas_class)(self)
+            if self._on_click is not None:
+                self._canvas.mpl_connect("button_press_event", self._on_click)
+            self.layout().addWidget(self._canvas)
+        return self._canvas
+
+    def clear(self):
+        # nothing drawn yet: no need to build the canvas just to blank it
+        if self._canvas is not None:
+            self._canvas.clear()
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.canvas, name)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+import os
+import threading
+from contextlib import nullcontext
+import numpy as np
+from PySide6.QtCore import QObject, Signal, Slot
+
+from app.core.cache import ProfileStore, profile_settings
+from app.core.columnar import CompactBuilder
+from app.core.instrument import Recorder, profiled, recording, stage
+from app.core.loader import csv_end_offset, file_format, iter_chunks, load_table, validate_columns, validate_file_schemas
+from app.core.profile import profile_chunks
+from app.core.drift_engine import iter_drift_from_profiles
+from app.core.drift_metrics import ResampleConfig
+from app.core.live import LiveDrift
+from app.core.plot_data import feature_plot_data, profile_plot_data
+from app.core.segments import segmented_drift
+from app.core.windowed import windowed_drift
+
+# GUI profiles keep up to this many values per numeric column, so smaller files score exactly, as
+# compute_drift would; longer columns fall back to the KLL sketch (marked ≈ in the table, rank
+# error ~1e-4), so a profile stays around 0.35 MB per numeric column whatever the row count
+EXACT_SKETCH_K = 16_384
+
+class Cancelled(Exception):
+    pass
+
+class DriftWorker(QObject):
+    """Runs load + profile + drift off the GUI thread; move it to a QThread and call run()."""
+
+    progress = Signal(int, int, str)  # done, total (0 = busy), message
+    data_ready = Signal(object, object, bool)  # baseline DatasetProfile, current CompactFrame, baseline was cached
+    current_profiled = Signal(object, object)  # current DatasetProfile, bytes of the current CSV it covers (None: unknown)
+    plot_ready = Signal(str, object)  # feature name, PlotData (sent before its feature_ready)
+    feature_ready = Signal(object)  # FeatureDrift
+    finished = Signal(object, object)  # schema, drifts sorted by score
+    cancelled = Signal(object)  # drifts scored before the cancel, sorted by score
+    failed = Signal(str)
+    stats_ready = Signal(object)  # Recorder.summary() of the run, sent last
+
+    def __init__(
+        self,
+        baseline_path: str,
+        current_path: str,
+        store: ProfileStore,
+        profile_dir: str | None = None,
+        resample: ResampleConfig | None = None,
+    ):
+        super().__init__()
+        self.baseline_path = baseline_path
+        self.current_path = current_path
+        self.store = store
+        # opt-in: cProfile/tracemalloc dumps go here and stage peaks are traced
+        self.profile_dir = profile_dir
+        # opt-in: bootstrap CIs and permutation p-values in each FeatureDrift's details
+        self.resample = resample
+        self._stop = threading.Event()
+        self._drifts = []
+
+    def cancel(self) -> None:
+        self._stop.set()
+
+    def _check(self) -> None:
+        if self._stop.is_set():
+            raise Cancelled()
+
+    def _build_baseline(self, path: str):
+        def chunks():
+            for chunk in iter_chunks(path):
+                self._check()
+                yield chunk
+        return profile_chunks(chunks(), path=path, sketch_k=EXACT_SKETCH_K)
+
+    @Slot()
+    def run(self) -> None:
+        recorder = Recorder(memory=self.profile_dir is not None)
+        with recording(recorder), profiled(self.profile_dir) if self.profile_dir else nullcontext():
+            self._run()
+        self.stats_ready.emit(recorder.summary())
+
+    def _run(self) -> None:
+        try:
+            # file metadata first, so a mismatch fails before any data is read
+            ok, msg = validate_file_schemas(self.baseline_path, self.current_path)
+            if not ok:
+                raise ValueError(msg)
+            self.progress.emit(0, 0, "Profiling baseline…")
+            with stage("baseline_profile"):
+                bp, cached = self.store.get_or_build(
+                    self.baseline_path, self._build_baseline, profile_settings(sketch_k=EXACT_SKETCH_K)
+                )
+            self._check()
+            self.progress.emit(0, 0, "Reading current file…")
+            # one streamed pass profiles the current file and packs it into a compact frame; the
+            # baseline schema fixes its dtypes and the baseline categories head its dictionaries
+            schema = bp.schema()
+            dictionaries = {
+                name: np.asarray(list(col.categories), dtype=object)
+                for name, col in bp.columns.items()
+                if col.categories is not None
+            }
+            builder = CompactBuilder(schema, dictionaries)
+            # a later watch resumes the current CSV where this read ended
+            size = os.path.getsize(self.current_path) if file_format(self.current_path) == "csv" else None
+
+            def chunks():
+                for chunk in iter_chunks(self.current_path, schema=schema, columns=list(bp.columns)):
+                    self._check()
+                    if builder.n_rows == 0:
+                        ok, msg = validate_columns(list(bp.columns), [str(col) for col in chunk.columns])
+                        if not ok:
+                            raise ValueError(msg)
+                    builder.add(chunk)
+                    yield chunk
+
+            cp = profile_chunks(chunks(), path=self.current_path, schema=schema, sketch_k=EXACT_SKETCH_K)
+            c = builder.build()
+            self.current_profiled.emit(cp, None if size is None else csv_end_offset(self.current_path, size))
+            self.data_ready.emit(bp, c, cached)
+
+            total = len(bp.columns)
+            counts = {}
+            for i, d in enumerate(iter_drift_from_profiles(bp, cp, counts_cache=counts, resample=self.resample), 1):
+                self._check()
+                self._drifts.append(d)
+                # plot counts are built here, off the GUI thread, while the column is hot
+                with stage("plot_data", column=d.name):
+                    plot = feature_plot_data(bp.columns[d.name], c[d.name], d.kind, counts.pop(d.name, None))
+                if plot is not None:
+                    self.plot_ready.emit(d.name, plot)
+                self.feature_ready.emit(d)
+                self.progress.emit(i, total, f"Scored {d.name}")
+
+            self.finished.emit(bp.schema(), self._sorted())
+        except Cancelled:
+            self.cancelled.emit(self._sorted())
+        except Exception as e:
+            self.failed.emit(str(e))
+
+    def _sorted(self) -> list:
+        return sorted(self._drifts, key=lambda d: d.score, reverse=True)
+
+class WindowedDriftWorker(QObject):
+    """Computes windowed drift of the current frame off the GUI thread."""
+
+    finished = Signal(object)  # WindowedDrift
+    failed = Signal(str)
+
+    def __init__(self, current, time_column: str, window: str, baseline=None, reference: str = "baseline"):
+        super().__init__()
+        self.current = current
+        self.time_column = time_column
+        self.window = window
+        self.baseline = baseline
+        self.reference = reference
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            result = windowed_drift(
+                self.current, self.time_column, self.window, baseline=self.baseline, reference=self.reference
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(result)
+
+class SegmentDriftWorker(QObject):
+    """Reads the baseline file and scores the feature x segment matrix off the GUI thread."""
+
+    finished = Signal(object)  # SegmentedDrift
+    failed = Signal(str)
+
+    def __init__(self, baseline, baseline_path: str, current, segment_columns: list[str], min_rows: int = 30):
+        super().__init__()
+        self.baseline = baseline  # DatasetProfile: fixes columns and dtypes of the baseline read
+        self.baseline_path = baseline_path
+        self.current = current
+        self.segment_columns = segment_columns
+        self.min_rows = min_rows
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            schema = self.baseline.schema()
+            # per-segment baselines need the rows, which the profile does not keep
+            b = load_table(self.baseline_path, columns=list(self.baseline.columns), schema=schema).df
+            result = segmented_drift(b, self.current, self.segment_columns, schema=schema, min_rows=self.min_rows)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(result)
+
+class TailWorker(QObject):
+    """Owns the live state of a watched current CSV; all polls and plot requests run in its thread."""
+
+    updated = Signal(object, int, int)  # drifts sorted by score (empty if nothing new), total rows, new rows
+    plot_ready = Signal(str, object)  # feature name, PlotData from the running counts
+    failed = Signal(str)
+
+    def __init__(self, baseline, current_path: str, current=None, offset: int | None = None):
+        super().__init__()
+        # with the loaded profile and the offset it covers, the first poll reads only new rows
+        seeded = current is not None and offset is not None
+        self.live = LiveDrift(
+            baseline,
+            current_path,
+            current=current if seeded else None,
+            offset=offset if seeded else 0,
+        )
+        self._focus = ""
+
+    @Slot()
+    def poll(self) -> None:
+        try:
+            new = self.live.poll()
+            drifts = sorted(self.live.drifts(), key=lambda d: d.score, reverse=True) if new else []
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.updated.emit(drifts, self.live.n_rows, new)
+        if new and self._focus:
+            self.request_plot(self._focus)
+
+    @Slot(str)
+    def request_plot(self, name: str) -> None:
+        # the selected feature's plot is refreshed after every poll that read rows
+        self._focus = name
+        cp = self.live.current
+        if cp is None or name not in cp.columns:
+            return
+        bp = self.live.baseline.columns[name]
+        self.plot_ready.emit(name, profile_plot_data(bp, cp.columns[name], cp.columns[name].kind))
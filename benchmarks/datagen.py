@@ -0,0 +1,67 @@
+"""Seeded synthetic baseline/current pairs for benchmarks."""
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+@dataclass(frozen=True)
+class SyntheticPair:
+    baseline: pd.DataFrame
+    current: pd.DataFrame
+    drifted: list[str]  # columns whose current distribution was shifted
+
+def _category_probs(cardinality: int) -> np.ndarray:
+    # Zipf-like: a few frequent categories and a long tail
+    p = 1.0 / np.arange(1, cardinality + 1)
+    return p / p.sum()
+
+def synthetic_pair(
+    rows: int = 10_000,
+    numeric: int = 8,
+    categorical: int = 4,
+    cardinality: int = 20,
+    missing: float = 0.02,
+    drift: float = 0.25,
+    seed: int = 0,
+) -> SyntheticPair:
+    """Baseline and current frames with the same columns; a `drift` fraction of each kind is shifted.
+
+    Drifted numeric columns move by half a standard deviation and widen by 20%; drifted categorical
+    columns mix their frequencies halfway towards uniform. Drifted columns also get twice the
+    missing rate in the current frame.
+    """
+    if rows < 1 or numeric < 0 or categorical < 0 or numeric + categorical == 0:
+        raise ValueError("Need at least one row and one column.")
+    if cardinality < 1 or not 0 <= missing < 1 or not 0 <= drift <= 1:
+        raise ValueError("cardinality must be >= 1; missing must be in [0, 1) and drift in [0, 1].")
+    rng = np.random.default_rng(seed)
+    base: dict[str, np.ndarray] = {}
+    cur: dict[str, np.ndarray] = {}
+    drifted: list[str] = []
+
+    labels = np.array([f"v{j}" for j in range(cardinality)], dtype=object)
+    p = _category_probs(cardinality)
+    n_num, n_cat = round(drift * numeric), round(drift * categorical)
+    for i in range(numeric):
+        name = f"num_{i}"
+        mu, sigma = rng.normal(0, 10), rng.uniform(0.5, 5)
+        shifted = i < n_num
+        base[name] = rng.normal(mu, sigma, rows)
+        cur[name] = rng.normal(mu + 0.5 * sigma, 1.2 * sigma, rows) if shifted else rng.normal(mu, sigma, rows)
+        if shifted:
+            drifted.append(name)
+    for i in range(categorical):
+        name = f"cat_{i}"
+        shifted = i < n_cat
+        q = 0.5 * p + 0.5 / cardinality if shifted else p
+        base[name] = labels[rng.choice(cardinality, rows, p=p)]
+        cur[name] = labels[rng.choice(cardinality, rows, p=q)]
+        if shifted:
+            drifted.append(name)
+
+    b, c = pd.DataFrame(base), pd.DataFrame(cur)
+    for name in b.columns:
+        rate = missing * (2 if name in drifted else 1)
+        b[name] = b[name].mask(rng.random(rows) < missing)
+        c[name] = c[name].mask(rng.random(rows) < min(rate, 0.99))
+    return SyntheticPair(baseline=b, current=c, drifted=drifted)
@@ -0,0 +1,117 @@
+"""Cold-start import time of the desktop app and the core package, from `python -X importtime`.
+
+    python -m benchmarks.startup                                     # run and print
+    python -m benchmarks.startup --save benchmarks/baselines/startup.json
+    python -m benchmarks.startup --check benchmarks/baselines/startup.json
+
+--check exits with status 1 when a target imports slower than the baseline by more
+than the tolerance, or when it imports a package that should load on first use.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from benchmarks.suite import environment
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# target -> module whose import it times
+TARGETS: dict[str, str] = {
+    "app": "app.main",
+    "core": "app.core.drift_engine",
+}
+
+# packages each target must leave for first use
+DEFERRED: dict[str, tuple[str, ...]] = {
+    "app": ("scipy", "matplotlib"),
+    "core": ("scipy", "matplotlib", "PySide6"),
+}
+
+def import_profile(module: str) -> dict:
+    """One fresh interpreter's -X importtime report for `import module`.
+
+    Returns the module's cumulative import time, every module imported on the way and the
+    slowest top-level packages by their own cumulative time.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(cumulative)))
+    total = next(us for name, us in rows if name.strip() == module)
+    # top-level packages are the least indented entries of their chain
+    packages: dict[str, int] = {}
+    for name, us in rows:
+        if "." not in name.strip():
+            packages[name.strip()] = max(packages.get(name.strip(), 0), us)
+    slowest = sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:8]
+    return {
+        "seconds": total / 1e6,
+        "modules": [name.strip() for name, _ in rows],
+        "slowest": {name: us / 1e6 for name, us in slowest},
+    }
+
+def measure(module: str, repeat: int = 5) -> dict:
+    # the fastest of `repeat` cold starts; the OS file cache is warm after the first
+    return min((import_profile(module) for _ in range(repeat)), key=lambda r: r["seconds"])
+
+def eager(imported: list[str], deferred: tuple[str, ...]) -> list[str]:
+    # deferred packages that were imported anyway
+    return sorted({name.split(".")[0] for name in imported} & set(deferred))
+
+def compare(results: dict, baseline: dict, time_tolerance: float = 0.5, min_seconds: float = 0.1) -> list[str]:
+    """Regressions of `results` against `baseline` (both {target: measurement}), past tolerance and floor."""
+    out = []
+    for target, m in results.items():
+        ref = baseline.get(target)
+        if ref is None:
+            continue
+        if m["seconds"] > ref["seconds"] * (1 + time_tolerance) and m["seconds"] - ref["seconds"] > min_seconds:
+            out.append(f"{target}: {m['seconds']:.3f}s vs {ref['seconds']:.3f}s")
+    return out
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=5, help="Cold starts per target; the fastest counts.")
+    ap.add_argument("--save", help="Write the results as a JSON baseline.")
+    ap.add_argument("--check", help="Compare against a JSON baseline; exit 1 on regression.")
+    ap.add_argument("--time-tolerance", type=float, default=0.5, help="Allowed relative slowdown (default: 0.5).")
+    args = ap.parse_args(argv)
+
+    results, problems = {}, []
+    for target, module in TARGETS.items():
+        m = measure(module, args.repeat)
+        results[target] = {"seconds": m["seconds"], "modules": len(m["modules"]), "slowest": m["slowest"]}
+        print(f"{target:>6} import {module:<24} {m['seconds']:7.3f}s {len(m['modules']):5d} modules")
+        for name, seconds in m["slowest"].items():
+            print(f"{'':>8}{name:<30} {seconds:7.3f}s")
+        problems += [f"{target}: imports {name} at startup" for name in eager(m["modules"], DEFERRED[target])]
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        doc = {"environment": environment(), "targets": TARGETS, "results": results}
+        Path(args.save).write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        print(f"Saved {args.save}")
+    if args.check:
+        baseline = json.loads(Path(args.check).read_text(encoding="utf-8"))
+        problems += compare(results, baseline["results"], args.time_tolerance)
+    for line in problems:
+        print(f"REGRESSION {line}")
+    if problems:
+        return 1
+    if args.check:
+        print(f"No regressions against {args.check}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
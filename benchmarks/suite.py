@@ -0,0 +1,166 @@
+"""Pipeline benchmark: wall time and peak memory per stage over synthetic datasets.
+
+    python -m benchmarks.suite                                   # run and print
+    python -m benchmarks.suite --save benchmarks/baselines/default.json
+    python -m benchmarks.suite --check benchmarks/baselines/default.json
+
+--check exits with status 1 when a stage is slower or uses more memory than the
+baseline by more than the tolerances.
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+from typing import Callable
+import numpy as np
+import pandas as pd
+from app.core import drift_metrics as dm
+from app.core.columnar import CompactFrame
+from app.core.drift_engine import compute_drift, compute_drift_from_profiles
+from app.core.loader import load_csv, profile_file, validate_schema
+from app.core.report import export_report_json, export_report_md
+from app.core.schema import infer_schema
+from benchmarks.datagen import synthetic_pair
+
+# name -> synthetic_pair arguments; each case stays within a few seconds
+CASES: dict[str, dict] = {
+    "small": dict(rows=20_000, numeric=8, categorical=4),
+    "tall": dict(rows=200_000, numeric=6, categorical=3),
+    "wide": dict(rows=20_000, numeric=200, categorical=40),
+    "high_card": dict(rows=50_000, numeric=2, categorical=6, cardinality=2_000),
+    "sparse": dict(rows=50_000, numeric=10, categorical=5, missing=0.4, drift=0.6),
+}
+
+def measure(fn: Callable[[], object], repeat: int = 3) -> dict:
+    # best-of-`repeat` wall time without tracing, then one traced run for the allocation peak
+    seconds = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - t0)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(seconds), "peak_mb": peak / 2**20}
+
+def run_case(params: dict, repeat: int = 3, seed: int = 0) -> dict[str, dict]:
+    pair = synthetic_pair(seed=seed, **params)
+    with tempfile.TemporaryDirectory() as tmp:
+        b_path, c_path = f"{tmp}/baseline.csv", f"{tmp}/current.csv"
+        pair.baseline.to_csv(b_path, index=False)
+        pair.current.to_csv(c_path, index=False)
+        b = load_csv(b_path).df
+        c = load_csv(c_path).df
+        schema, drifts = compute_drift(b, c)
+        bp = profile_file(b_path)
+        cats = [s.name for s in schema if s.kind == "categorical"]
+
+        stages = {
+            "load_csv": lambda: (load_csv(b_path), load_csv(c_path)),
+            "validate_schema": lambda: validate_schema(b, c),
+            "infer_schema": lambda: infer_schema(b),
+            "compute_drift": lambda: compute_drift(b, c),
+            "compact": lambda: CompactFrame.from_frame(c, schema=schema),
+            "categorical_shift": lambda: [dm.categorical_shift(b[n], c[n]) for n in cats],
+            "profile_file": lambda: profile_file(c_path, schema=bp.schema()),
+            "drift_from_profiles": lambda: compute_drift_from_profiles(bp, profile_file(c_path, schema=bp.schema())),
+            "export_json": lambda: export_report_json(f"{tmp}/r.json", b_path, c_path, schema, drifts),
+            "export_md": lambda: export_report_md(f"{tmp}/r.md", b_path, c_path, drifts),
+        }
+        return {name: measure(fn, repeat) for name, fn in stages.items()}
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+def environment_changes(recorded: dict, current: dict) -> list[str]:
+    # fields of environment() that differ from the baseline's; its timings then only say so much
+    return [f"{key}: {recorded.get(key)} -> {value}" for key, value in current.items() if recorded.get(key) != value]
+
+def compare(
+    results: dict,
+    baseline: dict,
+    time_tolerance: float = 0.5,
+    memory_tolerance: float = 0.25,
+    min_seconds: float = 0.05,
+    min_mb: float = 1.0,
+) -> list[str]:
+    """Regressions of `results` against `baseline` (both {case: {stage: measurement}}).
+
+    A stage regresses when it exceeds the baseline by the relative tolerance and by the
+    absolute floor, so sub-millisecond jitter never fails a check.
+    """
+    out = []
+    for case, stages in results.items():
+        for stage, m in stages.items():
+            ref = baseline.get(case, {}).get(stage)
+            if ref is None:
+                continue
+            if m["seconds"] > ref["seconds"] * (1 + time_tolerance) and m["seconds"] - ref["seconds"] > min_seconds:
+                out.append(f"{case}/{stage}: {m['seconds']:.3f}s vs {ref['seconds']:.3f}s")
+            if m["peak_mb"] > ref["peak_mb"] * (1 + memory_tolerance) and m["peak_mb"] - ref["peak_mb"] > min_mb:
+                out.append(f"{case}/{stage}: {m['peak_mb']:.1f} MB vs {ref['peak_mb']:.1f} MB")
+    return out
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.splitlines()[0])
+    ap.add_argument("--cases", type=lambda v: [c.strip() for c in v.split(",") if c.strip()], default=list(CASES),
+                    help=f"Comma-separated cases (default: all of {', '.join(CASES)}).")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the fastest counts.")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--save", help="Write the results as a JSON baseline.")
+    ap.add_argument("--check", help="Compare against a JSON baseline; exit 1 on regression.")
+    ap.add_argument("--time-tolerance", type=float, default=0.5, help="Allowed relative slowdown (default: 0.5).")
+    ap.add_argument("--memory-tolerance", type=float, default=0.25, help="Allowed relative peak memory growth (default: 0.25).")
+    args = ap.parse_args(argv)
+    # datetime sniffing warns once per text column; it says nothing about performance
+    warnings.filterwarnings("ignore", message="Could not infer format")
+    unknown = [c for c in args.cases if c not in CASES]
+    if unknown:
+        ap.error(f"unknown case(s): {', '.join(unknown)}")
+
+    results = {}
+    for case in args.cases:
+        results[case] = run_case(CASES[case], repeat=args.repeat, seed=args.seed)
+        for stage, m in results[case].items():
+            print(f"{case:>10} {stage:<20} {m['seconds']:8.3f}s {m['peak_mb']:9.1f} MB")
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        doc = {"environment": environment(), "seed": args.seed, "cases": {k: CASES[k] for k in args.cases}, "results": results}
+        Path(args.save).write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        print(f"Saved {args.save}")
+    if args.check:
+        baseline = json.loads(Path(args.check).read_text(encoding="utf-8"))
+        changes = environment_changes(baseline.get("environment", {}), environment())
+        if changes:
+            print(f"WARNING {args.check} was recorded in another environment; rerun with --save here for a fair check")
+            for line in changes:
+                print(f"WARNING   {line}")
+        regressions = compare(results, baseline["results"], args.time_tolerance, args.memory_tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.check}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+from app.core.drift_engine import compute_drift
+from benchmarks.datagen import synthetic_pair
+from benchmarks.startup import DEFERRED, TARGETS, eager, import_profile
+from benchmarks.suite import compare, environment, environment_changes
+
+def test_synthetic_pair_is_seeded_and_drifts_the_marked_columns():
+    pair = synthetic_pair(rows=3000, numeric=4, categorical=4, missing=0.1, drift=0.5, seed=1)
+    again = synthetic_pair(rows=3000, numeric=4, categorical=4, missing=0.1, drift=0.5, seed=1)
+    assert pair.baseline.equals(again.baseline) and pair.current.equals(again.current)
+    assert pair.drifted == ["num_0", "num_1", "cat_0", "cat_1"]
+    _, drifts = compute_drift(pair.baseline, pair.current)
+    assert sorted(d.name for d in drifts[:4]) == sorted(pair.drifted)
+
+def test_compare_flags_only_regressions_past_tolerance_and_floor():
+    base = {"c": {"load": {"seconds": 1.0, "peak_mb": 100.0}, "tiny": {"seconds": 0.001, "peak_mb": 0.1}}}
+    run = {"c": {"load": {"seconds": 1.2, "peak_mb": 200.0}, "tiny": {"seconds": 0.01, "peak_mb": 0.5}}}
+    assert compare(run, base) == ["c/load: 200.0 MB vs 100.0 MB"]
+
+def test_environment_changes_name_the_differing_fields():
+    here = environment()
+    assert environment_changes(here, here) == []
+    assert environment_changes({**here, "python": "2.7.18"}, here) == [f"python: 2.7.18 -> {here['python']}"]
+
+def test_startup_leaves_scipy_and_matplotlib_for_first_use():
+    for target, module in TARGETS.items():
+        profile = import_profile(module)
+        assert module in profile["modules"] and profile["seconds"] > 0
+        assert eager(profile["modules"], DEFERRED[target]) == []
@@ -0,0 +1,56 @@
+import os
+from app.core.cache import LRUCache, ProfileStore, profile_settings
+from app.core.loader import profile_csv
+
+def test_store_hit_and_content_invalidation(tmp_path):
+    csv = tmp_path / "baseline.csv"
+    csv.write_text("a,b\n1,x\n2,y\n", encoding="utf-8")
+    store = ProfileStore(tmp_path / "cache")
+
+    _, cached = store.get_or_build(csv, profile_csv)
+    assert not cached
+    _, cached = store.get_or_build(csv, profile_csv)
+    assert cached
+
+    # same size, new mtime, different bytes: the hash check must reject the entry
+    csv.write_text("a,b\n3,x\n4,y\n", encoding="utf-8")
+    os.utime(csv, ns=(0, 10**18))
+    assert store.get(csv) is None
+
+def test_store_rebuilds_entries_profiled_with_other_settings(tmp_path):
+    csv = tmp_path / "baseline.csv"
+    csv.write_text("a\n" + "\n".join(map(str, range(100))) + "\n", encoding="utf-8")
+    store = ProfileStore(tmp_path / "cache")
+    coarse = lambda p: profile_csv(p, sketch_k=8)
+    store.get_or_build(csv, coarse, profile_settings(sketch_k=8))
+    assert store.get_or_build(csv, coarse, profile_settings(sketch_k=8))[1]
+
+    fine = lambda p: profile_csv(p, sketch_k=1024)
+    profile, cached = store.get_or_build(csv, fine, profile_settings(sketch_k=1024))
+    assert not cached and profile.columns["a"].sketch.exact
+    assert store.get(csv) is None  # default settings: stale too
+
+def test_store_is_size_bounded(tmp_path):
+    store = ProfileStore(tmp_path / "cache", max_bytes=0)
+    csv = tmp_path / "baseline.csv"
+    csv.write_text("a\n1\n", encoding="utf-8")
+    store.get_or_build(csv, profile_csv)
+    assert store.total_bytes() == 0
+    assert not store.invalidate(csv)
+
+def test_oversized_entry_is_skipped_without_evicting_others(tmp_path):
+    small, big = tmp_path / "small.csv", tmp_path / "big.csv"
+    small.write_text("a\n1\n", encoding="utf-8")
+    big.write_text("a\n" + "\n".join(map(str, range(20_000))) + "\n", encoding="utf-8")
+    store = ProfileStore(tmp_path / "cache", max_bytes=20_000)
+    assert store.put(small, profile_csv(str(small)))
+    assert not store.put(big, profile_csv(str(big), sketch_k=10**6))
+    assert store.get(small) is not None and store.get(big) is None
+
+def test_lru_cache_evicts_least_recent():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache and cache.get("a") == 1 and len(cache) == 2
@@ -0,0 +1,14 @@
+import json
+from app.cli import main
+
+def test_cli_writes_reports_and_index(tmp_path):
+    out = tmp_path / "reports"
+    rc = main([
+        "sample_data/baseline.csv", "sample_data/current.csv",
+        "-o", str(out), "--backend", "thread", "--cache-dir", str(tmp_path / "cache"),
+    ])
+    assert rc == 0
+    index = json.loads((out / "index.json").read_text(encoding="utf-8"))
+    (snap,) = index["snapshots"]
+    assert snap["ok"] and snap["rows"] == 8
+    assert (out / "current.json").exists() and (out / "current.md").exists()
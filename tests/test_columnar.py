@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+from app.core.columnar import CompactBuilder, CompactFrame
+from app.core.schema import infer_schema
+
+def test_compact_frame_round_trips_in_smaller_dtypes():
+    df = pd.DataFrame({
+        "small": np.arange(1000) % 7,
+        "gappy": np.where(np.arange(1000) % 5 == 0, np.nan, np.arange(1000.0)),
+        "half": np.arange(1000) / 2,
+        "x": np.random.default_rng(0).normal(size=1000),
+        "c": pd.Series(list("abcd") * 250).mask(np.arange(1000) % 9 == 0),
+    })
+    schema = infer_schema(df)
+    builder = CompactBuilder(schema)
+    for start in range(0, 1000, 300):
+        builder.add(df.iloc[start : start + 300])
+    frame = builder.build()
+
+    assert {name: str(col.values.dtype) for name, col in frame.columns.items()} == {
+        "small": "int8", "gappy": "int16", "half": "float32", "x": "float64", "c": "int8"
+    }
+    assert frame.columns["gappy"].missing_count() == 200 and frame.nbytes < frame.source_bytes
+    for name in df.columns:
+        pd.testing.assert_series_equal(frame[name], df[name], check_dtype=False, check_categorical=False)
+    chunked = {name: col.values for name, col in frame.columns.items()}
+    whole = CompactFrame.from_frame(df, schema=schema)
+    assert all(np.array_equal(chunked[name], col.values) for name, col in whole.columns.items())
+
+def test_current_frame_extends_the_baseline_dictionary():
+    rng = np.random.default_rng(1)
+    baseline = pd.DataFrame({"x": rng.normal(size=3000), "c": rng.choice(list("abc"), 3000)})
+    current = pd.DataFrame({"x": rng.normal(0.3, size=2000), "c": rng.choice(list("abcde"), 2000)})
+    current.loc[::7, "c"] = None
+
+    b = CompactFrame.from_frame(baseline)
+    c = CompactFrame.from_frame(current, schema=b.schema, dictionaries=b.dictionaries())
+    # the current dictionary extends the baseline's, so codes compare directly
+    assert list(c.columns["c"].labels[:3]) == list(b.columns["c"].labels)
+    assert c.columns["c"].missing_count() == len(current.index[::7])
+    pd.testing.assert_series_equal(c["c"].astype(object), current["c"], check_dtype=False)
@@ -0,0 +1,55 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from app.core.drift_engine import compute_drift
+from app.core.instrument import Recorder, in_context, profiled, recording, stage
+from app.core.report import export_report_json
+
+def _frames(n=500):
+    rng = np.random.default_rng(0)
+    b = pd.DataFrame({"x": rng.normal(size=n), "c": rng.choice(list("ab"), n)})
+    c = pd.DataFrame({"x": rng.normal(1, size=n), "c": rng.choice(list("abc"), n)})
+    return b, c
+
+def test_recorder_collects_stages_from_pool_threads(tmp_path):
+    b, c = _frames()
+    recorder = Recorder(memory=True)
+    with recording(recorder):
+        with stage("outer", rows=7) as st:
+            st.nbytes = 3
+            schema, drifts = compute_drift(b, c, workers=2)
+        export_report_json(str(tmp_path / "r.json"), "b", "c", schema, drifts, run_stats=recorder.summary())
+    stats = recorder.summary()
+    # pool stages finish in any order; schema inference always runs first
+    assert list(stats["stages"])[0] == "infer_schema"
+    assert {"outer", "drift.numeric_batch", "drift.categorical", "drift.missingness", "export_json"} <= set(stats["stages"])
+    assert stats["stages"]["outer"]["rows"] == 7 and stats["stages"]["outer"]["bytes"] == 3
+    assert stats["stages"]["outer"]["peak_mb"] >= stats["stages"]["drift.numeric_batch"]["peak_mb"] > 0
+    assert [r["column"] for r in stats["slowest_columns"]] == ["c"]
+    assert "drift.categorical" in json.loads((tmp_path / "r.json").read_text())["run_stats"]["stages"]
+
+def test_pool_thread_stage_does_not_hide_outer_peak():
+    def inner():
+        with stage("inner"):
+            block = np.ones(2**20)  # 8 MB
+            return block.sum()
+
+    recorder = Recorder(memory=True)
+    with recording(recorder):
+        with stage("outer"):
+            with stage("before"):
+                before = np.ones(2**21)  # 16 MB, freed before the pool stage resets the peak
+                del before
+            with ThreadPoolExecutor(1) as pool:
+                pool.submit(in_context(inner)).result()
+    peaks = {r.stage: r.peak_bytes for r in recorder.records}
+    assert peaks["before"] >= 2**24 and peaks["inner"] >= 2**23
+    assert peaks["outer"] >= peaks["before"] >= peaks["inner"]
+
+def test_profiled_writes_cprofile_and_tracemalloc_dumps(tmp_path):
+    b, c = _frames()
+    with profiled(tmp_path / "run"):
+        compute_drift(b, c)
+    assert sorted(p.name for p in (tmp_path / "run").iterdir()) == ["cprofile.txt", "run.prof", "tracemalloc.txt"]
+    assert "compute_drift" in (tmp_path / "run" / "cprofile.txt").read_text()
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from app.core import drift_metrics as dm
+from app.core.live import LiveDrift
+from app.core.loader import csv_end_offset, profile_csv
+from app.core.profile import profile_frame
+
+def test_live_drift_reads_only_appended_rows(tmp_path):
+    rng = np.random.default_rng(0)
+    baseline = pd.DataFrame({"x": rng.normal(size=2000), "c": rng.choice(list("abc"), 2000)})
+    current = pd.DataFrame({"x": rng.normal(0.5, size=3000), "c": rng.choice(list("abcd"), 3000)})
+    text = current.to_csv(index=False)
+    path = tmp_path / "current.csv"
+    cut = text.index("\n", len(text) // 2) + 4  # ends inside a row
+    path.write_text(text[:cut])
+
+    live = LiveDrift(profile_frame(baseline), str(path))
+    first = live.poll()
+    assert live.tail.offset == cut - 3 and live.poll() == 0
+    with open(path, "a") as f:
+        f.write(text[cut:])
+    assert first + live.poll() == len(current) == live.n_rows
+
+    drifts = {d.name: d for d in live.drifts()}
+    edges, ref = live.baseline.columns["x"].psi_reference()
+    assert drifts["x"].details["psi"] == dm.psi_from_counts(ref, np.histogram(current["x"], bins=edges)[0])
+    expected = dm.categorical_shift(baseline["c"], current["c"])
+    assert drifts["c"].details["js_divergence"] == expected["js_divergence"]
+
+def test_live_drift_resumes_after_a_loaded_profile(tmp_path):
+    rng = np.random.default_rng(1)
+    baseline = profile_frame(pd.DataFrame({"x": rng.normal(size=2000), "c": rng.choice(list("abc"), 2000)}), sketch_k=10**6)
+    current = pd.DataFrame({"x": rng.normal(0.5, size=3000), "c": rng.choice(list("abcd"), 3000)})
+    path = tmp_path / "current.csv"
+    current.iloc[:2000].to_csv(path, index=False)
+    loaded = profile_csv(str(path), schema=baseline.schema(), sketch_k=10**6)
+    offset = csv_end_offset(str(path), path.stat().st_size)
+    assert offset == path.stat().st_size
+
+    live = LiveDrift(baseline, str(path), sketch_k=10**6, current=loaded, offset=offset)
+    assert live.poll() == 0 and live.n_rows == 2000 and loaded.n_rows == 2000
+    current.iloc[2000:].to_csv(path, mode="a", header=False, index=False)
+    assert live.poll() == 1000 and live.n_rows == 3000
+
+    fresh = LiveDrift(baseline, str(path), sketch_k=10**6)
+    fresh.poll()
+    assert live.drifts() == fresh.drifts()
+
+    # a smaller live sketch keeps the exact seeded bin counts
+    small = LiveDrift(baseline, str(path), sketch_k=64, current=loaded, offset=offset)
+    assert small.current.columns["x"].sketch.k == 64 and loaded.columns["x"].sketch.k == 10**6
+    edges, _ = baseline.columns["x"].psi_reference()
+    assert np.array_equal(small.binned["x"], np.histogram(current["x"].iloc[:2000], bins=edges)[0])
@@ -0,0 +1,28 @@
+import pytest
+from app.core.loader import load_csv, load_table, profile_file, validate_file_schemas
+
+pa = pytest.importorskip("pyarrow")
+
+@pytest.fixture
+def columnar_files(tmp_path):
+    b = load_csv("sample_data/baseline.csv").df
+    b["city"] = b["city"].astype("category")
+    c = load_csv("sample_data/current.csv").df
+    b.to_parquet(tmp_path / "baseline.parquet")
+    c.to_feather(tmp_path / "current.feather")
+    return str(tmp_path / "baseline.parquet"), str(tmp_path / "current.feather")
+
+def test_columnar_projection_keeps_dtypes(columnar_files):
+    bpath, cpath = columnar_files
+    df = load_table(bpath, columns=["city", "age"], max_rows=3).df
+    assert list(df.columns) == ["city", "age"]
+    assert len(df) == 3
+    assert str(df["city"].dtype) == "category"
+    assert load_table(cpath, columns=["age"]).df.shape == (8, 1)
+
+def test_columnar_schema_validation_and_profile(columnar_files):
+    bpath, cpath = columnar_files
+    ok, msg = validate_file_schemas(bpath, cpath)
+    assert ok and "city" in msg
+    bp = profile_file(bpath, chunksize=3)
+    assert bp.n_rows == 8 and bp.columns["city"].kind == "categorical"
@@ -1,7 +1,67 @@
+import numpy as np
 import pandas as pd
-from app.core.drift_metrics import psi_numeric
+from scipy.stats import ks_2samp
+from app.core.drift_engine import compute_drift
+from app.core.drift_metrics import (
+    ApproxConfig, ResampleConfig, categorical_shift, categorical_shift_from_counts, count_categories, ks_pvalue,
+    numeric_drift_batch, psi_numeric,
+)
 
 def test_psi_zero_when_same():
     b = pd.Series([1,2,3,4,5,6,7,8,9,10])
     c = pd.Series([1,2,3,4,5,6,7,8,9,10])
     assert abs(psi_numeric(b, c)) < 1e-6
+
+def test_numeric_batch_matches_per_column():
+    rng = np.random.default_rng(0)
+    b = rng.normal(size=(300, 4))
+    c = rng.normal(0.2, size=(250, 4))
+    b[:, 1] = np.round(b[:, 1])
+    c[:, 1] = np.round(c[:, 1])
+    b[rng.random(300) < 0.3, 2] = np.nan
+    c[:, 3] = np.nan
+    psi, pvals = numeric_drift_batch(b, c)
+    for j in range(4):
+        bj, cj = pd.Series(b[:, j]), pd.Series(c[:, j])
+        assert abs(psi[j] - psi_numeric(bj, cj)) < 1e-9
+        assert abs(pvals[j] - ks_pvalue(bj, cj)) < 1e-9
+
+def test_approx_drift_records_method_and_bound():
+    rng = np.random.default_rng(1)
+    b = pd.DataFrame({"x": rng.normal(size=50_000)})
+    c = pd.DataFrame({"x": rng.normal(0.3, size=50_000)})
+    _, exact = compute_drift(b, c)
+    for method in ("sketch", "sample"):
+        _, approx = compute_drift(b, c, approx=ApproxConfig(method=method, accuracy=0.01))
+        d = approx[0].details
+        assert d["method"] in ("kll-sketch", "reservoir-sample")
+        assert 0 < d["error_bound"]["ks_stat_error"] <= 0.05
+        assert abs(d["ks_stat"] - ks_2samp(b["x"], c["x"]).statistic) <= d["error_bound"]["ks_stat_error"]
+        assert abs(d["psi"] - exact[0].details["psi"]) < 0.05
+    assert exact[0].details["method"] == "exact"
+
+def test_count_categories_shares_one_dictionary():
+    b = pd.Series(["a", "b", None, "a"], dtype="category")
+    c = pd.Series(["c", "a", "a", np.nan, np.nan], dtype=object)
+    counts = count_categories(b, c)
+    assert [str(v) for v in counts.labels] == ["a", "b", "c", "nan"]
+    assert counts.baseline.tolist() == [2, 1, 0, 1] and counts.current.tolist() == [2, 0, 1, 2]
+    assert counts.top(2).labels.tolist() == ["a", "b"]
+    expected = categorical_shift_from_counts(b.astype(object).value_counts(dropna=False), c.value_counts(dropna=False))
+    assert categorical_shift(b, c) == expected
+
+def test_resampled_intervals_and_permutation_pvalues():
+    rng = np.random.default_rng(2)
+    b = pd.DataFrame({"x": rng.normal(size=4000), "same": rng.normal(size=4000), "c": rng.choice(list("abc"), 4000)})
+    c = pd.DataFrame({"x": rng.normal(0.3, size=3000), "same": rng.normal(size=3000), "c": rng.choice(list("abcd"), 3000)})
+    config = ResampleConfig(replicates=500)
+    _, plain = compute_drift(b, c)
+    _, drifts = compute_drift(b, c, resample=config)
+    # same scores, extra details; pools and backends draw the same replicates
+    assert [d.score for d in drifts] == [d.score for d in plain]
+    assert compute_drift(b, c, resample=config, workers=2)[1] == drifts
+    by_name = {d.name: d.details for d in drifts}
+    lo, hi = by_name["x"]["psi_ci"]
+    assert lo < by_name["x"]["psi"] < hi and by_name["x"]["psi_perm_pvalue"] < 0.01
+    assert by_name["same"]["psi_perm_pvalue"] > 0.05
+    assert by_name["c"]["js_divergence_perm_pvalue"] < 0.01 and by_name["c"]["resample"]["replicates"] == 500
@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import Qt
+from app.core.drift_engine import FeatureDrift
+from app.core.report import export_report_md, key_metric
+from app.ui.models import DriftFilterProxy, DriftTableModel
+
+def _drift(name, score):
+    return FeatureDrift(name=name, kind="numeric", score=score, missing_delta=0.0, details={"psi": score, "ks_pvalue": 1.0})
+
+def test_model_sorts_filters_and_indexes_by_name():
+    model = DriftTableModel()
+    proxy = DriftFilterProxy(model)
+    model.add([_drift("a", 0.1), _drift("b", 0.5)])
+    model.add([_drift("ab", 0.3)])
+    assert [proxy.drift(r).name for r in range(proxy.rowCount())] == ["b", "ab", "a"]
+    assert model.row_of("a") == 2
+
+    proxy.sort(0, Qt.AscendingOrder)
+    assert [proxy.drift(r).name for r in range(proxy.rowCount())] == ["a", "ab", "b"]
+    proxy.set_filter_text(" A")
+    assert [proxy.drift(r).name for r in range(proxy.rowCount())] == ["a", "ab"]
+
+def test_table_and_report_share_key_metric(tmp_path):
+    d = FeatureDrift(
+        name="x", kind="numeric", score=0.2, missing_delta=0.0,
+        details={"psi": 0.2, "ks_pvalue": 0.01, "method": "kll-sketch", "error_bound": {"ks_stat_error": 0.003}},
+    )
+    model = DriftTableModel()
+    model.add([d])
+    table = model.data(model.index(0, 4), Qt.DisplayRole)
+    assert table == "≈ PSI=0.2000, KS p=0.01" and key_metric(d, method=True) == f"{table} (kll-sketch, KS ±0.003)"
+    export_report_md(str(tmp_path / "r.md"), "b", "c", [d])
+    assert key_metric(d, method=True) in (tmp_path / "r.md").read_text(encoding="utf-8")
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.core.drift_engine import compute_drift
+
+def _frames():
+    rng = np.random.default_rng(0)
+    n = 500
+    b = pd.DataFrame({"x": rng.normal(size=n), "y": rng.choice(["a", "b", None], n), "z": rng.integers(0, 5, n)})
+    c = pd.DataFrame({"x": rng.normal(0.3, size=n), "y": rng.choice(["a", "b", "c"], n), "z": rng.integers(0, 6, n)})
+    return b, c
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_parallel_backends_match_serial(backend):
+    b, c = _frames()
+    _, serial = compute_drift(b, c)
+    _, parallel = compute_drift(b, c, workers=2, backend=backend)
+    assert [d.name for d in parallel] == [d.name for d in serial]
+    assert [d.details for d in parallel] == [d.details for d in serial]
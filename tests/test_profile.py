@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from app.core.loader import load_csv, profile_csv
+from app.core.drift_engine import compute_drift, compute_drift_from_profiles
+from app.core.profile import profile_chunks
+from app.core.sketch import QuantileSketch, ValueSketch
+
+def test_streaming_profile_matches_in_memory():
+    b = load_csv("sample_data/baseline.csv").df
+    c = load_csv("sample_data/current.csv").df
+    _, expected = compute_drift(b, c)
+
+    bp = profile_csv("sample_data/baseline.csv", chunksize=3)
+    cp = profile_csv("sample_data/current.csv", chunksize=2, schema=bp.schema())
+    _, got = compute_drift_from_profiles(bp, cp)
+
+    assert [d.name for d in got] == [d.name for d in expected]
+    assert np.allclose([d.score for d in got], [d.score for d in expected])
+
+def test_max_rows_stops_streaming_read():
+    bp = profile_csv("sample_data/baseline.csv", chunksize=2, max_rows=3)
+    assert bp.n_rows == 3
+
+def test_sketch_merge_quantiles_close():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=200_000)
+    a, b = QuantileSketch(k=256), QuantileSketch(k=256, seed=1)
+    a.update(x[:100_000])
+    b.update(x[100_000:])
+    a.merge(b)
+    assert a.n == x.size
+    qs = np.linspace(0.05, 0.95, 19)
+    ranks = np.searchsorted(np.sort(x), a.quantiles(qs)) / x.size
+    assert np.max(np.abs(ranks - qs)) < 0.02
+
+def test_value_sketch_merge_estimates_heavy_hitters_and_distinct():
+    rng = np.random.default_rng(2)
+    ids = np.array([f"user-{i}" for i in rng.integers(0, 20_000, 100_000)], dtype=object)
+    ids[:10_000] = "bot"
+    a, b = ValueSketch(), ValueSketch(seed=0)
+    a.update(ids[:50_000])
+    b.update(ids[50_000:])
+    a.merge(b)
+    whole = ValueSketch()
+    whole.update(ids)
+    assert a.n == whole.n == ids.size and a.hll.estimate() == whole.hll.estimate()
+    assert abs(a.hll.estimate() / len(set(ids)) - 1) < 0.05
+    assert abs(a.frequencies(np.array([a.candidates["bot"]], dtype=np.uint64))[0] - 0.1) <= a.cms.error()
+
+def test_high_cardinality_profiles_fall_back_to_sketches():
+    rng = np.random.default_rng(3)
+    b = pd.DataFrame({"url": [f"/p/{i}" for i in rng.integers(0, 50_000, 40_000)]})
+    c = b.copy()
+    c.loc[: 12_000, "url"] = "/home"
+    bp = profile_chunks([b.iloc[i : i + 5_000] for i in range(0, 40_000, 5_000)])
+    cp = profile_chunks([c.iloc[i : i + 5_000] for i in range(0, 40_000, 5_000)], schema=bp.schema())
+    _, (d,) = compute_drift_from_profiles(bp, cp)
+    assert d.kind == "unknown" and d.details["method"] == "hash-sketch"
+    assert d.details["top_changes"][0]["category"] == "/home" and d.details["top_changes"][0]["delta"] > 0.25
+    assert d.details["distinct_current"] < d.details["distinct_baseline"] and d.score > 0.1
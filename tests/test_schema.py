@@ -1,5 +1,6 @@
 import pandas as pd
-from app.core.schema import infer_schema
+from app.core.loader import load_csv
+from app.core.schema import infer_schema, infer_schema_map, parse_dtypes
 
 def test_infer_schema_basic():
     df = pd.DataFrame({"a":[1,2,3], "b":["x","y","z"]})
@@ -7,3 +8,16 @@ def test_infer_schema_basic():
     kinds = {s.name: s.kind for s in schema}
     assert kinds["a"] == "numeric"
     assert kinds["b"] in ("categorical", "unknown")
+
+def test_infer_schema_map_bounds_cardinality(tmp_path):
+    df = pd.DataFrame({"id": [f"u{i}" for i in range(200)], "city": ["a", "b"] * 100, "x": range(200)})
+    schema = infer_schema_map(df, max_cat_unique=10)
+    assert list(schema) == ["id", "city", "x"]
+    assert (schema["id"].kind, schema["id"].nunique) == ("unknown", 11)
+    assert (schema["city"].kind, schema["city"].nunique) == ("categorical", 2)
+    assert (schema["x"].kind, schema["x"].nunique) == ("numeric", 0)
+    path = tmp_path / "c.csv"
+    df.to_csv(path, index=False)
+    assert parse_dtypes(schema) == {"id": "object", "city": "category"}
+    c = load_csv(str(path), schema=list(schema.values())).df
+    assert isinstance(c["city"].dtype, pd.CategoricalDtype) and c["x"].dtype.kind == "i"
@@ -0,0 +1,46 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from app.core.drift_metrics import categorical_shift, psi_from_counts
+from app.core.report import export_report_json, export_report_md
+from app.core.segments import segmented_drift
+
+def test_segmented_drift_scores_each_segment_against_its_baseline(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 8000
+
+    def frame(shift):
+        city = rng.choice(["a", "b", None], n)
+        x = rng.normal(size=n) + np.where(city == "b", shift, 0)
+        return pd.DataFrame({"city": city, "device": rng.choice(["ios", "web"], n), "x": x, "c": rng.choice(list("pq"), n)})
+
+    baseline, current = frame(0), frame(1)
+    res = segmented_drift(baseline, current, ["city", "device"], min_rows=10)
+    assert res.features == ["x", "c"] and len(res.segments) == 6
+    assert res.baseline_rows.sum() == res.current_rows.sum() == n
+
+    s = res.segments.index("city=b, device=web")
+    b_rows = (baseline["city"] == "b") & (baseline["device"] == "web")
+    c_rows = (current["city"] == "b") & (current["device"] == "web")
+    edges = np.unique(np.quantile(baseline["x"], np.linspace(0, 1, 11)))
+    expected = psi_from_counts(np.histogram(baseline["x"][b_rows], edges)[0], np.histogram(current["x"][c_rows], edges)[0])
+    assert abs(res.metric[0, s] - expected) < 1e-9
+    jsd = categorical_shift(baseline["c"][b_rows], current["c"][c_rows])["js_divergence"]
+    assert abs(res.metric[1, s] - jsd) < 1e-9
+    # the shifted city leads, and a large min_rows blanks every segment
+    assert res.top_cells(2)[0]["segment"].startswith("city=b") and res.top_cells(2)[0]["feature"] == "x"
+    assert np.isnan(segmented_drift(baseline, current, ["city"], min_rows=n).scores).all()
+
+    md = export_report_md(str(tmp_path / "r.md"), "b", "c", [], segments=res.to_dict(top_n=3))
+    assert "## Segment drift by city × device" in open(md, encoding="utf-8").read()
+
+def test_segment_without_values_on_one_side_exports_valid_json(tmp_path):
+    baseline = pd.DataFrame({"city": ["a", "b"] * 50, "x": np.arange(100.0)})
+    current = baseline.assign(x=np.where(baseline["city"] == "b", np.nan, baseline["x"]))
+    res = segmented_drift(baseline, current, ["city"], min_rows=10)
+    cell = next(c for c in res.top_cells() if c["segment"] == "city=b")
+    assert cell["metric"] is None and cell["missing_delta"] == 1.0
+
+    out = export_report_json(str(tmp_path / "r.json"), "b", "c", [], [], segments=res.to_dict())
+    json.loads(open(out, encoding="utf-8").read(), parse_constant=lambda c: pytest.fail(f"bare {c} in JSON"))
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+from app.core.drift_metrics import categorical_shift, psi_numeric
+from app.core.profile import profile_frame
+from app.core.windowed import windowed_drift
+
+def test_windowed_drift_matches_per_window_metrics():
+    rng = np.random.default_rng(0)
+    n = 6000
+    ts = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 3 * 86400, n), unit="s")
+    df = pd.DataFrame({"ts": ts, "x": rng.normal(size=n), "c": rng.choice(["a", "b", None], n)})
+    df.loc[df["ts"] >= "2024-01-03", "x"] += 1
+    baseline = df[df["ts"] < "2024-01-02"].drop(columns="ts").reset_index(drop=True)
+
+    res = windowed_drift(df, "ts", "1D", baseline=profile_frame(baseline, sketch_k=10**6))
+    assert res.features == ["x", "c"] and res.rows.sum() == n
+    day = df[df["ts"] >= "2024-01-03"]
+    assert abs(res.metric[0, 2] - psi_numeric(baseline["x"], day["x"])) < 1e-9
+    assert abs(res.metric[1, 2] - categorical_shift(baseline["c"], day["c"])["js_divergence"]) < 1e-9
+
+    rolling = windowed_drift(df, "ts", "1D", reference="rolling")
+    assert np.isnan(rolling.scores[:, 0]).all()
+    assert rolling.metric[0, 2] > 10 * rolling.metric[0, 1]
+
+def test_mixed_utc_offsets_window_in_utc():
+    # local times across a DST change: +02:00 before, +03:00 after
+    ts = ["2024-03-30 22:30+02:00", "2024-03-31 01:30+02:00", "2024-03-31 05:00+03:00", None, "2024-03-31 23:30+03:00"]
+    df = pd.DataFrame({"ts": ts, "x": [1.0, 2.0, 3.0, 4.0, 5.0]})
+    res = windowed_drift(df, "ts", "1D", reference="rolling")
+    assert str(res.starts.tz) == "UTC"
+    assert list(res.starts) == [pd.Timestamp("2024-03-30", tz="UTC"), pd.Timestamp("2024-03-31", tz="UTC")]
+    assert list(res.rows) == [2, 2]
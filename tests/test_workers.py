@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("PySide6")
+
+from app.core.cache import ProfileStore
+from app.core.drift_engine import compute_drift
+from app.ui.workers import DriftWorker
+
+def test_drift_worker_scores_ordinary_files_exactly(tmp_path):
+    rng = np.random.default_rng(4)
+    b = pd.DataFrame({"x": rng.normal(size=5000), "c": rng.choice(list("abc"), 5000)})
+    c = pd.DataFrame({"x": rng.normal(0.05, size=5000), "c": rng.choice(list("abcd"), 5000)})
+    b.to_csv(tmp_path / "b.csv", index=False)
+    c.to_csv(tmp_path / "c.csv", index=False)
+
+    worker = DriftWorker(str(tmp_path / "b.csv"), str(tmp_path / "c.csv"), ProfileStore(tmp_path / "cache"))
+    results, errors = [], []
+    worker.finished.connect(lambda schema, drifts: results.append(drifts))
+    worker.failed.connect(errors.append)
+    worker.run()
+
+    assert errors == []
+    _, expected = compute_drift(b, c)
+    got = {d.name: d for d in results[0]}
+    assert all(got[d.name].details.get("method", "exact") == "exact" for d in expected)
+    assert np.allclose([got[d.name].score for d in expected], [d.score for d in expected])